@@ -11,6 +11,10 @@ from pydantic import BaseModel
 import cv2
 import numpy as np
 import io
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, date, timedelta
 from PIL import ImageFont, ImageDraw, Image
 from utils.text_utils import put_korean_text, get_text_size
@@ -24,6 +28,8 @@ from models.face_recognition import FaceRecognizer
 from models.face_database import FaceDatabase
 from models.attendance_db import AttendanceDB
 from models.liveness import LivenessDetector
+from models.face_tracker import FaceTracker
+from models.model_zoo import resolve_model_name
 from camera.camera_handler import CameraHandler
 
 
@@ -43,6 +49,23 @@ class FaceRegisterResponse(BaseModel):
     message: str
 
 
+class FaceBatchRegisterItem(BaseModel):
+    """일괄 등록 파일별 결과 모델"""
+    filename: str
+    success: bool
+    face_id: Optional[str] = None
+    name: Optional[str] = None
+    message: str
+
+
+class FaceBatchRegisterResponse(BaseModel):
+    """일괄 등록 응답 모델"""
+    total: int
+    registered: int
+    failed: int
+    results: List[FaceBatchRegisterItem]
+
+
 class FaceInfo(BaseModel):
     """얼굴 정보 모델"""
     face_id: str
@@ -196,9 +219,25 @@ class LivenessCheckResponse(BaseModel):
 
 # ==================== 의존성 ====================
 
+# 엔드포인트별 추론 프로필 (필요한 InsightFace 모듈만 실행, 인식기는 처음 요청될 때 모듈을 로드)
+# 기본 프로필은 인식 전용이라 서버 시작 시 감지/인식 모델만 로드
+RECOGNIZER_PROFILE = os.environ.get('FACE_PROFILE', 'recognition_only')
+STREAM_PROFILE = os.environ.get('FACE_STREAM_PROFILE', 'with_attributes')  # 나이/성별 표시
+LIVENESS_PROFILE = 'with_pose'  # Head Pose 필요
+RECOGNIZER_QUANTIZATION = os.environ.get('FACE_QUANTIZATION') or None  # 'dynamic'/'static' (quantize_models.py)
+
+# 모델 팩 (buffalo_s/m/l), 데이터베이스는 이 모델의 임베딩으로만 채워짐 (FaceDatabase.bind_model)
+RECOGNIZER_MODEL = resolve_model_name(os.environ.get('FACE_MODEL') or None)
+DATABASE_PATH = os.environ.get('FACE_DB_PATH', 'data/face_database.json')
+
+# 고해상도(1080p/4K) 카메라: 축소한 프레임에서 감지하고 원본 해상도에서 임베딩
+MULTI_RESOLUTION = os.environ.get('FACE_MULTI_RESOLUTION') == '1'
+MIN_FACE_SIZE = int(os.environ['FACE_MIN_FACE_SIZE']) if os.environ.get('FACE_MIN_FACE_SIZE') else None
+
 # 전역 인스턴스 (싱글톤)
 _face_recognizer: Optional[FaceRecognizer] = None
 _face_database: Optional[FaceDatabase] = None
+_face_database_lock = threading.Lock()  # 스레드풀에서 동시에 첫 요청이 와도 인스턴스는 1개
 _camera_handler: Optional[CameraHandler] = None
 _attendance_db: Optional[AttendanceDB] = None
 _liveness_detector: Optional[LivenessDetector] = None
@@ -224,7 +263,10 @@ def get_face_recognizer() -> FaceRecognizer:
     """얼굴 인식기 의존성"""
     global _face_recognizer
     if _face_recognizer is None:
-        _face_recognizer = FaceRecognizer()
+        _face_recognizer = FaceRecognizer(
+            model_name=RECOGNIZER_MODEL, profile=RECOGNIZER_PROFILE, quantization=RECOGNIZER_QUANTIZATION,
+            multi_resolution=MULTI_RESOLUTION, min_face_size=MIN_FACE_SIZE
+        )
     return _face_recognizer
 
 
@@ -232,7 +274,15 @@ def get_face_database() -> FaceDatabase:
     """얼굴 데이터베이스 의존성"""
     global _face_database
     if _face_database is None:
-        _face_database = FaceDatabase()
+        with _face_database_lock:
+            if _face_database is None:
+                if os.environ.get('FACE_DB_SHARED') == '1':
+                    # 다중 워커: 모든 워커가 같은 memory-map 갤러리와 SQLite 메타데이터를 공유
+                    _face_database = FaceDatabase(
+                        db_path=DATABASE_PATH, index_type='shared', storage='sqlite', model_name=RECOGNIZER_MODEL
+                    )
+                else:
+                    _face_database = FaceDatabase(db_path=DATABASE_PATH, model_name=RECOGNIZER_MODEL)
     return _face_database
 
 
@@ -328,11 +378,8 @@ async def register_face(
             )
 
         # 같은 이름이 이미 있는지 확인
-        existing_face_id = None
-        for fid, fdata in database.faces.items():
-            if fdata.get('name') == name:
-                existing_face_id = fid
-                break
+        same_name_ids = database.find_faces_by_name(name)
+        existing_face_id = same_name_ids[0] if same_name_ids else None
 
         if existing_face_id:
             # 기존 얼굴에 샘플로 추가
@@ -385,6 +432,104 @@ async def register_face(
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
 
+MAX_BATCH_FILES = 200  # 일괄 등록 요청당 최대 파일 수
+DECODE_WORKERS = 8  # 일괄 등록 이미지 디코딩 스레드 수
+
+
+def _decode_images(contents: List[bytes]) -> List[Optional[np.ndarray]]:
+    """업로드된 이미지들을 스레드로 동시에 디코딩 (cv2.imdecode는 GIL을 해제)"""
+    def decode(data: bytes) -> Optional[np.ndarray]:
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) if data else None
+
+    if len(contents) <= 1:
+        return [decode(data) for data in contents]
+    with ThreadPoolExecutor(max_workers=min(DECODE_WORKERS, len(contents))) as executor:
+        return list(executor.map(decode, contents))
+
+
+@router.post("/faces/register-batch", response_model=FaceBatchRegisterResponse)
+async def register_faces_batch(
+    files: List[UploadFile] = File(...),
+    names: Optional[List[str]] = Form(None),
+    recognizer: FaceRecognizer = Depends(get_face_recognizer),
+    database: FaceDatabase = Depends(get_face_database)
+):
+    """
+    얼굴 일괄 등록 엔드포인트 (명단 전체를 한 번의 요청으로 등록)
+
+    /face/register와 같은 규칙으로 같은 이름이 있으면 샘플로 추가하고 없으면 새로 등록하며,
+    성공한 모든 샘플을 데이터베이스에 한 번에 기록합니다.
+
+    Args:
+        files: 얼굴 이미지 파일 목록
+        names: 파일별 이름 (files와 같은 순서, 생략하거나 빈 값이면 파일 이름에서 확장자를 뺀 값)
+
+    Returns:
+        파일별 등록 결과와 성공/실패 수
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_FILES}개 파일까지 등록할 수 있습니다.")
+    if names and len(names) != len(files):
+        raise HTTPException(status_code=400, detail="names의 개수가 files의 개수와 다릅니다.")
+
+    try:
+        # 파일 읽기 후 동시 디코딩
+        contents = await asyncio.gather(*(file.read() for file in files))
+        images = await run_in_threadpool(_decode_images, list(contents))
+
+        filenames = [file.filename or f"file_{i}" for i, file in enumerate(files)]
+        resolved_names = [
+            (names[i].strip() if names and names[i] and names[i].strip() else os.path.splitext(os.path.basename(filename))[0])
+            for i, filename in enumerate(filenames)
+        ]
+        results: List[Optional[FaceBatchRegisterItem]] = [None] * len(files)
+
+        valid = []
+        for i, image in enumerate(images):
+            if image is None:
+                results[i] = FaceBatchRegisterItem(
+                    filename=filenames[i], success=False, name=resolved_names[i],
+                    message="유효하지 않은 이미지 파일입니다."
+                )
+            else:
+                valid.append(i)
+
+        # 얼굴 임베딩 일괄 추출
+        embeddings = await run_in_threadpool(recognizer.extract_embeddings_batch, [images[i] for i in valid])
+
+        samples, sample_files = [], []
+        for i, embedding in zip(valid, embeddings):
+            if embedding is None:
+                results[i] = FaceBatchRegisterItem(
+                    filename=filenames[i], success=False, name=resolved_names[i],
+                    message="이미지에서 얼굴을 감지할 수 없습니다."
+                )
+            else:
+                samples.append((resolved_names[i], embedding, images[i]))
+                sample_files.append(i)
+
+        # 모든 샘플을 한 번에 기록
+        face_ids = await run_in_threadpool(database.enroll_samples, samples, 'api')
+
+        for i, face_id in zip(sample_files, face_ids):
+            results[i] = FaceBatchRegisterItem(
+                filename=filenames[i], success=True, face_id=face_id, name=resolved_names[i],
+                message=f"'{resolved_names[i]}' 등록 완료"
+            )
+
+        return FaceBatchRegisterResponse(
+            total=len(files),
+            registered=len(face_ids),
+            failed=len(files) - len(face_ids),
+            results=results
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+
 # ==================== 추가 샘플 등록 ====================
 
 @router.post("/face/{face_id}/add-sample", response_model=FaceAddSampleResponse)
@@ -546,10 +691,7 @@ async def merge_faces(
     """
     try:
         # 같은 이름을 가진 얼굴 개수 확인
-        matching_faces = [
-            face_id for face_id, face_data in database.faces.items()
-            if face_data.get('name') == name
-        ]
+        matching_faces = database.find_faces_by_name(name)
 
         if len(matching_faces) <= 1:
             return FaceMergeResponse(
@@ -637,30 +779,38 @@ def generate_frames(
     """
     global _camera_stats
 
+    # 이전 프레임에서 인식된 얼굴은 임베딩/검색을 건너뜀
+    tracker = FaceTracker()
+
     while True:
         ret, frame = camera.read_frame()
 
         if not ret:
             break
 
-        # 얼굴 감지 및 인식
-        results = recognizer.detect_and_extract(frame)
+        # 얼굴 감지는 매 프레임, 인식은 새 얼굴/미확인 얼굴/재인식 주기가 지난 얼굴만
+        results = recognizer.detect(frame, profile=STREAM_PROFILE)
+        track_ids = tracker.associate(results)
+        pending = tracker.pending(track_ids)
 
         # 통계 업데이트
         _camera_stats['faces_detected'] = len(results)
         recognized_count = 0
         current_faces = []
 
-        for face_result in results:
+        # 인식이 필요한 얼굴을 한 번에 임베딩 후 매칭
+        if pending:
+            embeddings = recognizer.embed(frame, [results[i] for i in pending])
+            for i, match in zip(pending, database.recognize_faces(np.stack(embeddings))):
+                tracker.resolve(track_ids[i], match)
+        matches = [tracker.match_of(track_id) for track_id in track_ids]
+
+        for face_result, match in zip(results, matches):
             bbox = face_result['bbox']
-            embedding = face_result['embedding']
             age = face_result.get('age')
             gender = face_result.get('gender')
             x1, y1, x2, y2 = bbox
 
-            # 데이터베이스에서 매칭
-            match = database.recognize_face(embedding)
-
             if match:
                 recognized_count += 1
                 face_id, confidence = match
@@ -997,7 +1147,7 @@ async def check_liveness(
         raise HTTPException(status_code=400, detail="유효하지 않은 이미지입니다.")
 
     # 얼굴 감지 + 임베딩 + Head Pose 추출
-    results = recognizer.detect_and_extract(image)
+    results = recognizer.detect_and_extract(image, profile=LIVENESS_PROFILE)
 
     if not results:
         return LivenessCheckResponse(
@@ -1028,7 +1178,7 @@ async def check_liveness(
 
     embedding = face.get('embedding')
     if embedding is not None:
-        match = database.recognize_face(embedding)
+        match = database.recognize_faces(np.stack([embedding]))[0]
         if match:
             face_id, face_confidence = match
             face_data = database.faces.get(face_id)
@@ -1082,8 +1232,13 @@ async def get_liveness_status(
 
 def cleanup_resources():
     """리소스 정리 함수 (애플리케이션 종료 시 호출)"""
-    global _camera_handler
+    global _camera_handler, _face_database
 
     if _camera_handler is not None:
         _camera_handler.release()
         _camera_handler = None
+
+    # 대기 중인 인식 통계 기록
+    if _face_database is not None:
+        _face_database.close()
+        _face_database = None
@@ -4,6 +4,7 @@
 이 파일은 백엔드 서버의 진입점입니다.
 """
 
+import os
 import sys
 import argparse
 from camera.camera_handler import CameraHandler, test_camera
@@ -17,10 +18,11 @@ def main():
     parser.add_argument(
         '--mode',
         type=str,
-        choices=['camera', 'face_detection', 'face_recognition', 'register', 'server'],
+        choices=['camera', 'face_detection', 'face_recognition', 'register', 'bulk_import', 'server'],
         default='face_detection',
         help='실행 모드 (camera: 카메라 테스트, face_detection: 얼굴 감지 데모, '
-             'face_recognition: 얼굴 인식, register: 얼굴 등록, server: API 서버)'
+             'face_recognition: 얼굴 인식, register: 얼굴 등록, '
+             'bulk_import: 폴더 일괄 등록, server: API 서버)'
     )
     parser.add_argument(
         '--camera-id',
@@ -28,6 +30,35 @@ def main():
         default=0,
         help='카메라 ID (기본값: 0)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='server 모드 워커 프로세스 수 (2 이상이면 공유 갤러리 모드, 기본값: 1)'
+    )
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        default=None,
+        help='bulk_import 모드 입력 폴더 (하위 폴더 이름 = 인물 이름, 폴더 안의 사진을 등록)'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=4,
+        help='bulk_import 모드 임베딩 추출 프로세스 수 (기본값: 4)'
+    )
+    parser.add_argument(
+        '--model',
+        type=str,
+        default=None,
+        help='bulk_import/server 모드 InsightFace 모델 팩 (buffalo_s, buffalo_m, buffalo_l, 기본값: buffalo_l)'
+    )
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='bulk_import 모드에서 이전 진행 상황을 무시하고 처음부터 등록'
+    )
 
     args = parser.parse_args()
 
@@ -52,15 +83,30 @@ def main():
             print("\n[얼굴 인식 모드]")
             demo_face_recognition(camera_id=args.camera_id)
 
+        elif args.mode == 'bulk_import':
+            print("\n[일괄 등록 모드]")
+            if not args.input_dir:
+                print("--input-dir 옵션으로 입력 폴더를 지정하세요.")
+                sys.exit(1)
+
+            from bulk_import import run_bulk_import
+            run_bulk_import(
+                args.input_dir, processes=args.processes, model_name=args.model, restart=args.restart
+            )
+
         elif args.mode == 'server':
             print("\n[API 서버 모드]")
             print("FastAPI 서버를 시작합니다...")
             print("=" * 50)
 
+            # 모델 팩은 환경 변수로 워커 프로세스에 전달 (api.routes의 FACE_MODEL)
+            if args.model:
+                os.environ['FACE_MODEL'] = args.model
+
             # server.py의 main 함수 호출
             try:
                 from server import main as server_main
-                server_main()
+                server_main(workers=args.workers)
             except ImportError as e:
                 print(f"서버 모듈 로드 실패: {str(e)}")
                 print("필요한 패키지를 설치하세요: pip install fastapi uvicorn")
@@ -0,0 +1,169 @@
+"""
+검색 인덱스 벤치마크
+
+합성 갤러리에서 압축/근사 인덱스(float16/int8 재계산, PQ)의 검색 결과를 현재 find_match와 같은
+float32 전수 탐색(EmbeddingIndex)과 비교하여 recall 손실, 메모리, 검색 시간을 출력
+
+사용법:
+    python benchmark_index.py --faces 20000 --samples 5 --queries 500
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from typing import Callable, Dict, List, Tuple
+
+from models.embedding_index import EmbeddingIndex
+from models.embedding_store import EmbeddingStore
+from models.quantized_index import QuantizedIndex
+from models.pq_index import PQIndex
+
+
+def make_gallery(
+    num_faces: int,
+    samples_per_face: int,
+    num_queries: int,
+    dim: int = 512,
+    noise: float = 0.6,
+    seed: int = 0
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    얼굴별 중심 주변에 샘플이 모인 합성 갤러리와 쿼리 생성
+
+    Args:
+        num_faces (int): 얼굴 수
+        samples_per_face (int): 얼굴당 샘플 수
+        num_queries (int): 쿼리 수 (등록되지 않은 새 샘플)
+        dim (int): 임베딩 차원
+        noise (float): 중심 대비 샘플 잡음 크기 (클수록 어려움)
+        seed (int): 난수 시드
+
+    Returns:
+        Tuple[List[str], np.ndarray, np.ndarray]: (행별 face_id, (N, D) 갤러리, (Q, D) 쿼리)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_faces, dim)).astype(np.float32)
+
+    face_ids = [f'person_{i:06d}' for i in range(num_faces) for _ in range(samples_per_face)]
+    vectors = np.repeat(centers, samples_per_face, axis=0)
+    vectors += noise * rng.standard_normal(vectors.shape).astype(np.float32)
+
+    targets = rng.integers(0, num_faces, num_queries)
+    queries = centers[targets] + noise * rng.standard_normal((num_queries, dim)).astype(np.float32)
+    return face_ids, vectors, queries
+
+
+def evaluate(
+    name: str,
+    search: Callable[[np.ndarray], List[List[Tuple[str, float]]]],
+    queries: np.ndarray,
+    reference: List[List[Tuple[str, float]]],
+    memory_bytes: int,
+    batch_size: int = 32
+) -> Dict:
+    """
+    검색 함수를 기준 결과와 비교
+
+    Args:
+        name (str): 출력 이름
+        search (Callable): (N, D) 쿼리 → 쿼리별 (face_id, similarity) 리스트
+        queries (np.ndarray): (Q, D) 쿼리
+        reference (List): 전수 탐색 기준 결과
+        memory_bytes (int): 검색 시 메모리에 두는 행렬 크기
+        batch_size (int): 한 번에 검색할 쿼리 수
+
+    Returns:
+        Dict: recall@1, recall@k, 최대 점수 오차, 쿼리당 시간(ms), 메모리(MB)
+    """
+    results = []
+    start = time.perf_counter()
+    for begin in range(0, len(queries), batch_size):
+        results.extend(search(queries[begin:begin + batch_size]))
+    elapsed = time.perf_counter() - start
+
+    top1 = 0
+    overlap = 0
+    score_error = 0.0
+    for matches, expected in zip(results, reference):
+        if matches and matches[0][0] == expected[0][0]:
+            top1 += 1
+            score_error = max(score_error, abs(matches[0][1] - expected[0][1]))
+        overlap += len({fid for fid, _ in matches} & {fid for fid, _ in expected})
+
+    report = {
+        'name': name,
+        'recall@1': top1 / len(reference),
+        'recall@k': overlap / sum(len(expected) for expected in reference),
+        'max_score_error': score_error,
+        'ms_per_query': elapsed * 1000 / len(queries),
+        'memory_mb': memory_bytes / 2 ** 20,
+    }
+    print(
+        f"{name:<28} recall@1={report['recall@1']:.4f}  recall@k={report['recall@k']:.4f}  "
+        f"오차={report['max_score_error']:.2e}  {report['ms_per_query']:.3f} ms/쿼리  "
+        f"{report['memory_mb']:.1f} MB"
+    )
+    return report
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='검색 인덱스 recall/속도 벤치마크')
+    parser.add_argument('--faces', type=int, default=20000, help='얼굴 수 (기본값: 20000)')
+    parser.add_argument('--samples', type=int, default=5, help='얼굴당 샘플 수 (기본값: 5)')
+    parser.add_argument('--queries', type=int, default=500, help='쿼리 수 (기본값: 500)')
+    parser.add_argument('--top-k', type=int, default=5, help='recall@k의 k (기본값: 5)')
+    parser.add_argument('--rerank', type=int, default=64, help='원본 재계산 후보 수 (기본값: 64)')
+    args = parser.parse_args()
+
+    print(f"갤러리 생성 중: {args.faces}명 x {args.samples}샘플, 쿼리 {args.queries}개")
+    face_ids, vectors, queries = make_gallery(args.faces, args.samples, args.queries)
+
+    # 기준: 현재 find_match와 같은 float32 전수 탐색
+    exact = EmbeddingIndex(dim=vectors.shape[1])
+    exact.build_arrays(face_ids, vectors)
+    reference = exact.search_batch(queries, top_k=args.top_k)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print("-" * 110)
+        evaluate(
+            'float32 전수 탐색 (기준)',
+            lambda q: exact.search_batch(q, top_k=args.top_k),
+            queries, reference, exact.snapshot().matrix.nbytes
+        )
+
+        for store_dtype in ('float32', 'float16'):
+            store = EmbeddingStore(
+                os.path.join(temp_dir, f'embeddings_{store_dtype}.bin'),
+                dim=vectors.shape[1], dtype=store_dtype
+            )
+            store.append_many(face_ids, [0] * len(face_ids), vectors)
+
+            for precision in ('float16', 'int8'):
+                index = QuantizedIndex(store, precision=precision, rerank=args.rerank)
+                index.sync()
+                evaluate(
+                    f'{precision} + {store_dtype} 재계산',
+                    lambda q: index.search_batch(q, top_k=args.top_k),
+                    queries, reference, index.snapshot().codes.nbytes
+                )
+            store.close()
+
+        # PQ: 원본 재계산 없이 코드만으로 검색 (단말용 압축 갤러리)
+        pq = PQIndex(dim=vectors.shape[1], min_train_size=0)
+        pq.build_arrays(face_ids, vectors)
+        evaluate(
+            f'PQ {pq.num_subspaces}바이트 (ADC)',
+            lambda q: pq.search_batch(q, top_k=args.top_k),
+            queries, reference, pq.snapshot().codes.nbytes + pq.snapshot().inv_norms.nbytes
+        )
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+모델 팩 속도/정확도 벤치마크
+
+모델 팩(buffalo_s/m/l 등)마다 로컬 이미지 세트로 시작 시간, 이미지당 지연 시간(감지+임베딩),
+배치 처리량(extract_embeddings_batch)을 측정하고, 인물별 폴더 구조면 find_match top-1 정확도도 계산합니다.
+배포 등급(CPU 노드, GPU 엣지, 서버)별 모델 선택에 사용합니다.
+
+사용법:
+    python benchmark_models.py --images ../test_images --repeat 5
+    python benchmark_models.py --images photos/ --models buffalo_s buffalo_l --device cpu --output bench.json
+
+    photos/        (bulk_import와 같은 구조면 정확도 측정, 사진만 있는 폴더면 속도만 측정)
+        홍길동/
+            001.jpg
+            002.jpg
+"""
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from benchmark_profiles import load_images
+from bulk_import import collect_photos, read_image, select_best_face
+from quantize_models import top1_accuracy
+from models.face_recognition import FaceRecognizer
+from models.model_zoo import MODEL_ZOO, installed_models
+
+
+def load_labeled_images(path: str) -> List[Tuple[Optional[str], np.ndarray]]:
+    """
+    벤치마크 이미지 로드 (인물별 폴더면 이름 포함, 사진만 있는 폴더면 이름 None)
+
+    Args:
+        path (str): 이미지 폴더
+
+    Returns:
+        List[Tuple[Optional[str], np.ndarray]]: (이름, BGR 이미지) 목록
+    """
+    if not path or not os.path.isdir(path):
+        return []
+
+    photos = collect_photos(path)
+    if not photos:
+        return [(None, image) for image in load_images(path)]
+
+    images = []
+    for name, relpath in photos:
+        image = read_image(os.path.join(path, relpath))
+        if image is not None:
+            images.append((name, image))
+    return images
+
+
+def identification_accuracy(
+    recognizer: FaceRecognizer,
+    samples: List[Tuple[Optional[str], np.ndarray]]
+) -> Tuple[Optional[float], int]:
+    """
+    인물별 첫 사진을 갤러리, 나머지를 쿼리로 한 find_match top-1 정확도
+
+    Args:
+        recognizer (FaceRecognizer): 측정할 인식기
+        samples (List[Tuple[Optional[str], np.ndarray]]): (이름, 이미지) 목록
+
+    Returns:
+        Tuple[Optional[float], int]: (정확도, 쿼리 수) (이름이 없으면 (None, 0))
+    """
+    gallery: Dict[str, np.ndarray] = {}
+    queries = []
+    for name, image in samples:
+        if name is None:
+            continue
+        faces = recognizer.detect_and_extract(image)
+        embedding = select_best_face(faces)['embedding'] if faces else None
+        if name not in gallery:
+            if embedding is not None:
+                gallery[name] = embedding
+        else:
+            queries.append((name, embedding))
+    return top1_accuracy(gallery, queries), len(queries)
+
+
+def benchmark_model(
+    model_name: str,
+    samples: List[Tuple[Optional[str], np.ndarray]],
+    device: str = 'auto',
+    repeat: int = 3,
+    batch_size: int = 32
+) -> Dict:
+    """
+    모델 팩 1개 측정
+
+    Args:
+        model_name (str): 모델 팩 이름
+        samples (List[Tuple[Optional[str], np.ndarray]]): (이름, 이미지) 목록
+        device (str): 'auto', 'cuda', 'cpu'
+        repeat (int): 지연 시간/처리량 측정 반복 횟수
+        batch_size (int): 처리량 측정 시 인식 모델 배치 크기
+
+    Returns:
+        Dict: startup_s, latency_ms(mean, p50, p95), throughput_ips, faces_per_image, top1, queries
+    """
+    images = [image for _, image in samples]
+
+    start = time.perf_counter()
+    recognizer = FaceRecognizer(model_name=model_name, device=device, profile='recognition_only')
+    startup = time.perf_counter() - start
+
+    recognizer.detect_and_extract(images[0])  # 워밍업
+
+    # 1. 이미지 1장씩 처리할 때의 지연 시간 (스트림/API 등록 경로)
+    timings, faces = [], 0
+    for _ in range(repeat):
+        for image in images:
+            start = time.perf_counter()
+            faces += len(recognizer.detect_and_extract(image))
+            timings.append(time.perf_counter() - start)
+    timings_ms = np.array(timings) * 1e3
+
+    # 2. 배치 처리량 (일괄 등록 경로)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        recognizer.extract_embeddings_batch(images, max_batch_size=batch_size)
+    throughput = len(images) * repeat / (time.perf_counter() - start)
+
+    top1, queries = identification_accuracy(recognizer, samples)
+    spec = MODEL_ZOO.get(model_name)
+    return {
+        'model_name': model_name,
+        'tier': spec.tier if spec else None,
+        'embedding_model': recognizer.get_model_info()['embedding_model'],
+        'device': recognizer.device,
+        'startup_s': startup,
+        'latency_ms': {
+            'mean': float(timings_ms.mean()),
+            'p50': float(np.percentile(timings_ms, 50)),
+            'p95': float(np.percentile(timings_ms, 95)),
+        },
+        'throughput_ips': throughput,
+        'faces_per_image': faces / len(timings),
+        'top1': top1,
+        'queries': queries,
+    }
+
+
+def main():
+    """메인 함수"""
+    default_models = [name for name in MODEL_ZOO if name in installed_models()] or ['buffalo_l']
+
+    parser = argparse.ArgumentParser(description='모델 팩 속도/정확도 벤치마크')
+    parser.add_argument('--images', type=str, default=None,
+                        help='이미지 폴더 (인물별 폴더면 정확도도 측정, 없으면 640x480 빈 프레임)')
+    parser.add_argument('--models', nargs='+', default=default_models,
+                        help=f"측정할 모델 팩 (기본값: 설치된 {', '.join(MODEL_ZOO)})")
+    parser.add_argument('--device', type=str, default='auto', help="실행 디바이스 ('auto', 'cuda', 'cpu')")
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본값: 3)')
+    parser.add_argument('--batch-size', type=int, default=32, help='처리량 측정 배치 크기 (기본값: 32)')
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    samples = load_labeled_images(args.images)
+    if not samples:
+        print("얼굴 사진이 없어 빈 프레임으로 측정합니다 (감지 모델 시간만 반영됨).")
+        samples = [(None, np.zeros((480, 640, 3), dtype=np.uint8))]
+
+    results = []
+    for model_name in args.models:
+        print(f"\n[{model_name}] 측정 중... (이미지 {len(samples)}장 x {args.repeat}회)")
+        results.append(benchmark_model(model_name, samples, args.device, args.repeat, args.batch_size))
+
+    print("=" * 100)
+    print(f"{'모델':<12}{'등급':<10}{'시작(s)':>9}{'평균(ms)':>10}{'p95(ms)':>10}"
+          f"{'처리량(장/s)':>14}{'얼굴/장':>9}{'top-1':>9}  인식 모델")
+    for result in results:
+        top1 = f"{result['top1']:.3f}" if result['top1'] is not None else '-'
+        print(f"{result['model_name']:<12}{result['tier'] or '-':<10}{result['startup_s']:>9.2f}"
+              f"{result['latency_ms']['mean']:>10.1f}{result['latency_ms']['p95']:>10.1f}"
+              f"{result['throughput_ips']:>14.1f}{result['faces_per_image']:>9.2f}{top1:>9}"
+              f"  {result['embedding_model']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+추론 프로필 벤치마크
+
+프로필별로 FaceRecognizer 시작 시간(모델 로드)과 프레임당 detect_and_extract 시간을 측정
+
+사용법:
+    python benchmark_profiles.py --images ../test_images --repeat 20
+    python benchmark_profiles.py --profiles recognition_only full --device cpu
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+from typing import List
+
+from bulk_import import IMAGE_EXTENSIONS, read_image
+from models.face_recognition import FaceRecognizer, INFERENCE_PROFILES
+
+
+def load_images(path: str) -> List[np.ndarray]:
+    """벤치마크 이미지 로드 (폴더가 없으면 빈 목록)"""
+    if not path or not os.path.isdir(path):
+        return []
+    images = []
+    for filename in sorted(os.listdir(path)):
+        if filename.lower().endswith(IMAGE_EXTENSIONS):
+            image = read_image(os.path.join(path, filename))
+            if image is not None:
+                images.append(image)
+    return images
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='추론 프로필 벤치마크')
+    parser.add_argument('--images', type=str, default=None, help='얼굴 사진 폴더 (없으면 640x480 빈 프레임)')
+    parser.add_argument('--profiles', nargs='+', default=list(INFERENCE_PROFILES),
+                        choices=list(INFERENCE_PROFILES), help='측정할 프로필 (기본값: 전체)')
+    parser.add_argument('--device', type=str, default='auto', help="실행 디바이스 ('auto', 'cuda', 'cpu')")
+    parser.add_argument('--repeat', type=int, default=10, help='이미지당 반복 횟수 (기본값: 10)')
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    if not images:
+        print("얼굴 사진이 없어 빈 프레임으로 측정합니다 (감지 모델 시간만 반영됨).")
+        images = [np.zeros((480, 640, 3), dtype=np.uint8)]
+
+    rows = []
+    for profile in args.profiles:
+        start = time.perf_counter()
+        recognizer = FaceRecognizer(device=args.device, profile=profile)
+        startup = time.perf_counter() - start
+
+        recognizer.detect_and_extract(images[0])  # 워밍업
+        timings, faces = [], 0
+        for _ in range(args.repeat):
+            for image in images:
+                start = time.perf_counter()
+                faces += len(recognizer.detect_and_extract(image))
+                timings.append(time.perf_counter() - start)
+
+        timings_ms = np.array(timings) * 1e3
+        rows.append((
+            profile, startup, float(timings_ms.mean()), float(np.percentile(timings_ms, 95)),
+            faces / len(timings), ','.join(recognizer.get_model_info()['loaded_modules'])
+        ))
+        del recognizer
+
+    print("=" * 90)
+    print(f"{'프로필':<18}{'시작(s)':>9}{'프레임 평균(ms)':>16}{'p95(ms)':>10}{'얼굴/프레임':>12}  모듈")
+    for profile, startup, mean, p95, faces_per_frame, modules in rows:
+        print(f"{profile:<18}{startup:>9.2f}{mean:>16.1f}{p95:>10.1f}{faces_per_frame:>12.1f}  {modules}")
+
+
+if __name__ == "__main__":
+    main()
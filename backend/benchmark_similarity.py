@@ -0,0 +1,79 @@
+"""
+유사도 커널 마이크로벤치마크
+
+sklearn(기존 compute_similarity), NumPy, simsimd의 코사인/내적 계산 시간을
+float32/float16/int8 자료형과 쿼리 수별로 비교
+
+사용법:
+    python benchmark_similarity.py --rows 100000 --repeat 5
+"""
+
+import time
+import argparse
+import numpy as np
+from typing import Callable
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from utils.similarity import available_backends, cosine, pairwise_dot
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """함수를 repeat번 실행한 최소 시간 (초, 첫 실행은 워밍업으로 제외)"""
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='유사도 커널 마이크로벤치마크')
+    parser.add_argument('--rows', type=int, default=100000, help='갤러리 행 수 (기본값: 100000)')
+    parser.add_argument('--dim', type=int, default=512, help='임베딩 차원 (기본값: 512)')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (기본값: 5)')
+    args = parser.parse_args()
+
+    backends = available_backends()
+    rng = np.random.default_rng(0)
+    a, b = rng.standard_normal((2, args.dim)).astype(np.float32)
+
+    print(f"사용 가능한 백엔드: {', '.join(backends)}")
+    print("-" * 70)
+    print("두 벡터 코사인 유사도 (compute_similarity)")
+    pair = {'sklearn': lambda: cosine_similarity(a.reshape(1, -1), b.reshape(1, -1))[0][0]}
+    for backend in backends:
+        pair[backend] = lambda backend=backend: cosine(a, b, backend=backend)
+    for name, func in pair.items():
+        print(f"  {name:<10} {measure(func, args.repeat * 200) * 1e6:10.2f} µs")
+
+    gallery = rng.standard_normal((args.rows, args.dim)).astype(np.float32)
+    gallery /= np.linalg.norm(gallery, axis=1, keepdims=True)
+    encoded = {
+        'float32': gallery,
+        'float16': gallery.astype(np.float16),
+        'int8': np.rint(gallery / np.abs(gallery).max() * 127).astype(np.int8),
+    }
+
+    print("-" * 70)
+    print(f"갤러리 {args.rows}행 x {args.dim}차원 내적 (find_match)")
+    for num_queries in (1, 8, 32):
+        queries = rng.standard_normal((num_queries, args.dim)).astype(np.float32)
+        for dtype, matrix in encoded.items():
+            if dtype == 'int8':
+                typed = np.rint(queries / np.abs(queries).max() * 127).astype(np.int8)
+            else:
+                typed = queries.astype(dtype)
+            timings = [
+                f"{backend}={measure(lambda: pairwise_dot(typed, matrix, backend=backend), args.repeat) * 1e3:8.2f} ms"
+                for backend in backends
+            ]
+            auto = measure(lambda: pairwise_dot(typed, matrix), args.repeat) * 1e3
+            print(f"  쿼리 {num_queries:>2}개 {dtype:<8} {'  '.join(timings)}  auto={auto:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+얼굴 일괄 등록 모듈
+
+인물별 폴더(폴더 이름 = 이름)의 사진을 프로세스 풀의 FaceRecognizer 워커로 처리하고,
+사진마다 가장 큰 얼굴의 임베딩을 골라 데이터베이스에 한 번에 등록
+
+사용법:
+    python app.py --mode bulk_import --input-dir photos/ --processes 4
+
+    photos/
+        홍길동/
+            001.jpg
+            002.jpg
+        김철수/
+            a.png
+
+추출 결과는 진행 파일(입력 폴더의 .bulk_import_progress.jsonl)에 사진마다 기록되므로
+중단 후 다시 실행하면 남은 사진만 처리하며, 등록이 끝나면 진행 파일에 완료 표시를 남깁니다.
+"""
+
+import os
+import json
+import base64
+import numpy as np
+import cv2
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models.model_zoo import resolve_model_name
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+PROGRESS_FILE = '.bulk_import_progress.jsonl'
+REPORT_FILE = 'bulk_import_report.json'
+FACE_MARGIN = 0.2  # 저장할 얼굴 이미지의 bbox 여백 비율
+
+# 워커 프로세스별 인식기 (initializer에서 한 번 생성)
+_recognizer = None
+
+
+def collect_photos(input_dir: str) -> List[Tuple[str, str]]:
+    """
+    인물별 폴더에서 사진 목록 수집 (하위 폴더 포함)
+
+    Args:
+        input_dir (str): 입력 폴더 (직속 하위 폴더 이름을 인물 이름으로 사용)
+
+    Returns:
+        List[Tuple[str, str]]: (이름, input_dir 기준 상대 경로) 목록 (정렬됨)
+    """
+    photos = []
+    for name in sorted(os.listdir(input_dir)):
+        person_dir = os.path.join(input_dir, name)
+        if name.startswith('.') or not os.path.isdir(person_dir):
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(person_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.relpath(os.path.join(dirpath, filename), input_dir)
+                    photos.append((name, path.replace(os.sep, '/')))
+
+    return photos
+
+
+def read_image(path: str) -> Optional[np.ndarray]:
+    """이미지 읽기 (cv2.imread가 읽지 못하는 한글 경로 지원)"""
+    try:
+        return cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    except Exception:
+        return None
+
+
+def select_best_face(faces: List[Dict]) -> Dict:
+    """
+    사진에서 등록에 쓸 얼굴 선택 (bbox 면적이 가장 큰 얼굴)
+
+    Args:
+        faces (List[Dict]): detect_and_extract 결과
+
+    Returns:
+        Dict: 선택된 얼굴
+    """
+    def area(face: Dict) -> int:
+        x1, y1, x2, y2 = face['bbox']
+        return max(0, int(x2) - int(x1)) * max(0, int(y2) - int(y1))
+
+    return max(faces, key=area)
+
+
+def crop_face(image: np.ndarray, bbox, margin: float = FACE_MARGIN) -> np.ndarray:
+    """bbox 주변 여백을 포함한 얼굴 영역 (이미지 경계로 자름)"""
+    x1, y1, x2, y2 = [int(v) for v in bbox]
+    pad_x, pad_y = int((x2 - x1) * margin), int((y2 - y1) * margin)
+    height, width = image.shape[:2]
+    crop = image[max(0, y1 - pad_y):min(height, y2 + pad_y), max(0, x1 - pad_x):min(width, x2 + pad_x)]
+    return crop if crop.size else image
+
+
+class ImportProgress:
+    """
+    일괄 등록 진행 파일 (JSON Lines)
+
+    사진마다 추출 결과(임베딩, 얼굴 이미지 JPEG)를 한 줄로 기록하고,
+    데이터베이스 등록이 끝나면 {"committed": ...} 줄을 추가합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): 진행 파일 경로
+        """
+        self.path = path
+        self.entries: Dict[str, Dict] = {}  # 상대 경로 → 결과
+        self.committed = False
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 중단 시 잘린 마지막 줄
+                    if 'committed' in entry:
+                        self.committed = True
+                    else:
+                        self.entries[entry['path']] = entry
+
+        self._file = None
+
+    def record(self, entry: Dict) -> None:
+        """사진 결과 1건 기록"""
+        self._write(entry)
+        self.entries[entry['path']] = entry
+
+    def mark_committed(self, face_count: int) -> None:
+        """데이터베이스 등록 완료 표시"""
+        self._write({'committed': datetime.now().isoformat(), 'faces': face_count})
+        self.committed = True
+
+    def _write(self, data: Dict) -> None:
+        """한 줄 추가 (바로 flush하여 중단되어도 유지)"""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(data, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        """진행 파일 닫기"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def encode(embedding: np.ndarray, face_image: Optional[np.ndarray]) -> Dict:
+        """임베딩(float32)과 얼굴 이미지(JPEG)를 base64 문자열로 변환"""
+        data = {'embedding': base64.b64encode(np.asarray(embedding, dtype=np.float32).tobytes()).decode('ascii')}
+        if face_image is not None:
+            ok, buffer = cv2.imencode('.jpg', face_image)
+            if ok:
+                data['image'] = base64.b64encode(buffer.tobytes()).decode('ascii')
+        return data
+
+    @staticmethod
+    def decode(entry: Dict) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """encode로 기록한 임베딩과 얼굴 이미지 복원"""
+        embedding = np.frombuffer(base64.b64decode(entry['embedding']), dtype=np.float32)
+        face_image = None
+        if entry.get('image'):
+            face_image = cv2.imdecode(np.frombuffer(base64.b64decode(entry['image']), dtype=np.uint8), cv2.IMREAD_COLOR)
+        return embedding, face_image
+
+
+def _init_worker(model_name: Optional[str], device: str) -> None:
+    """워커 프로세스 초기화 (프로세스마다 모델 1회 로드)"""
+    global _recognizer
+    from models.face_recognition import FaceRecognizer
+    _recognizer = FaceRecognizer(model_name=model_name, device=device, profile='recognition_only')
+
+
+def extract_photo(path: str) -> Dict:
+    """
+    사진 1장에서 등록용 얼굴 추출 (워커 프로세스에서 실행)
+
+    Args:
+        path (str): 사진 파일 경로
+
+    Returns:
+        Dict: status ('ok', 'read_failed', 'no_face', 'error'),
+            성공 시 embedding/image(진행 파일 형식)와 감지된 얼굴 수(faces),
+            실패 시 error 메시지
+    """
+    image = read_image(path)
+    if image is None:
+        return {'status': 'read_failed', 'error': '이미지를 읽을 수 없습니다'}
+
+    try:
+        faces = _recognizer.detect_and_extract(image)
+    except Exception as e:
+        return {'status': 'error', 'error': str(e)}
+
+    if not faces:
+        return {'status': 'no_face', 'error': '얼굴이 감지되지 않았습니다'}
+
+    best = select_best_face(faces)
+    return {'status': 'ok', 'faces': len(faces), **ImportProgress.encode(best['embedding'], crop_face(image, best['bbox']))}
+
+
+def run_bulk_import(
+    input_dir: str,
+    processes: int = 4,
+    model_name: Optional[str] = None,
+    device: str = 'auto',
+    restart: bool = False,
+    database=None
+) -> Dict:
+    """
+    폴더의 사진을 일괄 등록
+
+    Args:
+        input_dir (str): 인물별 폴더가 있는 입력 폴더
+        processes (int): 추출 워커 프로세스 수 (1이면 현재 프로세스에서 처리)
+        model_name (Optional[str]): InsightFace 모델 팩 이름 (None이면 buffalo_l)
+        device (str): 'auto', 'cuda', 'cpu'
+        restart (bool): 기존 진행 파일을 무시하고 처음부터 처리
+        database (Optional[FaceDatabase]): 등록할 데이터베이스 (None이면 기본 데이터베이스)
+
+    Returns:
+        Dict: 결과 보고서 (total, registered, failed, faces, errors)
+    """
+    progress_path = os.path.join(input_dir, PROGRESS_FILE)
+    if restart and os.path.exists(progress_path):
+        os.remove(progress_path)
+
+    # 추출 전에 데이터베이스의 임베딩 모델 확인 (다른 모델의 갤러리면 바로 중단)
+    model_name = resolve_model_name(model_name)
+    if database is None:
+        from models.face_database import FaceDatabase
+        database = FaceDatabase(model_name=model_name)
+    else:
+        database.bind_model(model_name)
+
+    progress = ImportProgress(progress_path)
+    if progress.committed:
+        print(f"이미 등록이 완료된 폴더입니다. 다시 등록하려면 --restart를 사용하세요: {progress_path}")
+        return {'total': len(progress.entries), 'registered': 0, 'failed': 0, 'faces': 0, 'errors': []}
+
+    photos = collect_photos(input_dir)
+    pending = [(name, path) for name, path in photos if path not in progress.entries]
+    print(f"사진 {len(photos)}장 (인물 {len({name for name, _ in photos})}명), "
+          f"처리할 사진 {len(pending)}장 (이전 진행분 {len(photos) - len(pending)}장)")
+
+    try:
+        # 1. 임베딩 추출 (결과를 받을 때마다 진행 파일에 기록)
+        paths = [os.path.join(input_dir, path) for _, path in pending]
+        executor = None
+        if not paths:
+            results = iter(())
+        elif processes <= 1:
+            _init_worker(model_name, device)
+            results = map(extract_photo, paths)
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_worker, initargs=(model_name, device)
+            )
+            results = executor.map(extract_photo, paths, chunksize=4)
+
+        try:
+            for i, ((name, path), result) in enumerate(zip(pending, results), 1):
+                progress.record({'path': path, 'name': name, **result})
+                if result['status'] != 'ok':
+                    print(f"  [{i}/{len(pending)}] {path}: {result['error']}")
+                elif i % 100 == 0 or i == len(pending):
+                    print(f"  [{i}/{len(pending)}] 추출 완료")
+        finally:
+            if executor is not None:
+                # 중단 시 대기 중인 사진은 취소 (진행 파일에 기록된 사진만 다음 실행에서 건너뜀)
+                executor.shutdown(cancel_futures=True)
+
+        # 2. 데이터베이스 등록 (한 번의 배치 기록 + 한 번의 저장)
+        entries = [progress.entries[path] for _, path in photos if path in progress.entries]
+        succeeded = [entry for entry in entries if entry['status'] == 'ok']
+        samples = [(entry['name'], *ImportProgress.decode(entry)) for entry in succeeded]
+
+        face_ids = database.enroll_samples(samples, source='bulk_import')
+        if samples and not database.save():
+            raise RuntimeError("데이터베이스 저장에 실패했습니다")
+        progress.mark_committed(len(set(face_ids)))
+
+    finally:
+        progress.close()
+
+    errors = [
+        {'path': entry['path'], 'name': entry['name'], 'status': entry['status'], 'error': entry['error']}
+        for entry in entries if entry['status'] != 'ok'
+    ]
+    report = {
+        'total': len(entries),
+        'registered': len(succeeded),
+        'failed': len(errors),
+        'faces': len(set(face_ids)),
+        'errors': errors,
+    }
+
+    report_path = os.path.join(input_dir, REPORT_FILE)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("=" * 50)
+    print(f"등록 {report['registered']}장 / 실패 {report['failed']}장 (얼굴 {report['faces']}명)")
+    print(f"결과 보고서: {report_path}")
+    return report
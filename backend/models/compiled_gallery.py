@@ -0,0 +1,157 @@
+"""
+컴파일된 갤러리 스냅샷 모듈
+
+정규화된 임베딩 행렬, 얼굴 ID 테이블, 저장소 행 번호와 내용 체크섬을 단일 파일로 저장하여
+재시작 시 저장소 행을 모으고 정규화하는 과정 없이 한 번에 읽어 검색 인덱스를 구성
+"""
+
+import os
+import zlib
+import struct
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class CompiledGallery:
+    """
+    검색 인덱스 구성용 갤러리 배열
+
+    행 순서는 face_id 순서 → 얼굴별 embedding_rows 순서이며,
+    저장소 세대 번호와 행 번호가 현재 데이터와 같을 때만 유효합니다.
+
+    파일 헤더 (64바이트) 뒤에 행렬(float32) | 라벨(i64) | 행 번호(i64) | NUL로 구분한 face_id(UTF-8)를
+    연속으로 저장하며, 체크섬은 헤더 뒤 전체 바이트의 CRC32입니다.
+        magic(8) | version(u32) | dim(u32) | 행 수(u64) | 얼굴 수(u64) | 세대 번호(u64)
+        | face_id 바이트 수(u64) | 체크섬(u32) | 예약(u32)
+    """
+
+    MAGIC = b'FRCOMPL\x00'
+    VERSION = 1
+    HEADER_SIZE = 64
+    HEADER_FORMAT = '<8sIIQQQQII'
+
+    matrix: np.ndarray  # (R, D) L2 정규화된 float32 행렬
+    labels: np.ndarray  # 행 → 라벨 (int64)
+    face_ids: List[str]  # 라벨 → face_id
+    rows: np.ndarray  # 행 → 저장소 행 번호 (int64)
+    generation: int  # 컴파일 시점의 저장소 세대 번호
+
+    def row_face_ids(self) -> List[str]:
+        """행별 face_id 목록"""
+        return [self.face_ids[label] for label in self.labels.tolist()]
+
+    def matches(self, face_ids: List[str], labels: np.ndarray, rows: np.ndarray, generation: int) -> bool:
+        """
+        현재 메타데이터/저장소와 같은 내용인지 확인
+
+        Args:
+            face_ids (List[str]): 현재 얼굴 ID 테이블
+            labels (np.ndarray): 현재 행별 라벨
+            rows (np.ndarray): 현재 행별 저장소 행 번호
+            generation (int): 현재 저장소 세대 번호
+
+        Returns:
+            bool: 일치 여부
+        """
+        return (
+            self.generation == generation
+            and self.face_ids == face_ids
+            and np.array_equal(self.labels, labels)
+            and np.array_equal(self.rows, rows)
+        )
+
+    @staticmethod
+    def _parts(matrix: np.ndarray, labels: np.ndarray, rows: np.ndarray, face_ids: bytes) -> List[memoryview]:
+        """파일 본문을 이루는 바이트 구간 (복사 없음)"""
+        arrays = (
+            np.ascontiguousarray(matrix, dtype=np.float32),
+            np.ascontiguousarray(labels, dtype='<i8'),
+            np.ascontiguousarray(rows, dtype='<i8'),
+        )
+        return [memoryview(array.reshape(-1).view(np.uint8)) for array in arrays] + [memoryview(face_ids)]
+
+    def save(self, path: str) -> bool:
+        """
+        단일 파일로 저장 (임시 파일 작성 후 원자적 교체)
+
+        Args:
+            path (str): 저장 경로
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            face_ids = '\x00'.join(self.face_ids).encode('utf-8')
+            parts = self._parts(self.matrix, self.labels, self.rows, face_ids)
+            checksum = 0
+            for part in parts:
+                checksum = zlib.crc32(part, checksum)
+
+            header = struct.pack(
+                self.HEADER_FORMAT, self.MAGIC, self.VERSION, self.matrix.shape[1],
+                len(self.rows), len(self.face_ids), self.generation, len(face_ids), checksum, 0
+            )
+
+            # 여러 프로세스가 동시에 컴파일해도 임시 파일이 겹치지 않도록 PID 사용
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(header.ljust(self.HEADER_SIZE, b'\x00'))
+                for part in parts:
+                    f.write(part)
+            os.replace(tmp_path, path)
+            return True
+
+        except Exception as e:
+            print(f"컴파일된 스냅샷 저장 실패: {str(e)}")
+            return False
+
+    @classmethod
+    def load(cls, path: str, dim: int) -> Optional['CompiledGallery']:
+        """
+        파일 본문을 한 번에 읽어 복원 (형식/차원/체크섬이 맞지 않으면 None)
+
+        Args:
+            path (str): 스냅샷 파일 경로
+            dim (int): 임베딩 차원
+
+        Returns:
+            Optional[CompiledGallery]: 복원된 갤러리 (파일이 없거나 손상되면 None)
+        """
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(cls.HEADER_SIZE)
+                (magic, version, file_dim, num_rows, num_faces,
+                 generation, ids_size, checksum, _) = struct.unpack_from(cls.HEADER_FORMAT, header)
+                if magic != cls.MAGIC or version != cls.VERSION or file_dim != dim:
+                    print(f"컴파일된 스냅샷 형식 불일치: {path}")
+                    return None
+
+                # 0으로 채우지 않은 버퍼에 본문 전체를 한 번에 읽기
+                body = np.empty(num_rows * (dim * 4 + 16) + ids_size, dtype=np.uint8)
+                if f.readinto(memoryview(body)) != len(body):
+                    print(f"컴파일된 스냅샷이 잘렸습니다: {path}")
+                    return None
+
+            if zlib.crc32(body) != checksum:
+                print(f"컴파일된 스냅샷 체크섬 불일치: {path}")
+                return None
+
+            matrix_size = num_rows * dim * 4
+            matrix = body[:matrix_size].view(np.float32).reshape(num_rows, dim)
+            labels = body[matrix_size:matrix_size + num_rows * 8].view('<i8')
+            rows = body[matrix_size + num_rows * 8:matrix_size + num_rows * 16].view('<i8')
+            face_ids = body[len(body) - ids_size:].tobytes().decode('utf-8').split('\x00') if num_faces else []
+
+            return cls(
+                matrix=matrix, labels=labels.astype(np.int64), face_ids=face_ids,
+                rows=rows.astype(np.int64), generation=generation
+            )
+
+        except Exception as e:
+            print(f"컴파일된 스냅샷 로드 실패: {str(e)}")
+            return None
@@ -0,0 +1,398 @@
+"""
+임베딩 인덱스 모듈
+
+등록된 얼굴 임베딩을 메모리에 하나의 행렬로 유지하여 빠르게 검색
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from models.compiled_gallery import CompiledGallery
+from utils.similarity import pairwise_dot
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """
+    검색 인덱스의 불변 스냅샷
+
+    쓰기 연산은 배열을 제자리에서 고치지 않고 새 스냅샷을 만들어 참조만 교체하므로,
+    검색은 잠금 없이 참조 하나를 잡고 일관된 상태를 읽습니다.
+    """
+    matrix: np.ndarray  # (R, D) L2 정규화된 float32 행렬 (읽기 전용)
+    labels: np.ndarray  # 행 → 라벨 (읽기 전용)
+    face_ids: List[str]  # 라벨 → face_id (append-only, 기존 항목은 바뀌지 않음)
+
+
+class EmbeddingIndex:
+    """
+    인메모리 임베딩 인덱스
+
+    모든 샘플 임베딩을 L2 정규화된 float32 행렬 하나로 보관하고,
+    행 → face_id 매핑을 통해 얼굴 단위 최고 유사도를 계산합니다.
+    정규화된 벡터의 내적은 코사인 유사도와 같으므로 쿼리당 행렬곱 1회로 검색합니다.
+
+    검색은 불변 스냅샷(copy-on-write)을 읽으므로 잠금이 필요 없고,
+    쓰기(add/replace/remove/build)는 호출자가 직렬화해야 합니다 (FaceDatabase의 쓰기 잠금).
+
+    Attributes:
+        dim (int): 임베딩 차원
+    """
+
+    EARLY_EXIT_BLOCK = 4096  # 조기 종료 탐색 시 한 번에 계산하는 행 수
+
+    def __init__(self, dim: int = 512):
+        """
+        임베딩 인덱스 초기화
+
+        Args:
+            dim (int): 임베딩 차원
+        """
+        self.dim = dim
+        self.clear()
+
+    @staticmethod
+    def normalize(embeddings: np.ndarray) -> np.ndarray:
+        """
+        임베딩을 float32 2D 배열로 변환하고 L2 정규화
+
+        Args:
+            embeddings (np.ndarray): (D,) 또는 (N, D) 임베딩
+
+        Returns:
+            np.ndarray: (N, D) 정규화된 float32 배열
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def snapshot(self) -> IndexSnapshot:
+        """현재 검색 스냅샷 (잠금 없이 읽기 가능)"""
+        return self._snapshot
+
+    def _publish(self, matrix: np.ndarray, labels: np.ndarray) -> None:
+        """새 스냅샷 게시 (참조 교체 한 번으로 원자적)"""
+        matrix.flags.writeable = False
+        labels.flags.writeable = False
+        self._snapshot = IndexSnapshot(matrix=matrix, labels=labels, face_ids=self._face_ids)
+
+    def build(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """
+        (face_id, embedding) 목록으로 인덱스 전체 재구성
+
+        Args:
+            items (Iterable[Tuple[str, np.ndarray]]): 샘플 목록
+        """
+        face_ids = []
+        rows = []
+        for face_id, embedding in items:
+            face_ids.append(face_id)
+            rows.append(np.asarray(embedding, dtype=np.float32).reshape(-1))
+
+        vectors = np.stack(rows) if rows else np.empty((0, self.dim), dtype=np.float32)
+        self.build_arrays(face_ids, vectors)
+
+    def build_arrays(self, face_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        행별 face_id 목록과 (N, D) 임베딩 행렬로 인덱스 전체 재구성
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            vectors (np.ndarray): (N, D) 임베딩
+        """
+        if len(face_ids) == 0:
+            self.clear()
+            return
+
+        labels = self._new_labels(face_ids)
+        self._publish(self.normalize(vectors), labels)
+
+    def build_compiled(self, gallery: CompiledGallery) -> None:
+        """
+        컴파일된 갤러리로 인덱스 전체 재구성
+
+        전수 탐색 인덱스는 정규화된 행렬과 라벨 테이블을 그대로 사용하고,
+        자체 구성 방식(학습/인코딩/대표 샘플 선택)이 있는 하위 클래스는 build_arrays를 거칩니다.
+
+        Args:
+            gallery (CompiledGallery): 컴파일된 갤러리
+        """
+        if type(self).build_arrays is not EmbeddingIndex.build_arrays or len(gallery.labels) == 0:
+            self.build_arrays(gallery.row_face_ids(), gallery.matrix)
+            return
+
+        self._face_ids = list(gallery.face_ids)
+        self._label_of = {face_id: label for label, face_id in enumerate(self._face_ids)}
+        self._publish(gallery.matrix, gallery.labels)
+
+    def clear(self) -> None:
+        """인덱스 초기화"""
+        self._face_ids: List[str] = []  # 라벨 → face_id
+        self._label_of: Dict[str, int] = {}  # face_id → 라벨 (쓰기 전용)
+        self._publish(
+            np.empty((0, self.dim), dtype=np.float32), np.empty(0, dtype=np.int64)
+        )
+
+    def add(self, face_id: str, embeddings: np.ndarray) -> None:
+        """
+        얼굴 샘플 추가
+
+        Args:
+            face_id (str): 얼굴 ID
+            embeddings (np.ndarray): (D,) 또는 (N, D) 임베딩
+        """
+        self._update(face_id, self.normalize(embeddings), replace=False)
+
+    def add_many(self, face_ids: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        여러 얼굴의 샘플을 한 번에 추가
+
+        전수 탐색 인덱스는 스냅샷 한 번으로 게시하고 (샘플마다 행렬을 복사하지 않음),
+        자체 갱신 방식이 있는 하위 클래스는 얼굴별로 add를 호출합니다.
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            embeddings (np.ndarray): (N, D) 임베딩
+        """
+        if len(face_ids) == 0:
+            return
+
+        rows = self.normalize(embeddings)
+        if type(self)._update is not EmbeddingIndex._update:
+            positions: Dict[str, List[int]] = {}
+            for i, face_id in enumerate(face_ids):
+                positions.setdefault(face_id, []).append(i)
+            for face_id, indices in positions.items():
+                self._update(face_id, rows[indices], replace=False)
+            return
+
+        snapshot = self._snapshot
+        labels = np.fromiter(
+            (self._get_or_create_label(face_id) for face_id in face_ids),
+            dtype=np.int64, count=len(face_ids)
+        )
+        self._publish(np.vstack([snapshot.matrix, rows]), np.concatenate([snapshot.labels, labels]))
+
+    def replace(self, face_id: str, embeddings: np.ndarray) -> None:
+        """
+        얼굴의 기존 샘플을 새 샘플로 교체 (스냅샷 한 번으로 교체되어 중간 상태가 보이지 않음)
+
+        Args:
+            face_id (str): 얼굴 ID
+            embeddings (np.ndarray): (D,) 또는 (N, D) 임베딩
+        """
+        self._update(face_id, self.normalize(embeddings), replace=True)
+
+    def _update(self, face_id: str, rows: np.ndarray, replace: bool) -> None:
+        """샘플 추가/교체 후 새 스냅샷 게시"""
+        snapshot = self._snapshot
+        matrix, labels = snapshot.matrix, snapshot.labels
+
+        label = self._label_of.get(face_id)
+        if replace and label is not None:
+            keep = labels != label
+            matrix, labels = matrix[keep], labels[keep]
+        label = self._get_or_create_label(face_id)
+
+        self._publish(
+            np.vstack([matrix, rows]),
+            np.concatenate([labels, np.full(len(rows), label, dtype=np.int64)])
+        )
+
+    def remove(self, face_id: str) -> int:
+        """
+        얼굴의 모든 샘플 삭제
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        label = self._label_of.pop(face_id, None)
+        if label is None:
+            return 0
+
+        # 라벨 → face_id 항목은 남겨 둠 (이전 스냅샷을 읽는 검색이 계속 참조 가능)
+        snapshot = self._snapshot
+        keep = snapshot.labels != label
+        removed = int(len(keep) - np.count_nonzero(keep))
+        self._publish(snapshot.matrix[keep], snapshot.labels[keep])
+        return removed
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[Tuple[str, float]]:
+        """
+        쿼리와 가장 유사한 얼굴 검색 (얼굴별 최고 유사도 기준)
+
+        Args:
+            embedding (np.ndarray): 쿼리 임베딩
+            top_k (int): 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): min_score 이상인 첫 매칭에서 탐색 중단 (top_k 무시, 최대 1개)
+
+        Returns:
+            List[Tuple[str, float]]: (face_id, similarity) 리스트 (내림차순)
+        """
+        return self.search_batch(
+            embedding, top_k=top_k, min_score=min_score, early_exit=early_exit
+        )[0]
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리를 행렬곱 1회로 한꺼번에 검색
+
+        Args:
+            embeddings (np.ndarray): (N, D) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): 쿼리별로 min_score 이상인 첫 매칭에서 탐색 중단
+
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트
+        """
+        queries = self.normalize(embeddings)
+        snapshot = self._snapshot
+
+        if len(snapshot.labels) == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        if early_exit:
+            return [
+                self._first_above(self._row_blocks(snapshot, query), snapshot.face_ids, min_score)
+                for query in queries
+            ]
+
+        # (N, D) x (D, R) → (N, R)
+        scores = pairwise_dot(queries, snapshot.matrix)
+
+        return [
+            self._pool_top_k(row_scores, snapshot.labels, snapshot.face_ids, top_k, min_score)
+            for row_scores in scores
+        ]
+
+    def _row_blocks(
+        self,
+        snapshot: IndexSnapshot,
+        query: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """조기 종료 탐색용: 행 블록 단위 (점수, 라벨) 생성 (블록 크기만큼만 할당)"""
+        for start in range(0, len(snapshot.labels), self.EARLY_EXIT_BLOCK):
+            end = start + self.EARLY_EXIT_BLOCK
+            yield pairwise_dot(query, snapshot.matrix[start:end]), snapshot.labels[start:end]
+
+    @staticmethod
+    def _first_above(
+        blocks: Iterable[Tuple[np.ndarray, np.ndarray]],
+        face_ids: List[str],
+        min_score: Optional[float]
+    ) -> List[Tuple[str, float]]:
+        """
+        블록을 순서대로 확인하여 min_score 이상인 매칭이 처음 나온 블록의 최고 매칭 반환
+
+        게이트 출입처럼 "충분히 확실한 매칭 하나"면 되는 경우 나머지 갤러리를 계산하지 않습니다.
+        반환 결과가 전체 갤러리의 최고 매칭이라는 보장은 없습니다.
+        """
+        if min_score is None:
+            raise ValueError("조기 종료 검색에는 min_score가 필요합니다.")
+
+        for scores, labels in blocks:
+            if len(scores) == 0:
+                continue
+            row = int(np.argmax(scores))
+            if scores[row] >= min_score:
+                return [(face_ids[labels[row]], float(scores[row]))]
+        return []
+
+    @staticmethod
+    def _pool_top_k(
+        scores: np.ndarray,
+        labels: np.ndarray,
+        face_ids: List[str],
+        top_k: int,
+        min_score: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        행 단위 점수를 얼굴별 최고 점수로 모은 뒤 상위 top_k 추출
+
+        전체 정렬 대신 얼굴별 max-pooling(O(R)) 후 argpartition(O(F))으로 상위 k개만 고르고
+        그 k개만 정렬합니다. top_k == 1이면 행 argmax 한 번으로 끝냅니다.
+        """
+        if len(scores) == 0:
+            return []
+
+        if top_k == 1:
+            row = int(np.argmax(scores))
+            score = float(scores[row])
+            if score <= 0 or (min_score is not None and score < min_score):
+                return []
+            return [(face_ids[labels[row]], score)]
+
+        # 얼굴(라벨)별 최고 점수 (샘플이 없는 라벨은 -inf)
+        pooled = np.full(len(face_ids), -np.inf, dtype=np.float32)
+        np.maximum.at(pooled, labels, scores)
+
+        if min_score is None:
+            candidates = np.flatnonzero(pooled > 0)
+        else:
+            candidates = np.flatnonzero(pooled >= min_score)
+        if len(candidates) > top_k:
+            top = np.argpartition(-pooled[candidates], top_k - 1)[:top_k]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-pooled[candidates], kind='stable')]
+
+        return [(face_ids[label], float(pooled[label])) for label in candidates]
+
+    def _new_labels(self, face_ids: Sequence[str]) -> np.ndarray:
+        """라벨 테이블을 새로 만들고 행별 라벨 배열 반환"""
+        self._face_ids = []
+        self._label_of = {}
+        return np.fromiter(
+            (self._get_or_create_label(face_id) for face_id in face_ids),
+            dtype=np.int64, count=len(face_ids)
+        )
+
+    def _get_or_create_label(self, face_id: str) -> int:
+        """face_id에 대응하는 라벨 반환 (없으면 생성)"""
+        label = self._label_of.get(face_id)
+        if label is None:
+            label = len(self._face_ids)
+            self._face_ids.append(face_id)
+            self._label_of[face_id] = label
+        return label
+
+    @property
+    def face_ids(self) -> List[str]:
+        """인덱스에 포함된 face_id 목록"""
+        return list(self._label_of)
+
+    @property
+    def num_faces(self) -> int:
+        """인덱스에 포함된 얼굴 수"""
+        return len(self._label_of)
+
+    def __contains__(self, face_id: str) -> bool:
+        """얼굴 포함 여부"""
+        return face_id in self._label_of
+
+    def __len__(self) -> int:
+        """인덱스 행(샘플) 수"""
+        return len(self._snapshot.labels)
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return f"EmbeddingIndex(faces={self.num_faces}, samples={len(self)}, dim={self.dim})"
@@ -0,0 +1,340 @@
+"""
+임베딩 저장소 모듈
+
+모든 샘플 임베딩을 append-only 단일 파일에 저장하고 memory-map으로 읽기
+"""
+
+import os
+import struct
+import numpy as np
+from typing import Optional, Sequence
+
+from utils.file_lock import locked
+
+
+def _pread(file, size: int, offset: int) -> bytes:
+    """버퍼를 거치지 않고 파일의 현재 내용 읽기 (다른 프로세스의 기록 반영)"""
+    if hasattr(os, 'pread'):
+        return os.pread(file.fileno(), size, offset)
+    file.flush()
+    os.lseek(file.fileno(), offset, os.SEEK_SET)
+    return os.read(file.fileno(), size)
+
+
+class EmbeddingStore:
+    """
+    append-only memory-mapped 임베딩 저장소
+
+    데이터 파일(.bin)은 고정 크기 헤더 뒤에 임베딩 행을 연속으로 저장하고,
+    샘플 테이블(.tbl)은 행 번호 → (face_id, sample_idx, flags)를 고정 폭 레코드로 저장합니다.
+    읽기는 np.memmap으로 수행하므로 같은 호스트의 모든 프로세스가 페이지 캐시를 복사 없이 공유합니다.
+    쓰기는 데이터 파일의 프로세스 간 잠금 안에서 최신 헤더를 다시 읽은 뒤 수행하므로
+    여러 프로세스가 같은 저장소에 추가해도 행이 겹치지 않으며, 헤더의 세대 번호로 변경을 감지합니다.
+
+    데이터 파일 헤더 (64바이트):
+        magic(8) | version(u32) | dim(u32) | dtype 코드(u32) | 예약(u32) | count(u64) | generation(u64)
+
+    Attributes:
+        path (str): 데이터 파일 경로
+        table_path (str): 샘플 테이블 파일 경로
+        dim (int): 임베딩 차원
+        dtype (np.dtype): 저장 자료형
+    """
+
+    MAGIC = b'FREMBED\x00'
+    TABLE_MAGIC = b'FRTABLE\x00'
+    VERSION = 1
+    HEADER_SIZE = 64
+    HEADER_FORMAT = '<8sIIIIQQ'
+
+    DTYPE_CODES = {'float32': 0, 'float16': 1}
+
+    TABLE_DTYPE = np.dtype([
+        ('face_id', 'S64'),
+        ('sample_idx', '<i4'),
+        ('flags', 'u1'),
+        ('reserved', 'V3'),
+    ])
+    FLAG_DELETED = 1
+
+    def __init__(
+        self,
+        path: str,
+        dim: int = 512,
+        dtype: str = 'float32'
+    ):
+        """
+        임베딩 저장소 열기 (파일이 없으면 생성)
+
+        Args:
+            path (str): 데이터 파일 경로 (.bin), 테이블은 같은 이름의 .tbl
+            dim (int): 임베딩 차원
+            dtype (str): 저장 자료형 ('float32' 또는 행당 용량이 절반인 'float16')
+        """
+        if dtype not in self.DTYPE_CODES:
+            raise ValueError(f"지원하지 않는 저장 자료형: {dtype}")
+
+        self.path = path
+        self.table_path = os.path.splitext(path)[0] + '.tbl'
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+
+        self._count = 0
+        self._generation = 0
+        self._vectors: Optional[np.memmap] = None
+        self._table: Optional[np.memmap] = None
+
+        self._open()
+
+    @property
+    def row_size(self) -> int:
+        """한 행의 바이트 수"""
+        return self.dim * self.dtype.itemsize
+
+    @property
+    def generation(self) -> int:
+        """변경 세대 번호 (추가/삭제 시마다 증가)"""
+        return self._generation
+
+    def _open(self) -> None:
+        """파일 열기 및 헤더 검증"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        if not os.path.exists(self.path):
+            with open(self.path, 'wb') as f:
+                f.write(self._pack_header(0, 0))
+        if not os.path.exists(self.table_path):
+            with open(self.table_path, 'wb') as f:
+                f.write(self._pack_table_header(0))
+
+        self._data_file = open(self.path, 'r+b')
+        self._table_file = open(self.table_path, 'r+b')
+
+        magic, version, dim, dtype_code, _, count, generation = self._read_header()
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"임베딩 저장소 형식이 올바르지 않습니다: {self.path}")
+        if dim != self.dim or dtype_code != self.DTYPE_CODES[self.dtype.name]:
+            raise ValueError(
+                f"임베딩 저장소 설정 불일치: dim={dim}, dtype 코드={dtype_code} "
+                f"(요청: dim={self.dim}, dtype={self.dtype.name})"
+            )
+
+        table_magic, table_count = self._read_table_header()
+        if table_magic != self.TABLE_MAGIC:
+            raise ValueError(f"샘플 테이블 형식이 올바르지 않습니다: {self.table_path}")
+
+        # 데이터 헤더의 count가 커밋 지점 (테이블보다 앞설 수 없음)
+        self._count = min(count, table_count)
+        self._generation = generation
+
+    def _read_header(self) -> tuple:
+        """데이터 파일 헤더 읽기 (파일 위치와 무관한 pread)"""
+        return struct.unpack(
+            self.HEADER_FORMAT,
+            _pread(self._data_file, struct.calcsize(self.HEADER_FORMAT), 0)
+        )
+
+    def _read_table_header(self) -> tuple:
+        """샘플 테이블 헤더 읽기"""
+        return struct.unpack('<8sQ', _pread(self._table_file, 16, 0))
+
+    def refresh(self) -> bool:
+        """
+        다른 프로세스의 변경 반영 (헤더만 다시 읽음)
+
+        Returns:
+            bool: 세대 번호가 바뀌었는지 여부
+        """
+        _, _, _, _, _, count, generation = self._read_header()
+        if generation == self._generation:
+            return False
+
+        _, table_count = self._read_table_header()
+        self._count = min(count, table_count)
+        self._generation = generation
+        return True
+
+    def touch(self) -> None:
+        """데이터 변경 없이 세대 번호만 증가 (메타데이터 변경을 다른 프로세스에 알림)"""
+        with locked(self._data_file):
+            self.refresh()
+            self._write_header()
+
+    def _pack_header(self, count: int, generation: int) -> bytes:
+        """데이터 파일 헤더 직렬화"""
+        header = struct.pack(
+            self.HEADER_FORMAT,
+            self.MAGIC, self.VERSION, self.dim,
+            self.DTYPE_CODES[self.dtype.name], 0, count, generation
+        )
+        return header.ljust(self.HEADER_SIZE, b'\x00')
+
+    def _pack_table_header(self, count: int) -> bytes:
+        """샘플 테이블 헤더 직렬화"""
+        return struct.pack('<8sQ', self.TABLE_MAGIC, count).ljust(self.HEADER_SIZE, b'\x00')
+
+    def append(
+        self,
+        face_id: str,
+        sample_idx: int,
+        embedding: np.ndarray
+    ) -> int:
+        """
+        임베딩 1개 추가 (O(1) append)
+
+        Args:
+            face_id (str): 얼굴 ID
+            sample_idx (int): 얼굴 내 샘플 번호
+            embedding (np.ndarray): 임베딩 벡터
+
+        Returns:
+            int: 저장된 행 번호
+        """
+        return int(self.append_many([face_id], [sample_idx], np.asarray(embedding).reshape(1, -1))[0])
+
+    def append_many(
+        self,
+        face_ids: Sequence[str],
+        sample_idxs: Sequence[int],
+        embeddings: np.ndarray
+    ) -> np.ndarray:
+        """
+        여러 임베딩을 한 번에 추가
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            sample_idxs (Sequence[int]): 행별 샘플 번호
+            embeddings (np.ndarray): (N, D) 임베딩
+
+        Returns:
+            np.ndarray: 저장된 행 번호 배열
+        """
+        vectors = np.ascontiguousarray(embeddings, dtype=self.dtype).reshape(-1, self.dim)
+        if len(vectors) != len(face_ids) or len(vectors) != len(sample_idxs):
+            raise ValueError("face_ids, sample_idxs, embeddings의 개수가 일치하지 않습니다.")
+
+        records = np.zeros(len(vectors), dtype=self.TABLE_DTYPE)
+        for i, face_id in enumerate(face_ids):
+            encoded = face_id.encode('utf-8')
+            if len(encoded) > self.TABLE_DTYPE['face_id'].itemsize:
+                raise ValueError(f"face_id가 너무 깁니다 (최대 64바이트): {face_id}")
+            records[i]['face_id'] = encoded
+        records['sample_idx'] = sample_idxs
+
+        with locked(self._data_file):
+            # 다른 프로세스가 추가한 행 뒤에 기록
+            self.refresh()
+            start = self._count
+            new_count = start + len(vectors)
+
+            # 데이터 → 테이블 → 헤더 순서로 기록 (헤더 count 갱신이 커밋 지점)
+            self._data_file.seek(self.HEADER_SIZE + start * self.row_size)
+            self._data_file.write(vectors.tobytes())
+            self._table_file.seek(self.HEADER_SIZE + start * self.TABLE_DTYPE.itemsize)
+            self._table_file.write(records.tobytes())
+            self._table_file.seek(0)
+            self._table_file.write(self._pack_table_header(new_count))
+            self._table_file.flush()
+
+            self._count = new_count
+            self._write_header()
+
+        return np.arange(start, new_count, dtype=np.int64)
+
+    def delete(self, rows: Sequence[int]) -> None:
+        """
+        행 삭제 (append-only 유지를 위해 테이블에 삭제 플래그만 기록)
+
+        Args:
+            rows (Sequence[int]): 삭제할 행 번호
+        """
+        flags_offset = self.TABLE_DTYPE.fields['flags'][1]
+        with locked(self._data_file):
+            self.refresh()
+            for row in rows:
+                if not 0 <= row < self._count:
+                    continue
+                self._table_file.seek(
+                    self.HEADER_SIZE + int(row) * self.TABLE_DTYPE.itemsize + flags_offset
+                )
+                self._table_file.write(bytes([self.FLAG_DELETED]))
+            self._table_file.flush()
+            self._write_header()
+
+    def _write_header(self) -> None:
+        """세대 번호를 올리고 데이터 파일 헤더 갱신"""
+        self._generation += 1
+        self._data_file.flush()
+        self._data_file.seek(0)
+        self._data_file.write(self._pack_header(self._count, self._generation))
+        self._data_file.flush()
+
+    def vectors(self) -> np.ndarray:
+        """
+        전체 임베딩 행렬 (읽기 전용 memory-map, 복사 없음)
+
+        Returns:
+            np.ndarray: (count, dim) 배열 (삭제된 행 포함)
+        """
+        if self._count == 0:
+            return np.empty((0, self.dim), dtype=self.dtype)
+
+        if self._vectors is None or len(self._vectors) != self._count:
+            self._vectors = np.memmap(
+                self.path, dtype=self.dtype, mode='r',
+                offset=self.HEADER_SIZE, shape=(self._count, self.dim)
+            )
+        return self._vectors
+
+    def table(self) -> np.ndarray:
+        """
+        샘플 테이블 (읽기 전용 memory-map)
+
+        Returns:
+            np.ndarray: TABLE_DTYPE 레코드 배열 (count개)
+        """
+        if self._count == 0:
+            return np.zeros(0, dtype=self.TABLE_DTYPE)
+
+        if self._table is None or len(self._table) != self._count:
+            self._table = np.memmap(
+                self.table_path, dtype=self.TABLE_DTYPE, mode='r',
+                offset=self.HEADER_SIZE, shape=(self._count,)
+            )
+        return self._table
+
+    def get(self, row: int) -> np.ndarray:
+        """
+        행 하나의 임베딩 복사본 반환
+
+        Args:
+            row (int): 행 번호
+
+        Returns:
+            np.ndarray: 임베딩 벡터
+        """
+        return np.array(self.vectors()[row])
+
+    def live_rows(self) -> np.ndarray:
+        """삭제되지 않은 행 번호 배열"""
+        return np.flatnonzero((self.table()['flags'] & self.FLAG_DELETED) == 0)
+
+    def face_id_of(self, row: int) -> str:
+        """행의 face_id 반환"""
+        return self.table()[row]['face_id'].decode('utf-8')
+
+    def close(self) -> None:
+        """파일 닫기"""
+        self._vectors = None
+        self._table = None
+        for f in (getattr(self, '_data_file', None), getattr(self, '_table_file', None)):
+            if f is not None and not f.closed:
+                f.close()
+
+    def __len__(self) -> int:
+        """저장된 행 수 (삭제된 행 포함)"""
+        return self._count
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return f"EmbeddingStore(rows={self._count}, dim={self.dim}, dtype={self.dtype.name})"
@@ -0,0 +1,179 @@
+"""
+InsightFace 모듈 지연 로딩 모듈
+
+FaceAnalysis는 모델 팩의 모든 ONNX 파일로 세션을 만든 뒤 allowed_modules에 없는 것을 버리므로
+시작 시간이 줄지 않습니다. 파일별 태스크 이름을 모델 폴더에 캐시해 두고 필요한 모듈의 파일만 로드하며,
+나중에 다른 모듈이 필요해지면 그때 추가로 로드합니다.
+세션은 InferenceEngine으로 생성하므로 태스크별 SessionOptions와 최적화 그래프 캐시가 적용되며,
+quantization을 지정하면 모델 폴더의 INT8 버전(quantize_models.py로 생성)이 있는 파일은 그것으로 세션을 만듭니다.
+"""
+
+import os
+import glob
+import json
+import threading
+import onnxruntime
+from typing import Dict, Iterable, List, Optional
+
+from insightface.app import FaceAnalysis
+from insightface.app.common import Face
+from insightface.utils import ensure_available
+
+from models.inference_engine import InferenceEngine, quantized_model_path
+
+
+class LazyFaceAnalysis(FaceAnalysis):
+    """
+    필요한 모듈만 로드하는 FaceAnalysis
+
+    Attributes:
+        model_dir (str): 모델 팩 폴더
+        models (Dict[str, object]): 태스크 이름 → 로드된 모델
+    """
+
+    TASK_CACHE = '.tasks.json'  # ONNX 파일 이름 → 태스크 이름 캐시
+
+    def __init__(
+        self,
+        name: str = 'buffalo_l',
+        root: str = '~/.insightface',
+        allowed_modules: Optional[Iterable[str]] = None,
+        providers: Optional[List[str]] = None,
+        engine: Optional[InferenceEngine] = None,
+        quantization: Optional[str] = None
+    ):
+        """
+        Args:
+            name (str): 모델 팩 이름
+            root (str): 모델 저장 경로
+            allowed_modules (Optional[Iterable[str]]): 처음에 로드할 태스크 (None이면 전체)
+            providers (Optional[List[str]]): ONNX Runtime 실행 제공자 (None이면 사용 가능한 전체)
+            engine (Optional[InferenceEngine]): 세션 설정 (None이면 기본 설정)
+            quantization (Optional[str]): INT8 모델 사용 ('dynamic', 'static', None이면 FP32)
+        """
+        onnxruntime.set_default_logger_severity(3)
+        self.models: Dict[str, object] = {}
+        self.model_dir = ensure_available('models', name, root=root)
+        self.providers = providers or onnxruntime.get_available_providers()
+        self.engine = engine or InferenceEngine()
+        self.quantization = quantization
+        self.quantized: Dict[str, str] = {}  # 태스크 이름 → 로드한 INT8 모델 파일
+        self.ctx_id: Optional[int] = None
+        self._files = sorted(glob.glob(os.path.join(self.model_dir, '*.onnx')))
+        self._tasks = self._read_task_cache()
+        self._load_lock = threading.Lock()
+
+        self.load_modules(allowed_modules)
+        assert 'detection' in self.models
+        self.det_model = self.models['detection']
+
+    def _read_task_cache(self) -> Dict[str, Optional[str]]:
+        """파일별 태스크 이름 캐시 읽기 (없거나 손상되면 빈 캐시)"""
+        try:
+            with open(os.path.join(self.model_dir, self.TASK_CACHE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_task_cache(self) -> None:
+        """파일별 태스크 이름 캐시 저장 (모델 폴더에 쓸 수 없으면 무시)"""
+        try:
+            with open(os.path.join(self.model_dir, self.TASK_CACHE), 'w', encoding='utf-8') as f:
+                json.dump(self._tasks, f, indent=2)
+        except OSError:
+            pass
+
+    def load_modules(self, tasknames: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        아직 로드하지 않은 모듈 로드 (prepare 이후에 호출되면 바로 prepare)
+
+        Args:
+            tasknames (Optional[Iterable[str]]): 필요한 태스크 이름 (None이면 모델 팩 전체)
+
+        Returns:
+            List[str]: 새로 로드한 태스크 이름
+        """
+        wanted = None if tasknames is None else set(tasknames)
+        if wanted is not None and wanted <= set(self.models):
+            return []
+
+        with self._load_lock:
+            loaded = []
+            for onnx_file in self._files:
+                filename = os.path.basename(onnx_file)
+                known = self._tasks.get(filename, '')
+                if known is None or known in self.models or (known and wanted is not None and known not in wanted):
+                    continue  # 인식할 수 없는 파일, 이미 로드됨, 필요 없는 태스크
+
+                session_file = None
+                if self.quantization:
+                    quantized_file = quantized_model_path(onnx_file, self.quantization)
+                    session_file = quantized_file if os.path.exists(quantized_file) else None
+
+                model = self.engine.load_model(
+                    onnx_file, self.providers, taskname=known or None, session_file=session_file
+                )
+                taskname = getattr(model, 'taskname', None)
+                self._tasks[filename] = taskname
+                if taskname is None or taskname in self.models or (wanted is not None and taskname not in wanted):
+                    del model
+                    continue
+
+                if self.ctx_id is not None:
+                    self._prepare_model(taskname, model)
+                self.models[taskname] = model
+                loaded.append(taskname)
+                if session_file:
+                    self.quantized[taskname] = os.path.basename(session_file)
+                print(f"모듈 로드: {os.path.basename(session_file or onnx_file)} ({taskname})")
+
+            self._write_task_cache()
+            return loaded
+
+    def prepare(self, ctx_id: int, det_thresh: float = 0.5, det_size=(640, 640)) -> None:
+        """로드된 모델 준비 (이후 지연 로드되는 모델도 같은 설정으로 준비)"""
+        self.ctx_id = ctx_id
+        self.det_thresh = det_thresh
+        self.det_size = det_size
+        for taskname, model in self.models.items():
+            self._prepare_model(taskname, model)
+
+    def _prepare_model(self, taskname: str, model) -> None:
+        """
+        모델 1개 준비
+
+        실행 제공자는 세션 생성 시 정해지므로 ctx_id를 0 이상으로 넘김
+        (ctx_id < 0이면 InsightFace가 set_providers로 세션을 다시 만들어 로드 시간이 두 배가 됨)
+        """
+        ctx_id = max(self.ctx_id, 0)
+        if taskname == 'detection':
+            model.prepare(ctx_id, input_size=self.det_size, det_thresh=self.det_thresh)
+        else:
+            model.prepare(ctx_id)
+
+    def get(self, img, max_num: int = 0, modules: Optional[Iterable[str]] = None) -> List[Face]:
+        """
+        얼굴 감지 후 지정한 모듈만 실행
+
+        Args:
+            img: 입력 이미지
+            max_num (int): 최대 얼굴 수 (0이면 전체)
+            modules (Optional[Iterable[str]]): 실행할 태스크 (None이면 로드된 전체, 감지는 항상 실행)
+
+        Returns:
+            List[Face]: 얼굴 목록
+        """
+        if modules is not None:
+            modules = set(modules)
+            self.load_modules(modules | {'detection'})
+
+        bboxes, kpss = self.det_model.detect(img, max_num=max_num, metric='default')
+        faces = []
+        for i in range(bboxes.shape[0]):
+            face = Face(bbox=bboxes[i, 0:4], kps=kpss[i] if kpss is not None else None, det_score=bboxes[i, 4])
+            for taskname, model in self.models.items():
+                if taskname == 'detection' or (modules is not None and taskname not in modules):
+                    continue
+                model.get(img, face)
+            faces.append(face)
+        return faces
@@ -5,31 +5,85 @@
 """
 
 import os
+import copy
 import json
+import time
+import itertools
+import functools
+from collections import Counter
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
-from typing import Optional, List, Tuple, Dict
+from contextlib import contextmanager
+from typing import Callable, Optional, List, Tuple, Dict
 from datetime import datetime
-from sklearn.metrics.pairwise import cosine_similarity
+from models.embedding_index import EmbeddingIndex
+from models.ivf_index import IVFIndex
+from models.shared_index import SharedIndex
+from models.template_index import TemplateIndex
+from models.quantized_index import QuantizedIndex
+from models.pq_index import PQIndex
+from models.compiled_gallery import CompiledGallery
+from models.embedding_store import EmbeddingStore
+from models.face_journal import FaceJournal
+from models.face_metadata_db import FaceMetadataDB
+from models.recognition_stats import RecognitionStats
+from models.model_zoo import embeddings_compatible
+
+
+def _synchronized(method):
+    """쓰기 메서드를 데이터베이스 쓰기 잠금 안에서 실행 (검색은 잠그지 않음)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class FaceDatabase:
     """
     얼굴 데이터베이스 관리 클래스
 
+    쓰기(등록/샘플 추가/삭제/저장)는 하나의 재진입 잠금으로 직렬화하고,
+    검색은 인덱스의 불변 스냅샷을 읽으므로 잠금 없이 등록과 동시에 수행됩니다.
+    얼굴 레코드도 제자리에서 고치지 않고 사본을 만들어 교체합니다.
+
     Attributes:
         db_path (str): 데이터베이스 JSON 파일 경로
         data_dir (str): 데이터 디렉토리 경로
         embeddings_dir (str): 임베딩 파일 디렉토리
+        store (EmbeddingStore): 전체 샘플 임베딩 저장소 (memory-mapped 단일 파일)
         faces_dir (str): 얼굴 이미지 디렉토리
         faces (Dict): 얼굴 데이터 딕셔너리
         threshold (float): 매칭 임계값
+        index (EmbeddingIndex): 전체 샘플 임베딩 검색 인덱스
+        index_path (str): IVF 인덱스 저장 경로 (데이터베이스 파일 옆)
+        compiled_path (str): 컴파일된 갤러리 스냅샷 경로 (정규화 행렬 + ID 테이블, 재시작 시 한 번에 로드)
+        storage (str): 메타데이터 저장 백엔드 ('json' 또는 'sqlite')
+        journal (Optional[FaceJournal]): 마지막 스냅샷 이후의 변경 연산 저널 ('json' 전용)
+        metadata_db (Optional[FaceMetadataDB]): SQLite 메타데이터 저장소 ('sqlite' 전용)
+        stats (RecognitionStats): 인식 횟수/마지막 인식 시각 write-behind 누적기
+        load_report (Dict): 마지막 로드의 단계별 시간(초)과 누락/손상 파일, 잘못된 저장소 행 목록
     """
 
+    LOAD_REPORT_EXAMPLES = 5  # 로드 요약에 항목별로 출력할 예시 수
+
     def __init__(
         self,
         db_path: str = "data/face_database.json",
-        threshold: float = 0.5
+        threshold: float = 0.5,
+        index_type: str = 'auto',
+        nprobe: int = 8,
+        ann_min_size: int = 10000,
+        compact_every: int = 1000,
+        storage: str = 'json',
+        sample_budget: int = 8,
+        precision: str = 'int8',
+        store_dtype: str = 'float32',
+        pq_subspaces: int = 64,
+        load_workers: int = 8,
+        model_name: Optional[str] = None
     ):
         """
         얼굴 데이터베이스 초기화
@@ -37,16 +91,69 @@ class FaceDatabase:
         Args:
             db_path (str): 데이터베이스 파일 경로 (상대 경로)
             threshold (float): 얼굴 매칭 임계값 (0.0-1.0)
+            index_type (str): 검색 인덱스 종류
+                ('flat': 전수 탐색, 'ivf': IVF 근사 검색,
+                 'auto': ann_min_size 미만은 전수 탐색, 이상이면 IVF,
+                 'shared': 임베딩 저장소 memory-map을 직접 검색하는 다중 워커 공유 모드,
+                 storage='sqlite' 필요,
+                 'template': 얼굴별 템플릿으로 후보를 고른 뒤 대표 샘플로 재점수하는 2단계 검색,
+                 'quantized': float16/int8 압축 행렬로 후보를 고른 뒤 저장소 원본으로 재계산,
+                 'pq': 곱 양자화 코드(샘플당 약 pq_subspaces바이트)로 검색, import_gallery 지원)
+            nprobe (int): IVF 쿼리당 탐색 클러스터 수 (클수록 정확, 느림)
+            ann_min_size (int): 'auto'에서 IVF로 전환할 샘플 수
+            compact_every (int): 저널 연산이 이 수에 도달하면 스냅샷으로 압축
+            storage (str): 메타데이터 저장 백엔드
+                ('json': 스냅샷 + 저널, 'sqlite': 이름/그룹 인덱스가 있는 SQLite,
+                 'sqlite' 최초 사용 시 기존 JSON 데이터를 이전)
+            sample_budget (int): 'template'에서 얼굴당 검색에 쓰는 최대 대표 샘플 수
+                (저장소에는 모든 샘플이 그대로 남음)
+            precision (str): 'quantized'의 메모리 행렬 정밀도 ('float16' 또는 'int8')
+            store_dtype (str): 임베딩 저장소 파일 자료형 ('float32' 또는 'float16',
+                기존 저장소와 다르면 열 수 없음)
+            pq_subspaces (int): 'pq'의 부분 공간 수 (샘플당 코드 바이트 수)
+            load_workers (int): 로드 시 임베딩/이미지 파일을 읽고 검사하는 스레드 수
+            model_name (Optional[str]): 이 데이터베이스에 임베딩을 넣을 인식기 모델 팩 (bind_model 참고,
+                None이면 확인하지 않음)
         """
+        if index_type not in ('flat', 'ivf', 'auto', 'shared', 'template', 'quantized', 'pq'):
+            raise ValueError(f"지원하지 않는 인덱스 종류: {index_type}")
+        if storage not in ('json', 'sqlite'):
+            raise ValueError(f"지원하지 않는 저장 백엔드: {storage}")
+        if index_type == 'shared' and storage != 'sqlite':
+            # JSON 저널은 단일 프로세스 전용 (여러 워커가 압축/재적용하면 충돌)
+            raise ValueError("공유 모드(index_type='shared')는 storage='sqlite'가 필요합니다.")
+
         # 경로 설정 (backend 디렉토리 기준)
         backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = os.path.join(backend_dir, db_path)
         self.data_dir = os.path.dirname(self.db_path)
         self.embeddings_dir = os.path.join(self.data_dir, 'embeddings')
         self.faces_dir = os.path.join(self.data_dir, 'faces')
-
+        self.index_path = os.path.splitext(self.db_path)[0] + '.ivf.npz'
+        self.pq_path = os.path.splitext(self.db_path)[0] + '.pq.npz'
+        self.compiled_path = os.path.splitext(self.db_path)[0] + '.compiled.bin'
+        self.journal_path = os.path.splitext(self.db_path)[0] + '.journal.jsonl'
+        self.metadata_db_path = os.path.splitext(self.db_path)[0] + '.sqlite3'
+        self.compact_every = compact_every
+        self.storage = storage
+
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.ann_min_size = ann_min_size
+        self.sample_budget = sample_budget
+        self.precision = precision
+        self.pq_subspaces = pq_subspaces
+        self.load_workers = load_workers
+        self.load_report: Dict = self._empty_load_report()
         self.threshold = threshold
         self.faces = {}
+        self._names: Dict[str, Tuple[str, ...]] = {}  # 이름 → face_id (교체식 갱신)
+        self._lock = threading.RLock()  # 쓰기 잠금
+        self._batch_ops: Optional[Dict[str, Dict]] = None  # batch() 중 지연된 연산
+        self._batch_depth = 0
+        self._synced_generation = -1  # 공유 모드에서 마지막으로 반영한 저장소 세대
+        self._metadata_seq = 0  # 공유 모드에서 마지막으로 반영한 메타데이터 변경 순번
+        self._compiled_dirty = False  # 컴파일된 스냅샷 이후 갤러리 변경 여부
         self.config = {
             'threshold': threshold,
             'model_name': 'default',
@@ -56,8 +163,57 @@ class FaceDatabase:
         # 디렉토리 생성
         self._create_directories()
 
+        # 임베딩 저장소 열기
+        self.store = EmbeddingStore(
+            os.path.join(self.embeddings_dir, 'embeddings.bin'),
+            dim=self.config['embedding_size'],
+            dtype=store_dtype
+        )
+        self.index = self._create_index()
+        if self.storage == 'sqlite':
+            self.journal = None
+            self.metadata_db = FaceMetadataDB(self.metadata_db_path)
+        else:
+            self.journal = FaceJournal(self.journal_path)
+            self.metadata_db = None
+        self.stats = RecognitionStats(os.path.splitext(self.db_path)[0] + '.stats.json')
+
         # 데이터베이스 로드
         self.load()
+        if model_name is not None:
+            self.bind_model(model_name)
+
+    @_synchronized
+    def bind_model(self, model_name: str) -> None:
+        """
+        임베딩 모델 확인 및 기록 (config['model_name'])
+
+        비어 있거나 모델이 기록되지 않은('default') 데이터베이스는 model_name으로 기록하고,
+        이미 기록된 모델과 인식 모델이 다르면 임베딩을 비교할 수 없으므로 거부합니다.
+        감지 모델만 다른 모델 팩(예: buffalo_m과 buffalo_l)은 같은 갤러리를 사용할 수 있습니다.
+
+        Args:
+            model_name (str): 인식기 모델 팩 이름
+
+        Raises:
+            ValueError: 등록된 임베딩과 다른 인식 모델
+        """
+        self.refresh()
+        current = self.config.get('model_name', 'default')
+        if current == model_name:
+            return
+        if self.faces:
+            if not embeddings_compatible(current, model_name):
+                raise ValueError(
+                    f"데이터베이스 임베딩 모델({current})과 인식 모델({model_name})이 다릅니다. "
+                    f"같은 모델을 사용하거나 다른 데이터베이스 경로에 다시 등록하세요: {self.db_path}"
+                )
+            if current != 'default':
+                return
+
+        self.config = {**self.config, 'model_name': model_name}
+        self.save()
+        print(f"데이터베이스 임베딩 모델 기록: {model_name}")
 
     def _create_directories(self) -> None:
         """필요한 디렉토리 생성"""
@@ -65,6 +221,7 @@ class FaceDatabase:
         os.makedirs(self.embeddings_dir, exist_ok=True)
         os.makedirs(self.faces_dir, exist_ok=True)
 
+    @_synchronized
     def register_face(
         self,
         face_id: str,
@@ -84,10 +241,12 @@ class FaceDatabase:
         Returns:
             bool: 등록 성공 여부
         """
+        self.refresh()
+
+        row = None
         try:
             # 임베딩 저장
-            embedding_path = os.path.join(self.embeddings_dir, f"{face_id}.npy")
-            np.save(embedding_path, embedding)
+            row = self.store.append(face_id, 0, embedding)
 
             # 얼굴 이미지 저장 (선택사항)
             image_path = None
@@ -99,32 +258,32 @@ class FaceDatabase:
             if metadata is None:
                 metadata = {}
 
-            face_data = {
-                'face_id': face_id,
-                'name': metadata.get('name', face_id),
-                'embedding_path': f"embeddings/{face_id}.npy",
-                'embedding_paths': [f"embeddings/{face_id}.npy"],  # 다중 임베딩 지원
-                'image_path': f"faces/{face_id}.jpg" if image_path else None,
-                'image_paths': [f"faces/{face_id}.jpg"] if image_path else [],  # 다중 이미지 지원
-                'registered_at': metadata.get('registered_at', datetime.now().isoformat()),
-                'last_seen': None,
-                'recognition_count': 0,
-                'sample_count': 1,  # 샘플 개수
-                'metadata': metadata
-            }
-
-            # 데이터베이스에 추가
+            face_data = self._new_face_record(face_id, row, metadata, image_path is not None)
+
+            # 데이터베이스에 반영 후 저널 기록 (같은 ID 재등록 시 기존 레코드 교체)
+            old_rows = []
+            if face_id in self.faces:
+                old_rows = self.faces[face_id].get('embedding_rows', [])
+                self._unindex_name(face_id)
             self.faces[face_id] = face_data
+            row = None  # 레코드가 새 행을 가리키므로 이후 실패 시에도 유지
+            self._index_name(face_id)
+            self._log_put(face_id)
 
-            # 자동 저장
-            self.save()
+            # 새 행/이미지/레코드를 모두 기록한 뒤에 기존 샘플 삭제 표시 후 인덱스 교체
+            self.store.delete(old_rows)
+            self.index.replace(face_id, embedding)
 
             return True
 
         except Exception as e:
+            # 레코드에 반영되기 전에 실패하면 새로 기록한 행 삭제 표시
+            if row is not None:
+                self.store.delete([row])
             print(f"얼굴 등록 실패: {str(e)}")
             return False
 
+    @_synchronized
     def add_face_sample(
         self,
         face_id: str,
@@ -142,26 +301,22 @@ class FaceDatabase:
         Returns:
             bool: 추가 성공 여부
         """
+        self.refresh()
+
         if face_id not in self.faces:
             print(f"얼굴 ID '{face_id}'를 찾을 수 없습니다.")
             return False
 
+        row = None
         try:
-            face_data = self.faces[face_id]
+            face_data = self._copy_face(face_id)
 
             # 샘플 인덱스 계산
             sample_idx = face_data.get('sample_count', 1)
 
-            # 임베딩 저장
-            embedding_path = os.path.join(self.embeddings_dir, f"{face_id}_{sample_idx}.npy")
-            np.save(embedding_path, embedding)
-
-            # 임베딩 경로 추가
-            if 'embedding_paths' not in face_data:
-                # 기존 데이터 마이그레이션
-                face_data['embedding_paths'] = [face_data.get('embedding_path', f"embeddings/{face_id}.npy")]
-
-            face_data['embedding_paths'].append(f"embeddings/{face_id}_{sample_idx}.npy")
+            # 임베딩 저장 (저장소 끝에 O(1) append)
+            row = self.store.append(face_id, sample_idx, embedding)
+            face_data.setdefault('embedding_rows', []).append(row)
 
             # 이미지 저장 (선택사항)
             if face_image is not None:
@@ -176,111 +331,239 @@ class FaceDatabase:
 
                 face_data['image_paths'].append(f"faces/{face_id}_{sample_idx}.jpg")
 
-            # 샘플 카운트 증가
+            # 샘플 카운트 증가 후 레코드 교체
             face_data['sample_count'] = sample_idx + 1
+            self.faces[face_id] = face_data
+            row = None  # 레코드가 새 행을 가리키므로 이후 실패 시에도 유지
+            self.index.add(face_id, embedding)
 
-            # 저장
-            self.save()
+            # 저널 기록
+            self._log_put(face_id)
 
             print(f"'{face_data['name']}'에 {sample_idx + 1}번째 샘플 추가 완료")
             return True
 
         except Exception as e:
+            # 레코드에 반영되기 전에 실패하면 새로 기록한 행 삭제 표시
+            if row is not None:
+                self.store.delete([row])
             print(f"샘플 추가 실패: {str(e)}")
             return False
 
-    def find_match(
+    @_synchronized
+    def enroll_samples(
         self,
-        embedding: np.ndarray,
-        top_k: int = 1
-    ) -> List[Tuple[str, float]]:
+        samples: List[Tuple[str, np.ndarray, Optional[np.ndarray]]],
+        source: str = 'bulk_import'
+    ) -> List[str]:
         """
-        임베딩과 가장 유사한 얼굴 검색 (다중 임베딩 지원)
+        이름별 샘플 여러 개를 한 번에 등록
+
+        /face/register와 같은 규칙으로 같은 이름의 얼굴이 있으면 샘플로 추가하고,
+        없으면 새 얼굴을 만듭니다. 임베딩은 저장소에 한 번에 추가하고 인덱스는 한 번에 갱신하며,
+        메타데이터는 batch()로 하나의 SQLite 트랜잭션 또는 저널 한 줄로 기록합니다.
+        (파일 저장은 호출자가 save()로 한 번 수행)
 
         Args:
-            embedding (np.ndarray): 쿼리 임베딩
-            top_k (int): 반환할 최대 결과 수
+            samples (List[Tuple[str, np.ndarray, Optional[np.ndarray]]]): (이름, 임베딩, 얼굴 이미지) 목록
+            source (str): 새 얼굴 메타데이터의 등록 경로
 
         Returns:
-            List[Tuple[str, float]]: (face_id, similarity) 리스트 (내림차순)
+            List[str]: 샘플별 face_id (입력 순서)
         """
-        if len(self.faces) == 0:
+        self.refresh()
+        if not samples:
             return []
 
-        similarities = []
-
-        for face_id, face_data in self.faces.items():
-            # 다중 임베딩 경로 가져오기 (하위 호환성 유지)
-            embedding_paths = face_data.get('embedding_paths')
-            if not embedding_paths:
-                # 기존 단일 임베딩 경로 사용
-                embedding_paths = [face_data.get('embedding_path')]
-
-            max_similarity = 0.0
+        now = datetime.now()
+        stamp = now.strftime('%Y%m%d_%H%M%S')
+        records: Dict[str, Dict] = {}  # 이번 배치에서 바뀐 얼굴 레코드 사본
+        face_ids: List[str] = []
+        sample_idxs: List[int] = []
+        targets: Dict[str, str] = {}  # 이름 → 샘플을 받을 face_id
+        new_faces = set()
+        next_idx: Dict[str, int] = {}  # face_id → 다음 샘플 인덱스
+
+        for name, _, _ in samples:
+            face_id = targets.get(name)
+            if face_id is None:
+                same_name_ids = self.find_faces_by_name(name)
+                if same_name_ids:
+                    face_id = same_name_ids[0]
+                    records[face_id] = self._copy_face(face_id)
+                    next_idx[face_id] = records[face_id].get('sample_count', 1)
+                else:
+                    # 같은 초에 여러 얼굴을 만들므로 일련번호로 구분
+                    face_id = f"person_{stamp}_{len(new_faces):04d}"
+                    while face_id in self.faces:
+                        face_id += '_'
+                    new_faces.add(face_id)
+                    records[face_id] = None
+                    next_idx[face_id] = 0
+                targets[name] = face_id
+
+            face_ids.append(face_id)
+            sample_idxs.append(next_idx[face_id])
+            next_idx[face_id] += 1
+
+        embeddings = np.stack([np.asarray(embedding, dtype=np.float32).reshape(-1) for _, embedding, _ in samples])
+        rows = self.store.append_many(face_ids, sample_idxs, embeddings)
 
-            # 모든 임베딩과 비교하여 최고 유사도 사용
-            for emb_path in embedding_paths:
-                if not emb_path:
+        try:
+            for (name, _, face_image), face_id, sample_idx, row in zip(samples, face_ids, sample_idxs, rows.tolist()):
+                image_name = f"{face_id}.jpg" if sample_idx == 0 else f"{face_id}_{sample_idx}.jpg"
+                if face_image is not None:
+                    cv2.imwrite(os.path.join(self.faces_dir, image_name), face_image)
+
+                face_data = records[face_id]
+                if face_data is None:
+                    metadata = {'name': name, 'registered_at': now.isoformat(), 'source': source}
+                    records[face_id] = self._new_face_record(face_id, row, metadata, face_image is not None)
                     continue
 
-                full_path = os.path.join(self.data_dir, emb_path)
-
-                if not os.path.exists(full_path):
-                    continue
+                face_data.setdefault('embedding_rows', []).append(row)
+                if face_image is not None:
+                    if 'image_paths' not in face_data:
+                        existing_image = face_data.get('image_path')
+                        face_data['image_paths'] = [existing_image] if existing_image else []
+                    face_data['image_paths'].append(f"faces/{image_name}")
+                face_data['sample_count'] = sample_idx + 1
+        except Exception:
+            # 레코드에 반영되기 전에 실패하면 새로 기록한 행 삭제 표시
+            self.store.delete(rows.tolist())
+            raise
+
+        with self.batch():
+            for face_id, face_data in records.items():
+                self.faces[face_id] = face_data
+                if face_id in new_faces:
+                    self._index_name(face_id)
+                self._log_put(face_id)
+            self.index.add_many(face_ids, embeddings)
+
+        print(f"일괄 등록 완료: 샘플 {len(samples)}개 (새 얼굴 {len(new_faces)}명, 기존 얼굴 {len(records) - len(new_faces)}명)")
+        return face_ids
+
+    def _new_face_record(self, face_id: str, row: int, metadata: Dict, has_image: bool) -> Dict:
+        """첫 샘플로 새 얼굴 레코드 구성"""
+        return {
+            'face_id': face_id,
+            'name': metadata.get('name', face_id),
+            'embedding_rows': [row],  # 임베딩 저장소 행 번호 (다중 임베딩 지원)
+            'image_path': f"faces/{face_id}.jpg" if has_image else None,
+            'image_paths': [f"faces/{face_id}.jpg"] if has_image else [],  # 다중 이미지 지원
+            'registered_at': metadata.get('registered_at', datetime.now().isoformat()),
+            'last_seen': None,
+            'recognition_count': 0,
+            'sample_count': 1,  # 샘플 개수
+            'metadata': metadata
+        }
 
-                stored_embedding = np.load(full_path)
+    def find_match(
+        self,
+        embedding: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[Tuple[str, float]]:
+        """
+        임베딩과 가장 유사한 얼굴 검색 (다중 임베딩 지원)
 
-                # 유사도 계산
-                emb1 = embedding.reshape(1, -1)
-                emb2 = stored_embedding.reshape(1, -1)
-                similarity = cosine_similarity(emb1, emb2)[0][0]
+        Args:
+            embedding (np.ndarray): 쿼리 임베딩
+            top_k (int): 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과인 결과 모두)
+            early_exit (bool): min_score 이상인 첫 매칭에서 탐색 중단
+                (게이트 출입용 고신뢰 모드, 결과는 최대 1개이며 전역 최고 매칭이 아닐 수 있음)
 
-                # 최고 유사도 갱신
-                max_similarity = max(max_similarity, similarity)
+        Returns:
+            List[Tuple[str, float]]: (face_id, similarity) 리스트 (내림차순)
+        """
+        self.refresh()
+        return self.index.search(embedding, top_k=top_k, min_score=min_score, early_exit=early_exit)
 
-            if max_similarity > 0:
-                similarities.append((face_id, float(max_similarity)))
+    def find_match_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 임베딩을 한 번에 검색 (프레임 내 다중 얼굴용)
 
-        # 유사도 기준 내림차순 정렬
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            embeddings (np.ndarray): (N, 512) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과인 결과 모두)
+            early_exit (bool): 쿼리별로 min_score 이상인 첫 매칭에서 탐색 중단
 
-        # top_k 개만 반환
-        return similarities[:top_k]
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트 (내림차순)
+        """
+        self.refresh()
+        return self.index.search_batch(
+            embeddings, top_k=top_k, min_score=min_score, early_exit=early_exit
+        )
 
     def recognize_face(
         self,
-        embedding: np.ndarray
+        embedding: np.ndarray,
+        early_exit_score: Optional[float] = None
     ) -> Optional[Tuple[str, float]]:
         """
         얼굴 인식 수행
 
         Args:
             embedding (np.ndarray): 쿼리 임베딩
+            early_exit_score (Optional[float]): 고신뢰 컷오프 (recognize_faces 참고)
 
         Returns:
             Optional[Tuple[str, float]]: (face_id, confidence) 또는 None (매칭 실패)
         """
-        matches = self.find_match(embedding, top_k=1)
+        return self.recognize_faces(embedding, early_exit_score=early_exit_score)[0]
 
-        if len(matches) == 0:
-            return None
+    def recognize_faces(
+        self,
+        embeddings: np.ndarray,
+        early_exit_score: Optional[float] = None
+    ) -> List[Optional[Tuple[str, float]]]:
+        """
+        여러 얼굴을 한 번에 인식 (행렬곱 1회 + 통계 일괄 갱신)
 
-        face_id, similarity = matches[0]
+        Args:
+            embeddings (np.ndarray): (N, 512) 쿼리 임베딩
+            early_exit_score (Optional[float]): 지정하면 이 점수(임계값 이상) 이상인
+                첫 매칭에서 탐색을 멈추는 고신뢰 모드 (게이트 출입 등)
 
-        # 임계값 확인
-        if similarity >= self.threshold:
-            # 통계 업데이트
-            self._update_recognition_stats(face_id)
-            return (face_id, similarity)
+        Returns:
+            List[Optional[Tuple[str, float]]]: 쿼리별 (face_id, confidence) 또는 None
+        """
+        if len(embeddings) == 0:
+            return []
 
-        return None
+        # 임계값 미만은 인덱스에서 바로 걸러냄
+        if early_exit_score is not None:
+            matches_per_query = self.find_match_batch(
+                embeddings, min_score=max(self.threshold, early_exit_score), early_exit=True
+            )
+        else:
+            matches_per_query = self.find_match_batch(embeddings, top_k=1, min_score=self.threshold)
 
-    def _update_recognition_stats(self, face_id: str) -> None:
-        """인식 통계 업데이트"""
-        if face_id in self.faces:
-            self.faces[face_id]['last_seen'] = datetime.now().isoformat()
-            self.faces[face_id]['recognition_count'] += 1
+        results = [matches[0] if matches else None for matches in matches_per_query]
+        recognized_ids = [result[0] for result in results if result is not None]
 
+        # 통계 업데이트
+        if recognized_ids:
+            self._update_recognition_stats(*recognized_ids)
+
+        return results
+
+    def _update_recognition_stats(self, *face_ids: str) -> None:
+        """인식 통계 업데이트 (메모리 누적만 수행, 기록은 백그라운드)"""
+        self.stats.record(face_ids)
+
+    @_synchronized
     def remove_face(self, face_id: str) -> bool:
         """
         얼굴 삭제 (모든 샘플 포함)
@@ -291,19 +574,16 @@ class FaceDatabase:
         Returns:
             bool: 삭제 성공 여부
         """
+        self.refresh()
+
         if face_id not in self.faces:
             return False
 
         try:
             face_data = self.faces[face_id]
 
-            # 모든 임베딩 파일 삭제
-            embedding_paths = face_data.get('embedding_paths', [face_data.get('embedding_path')])
-            for emb_path in embedding_paths:
-                if emb_path:
-                    full_path = os.path.join(self.data_dir, emb_path)
-                    if os.path.exists(full_path):
-                        os.remove(full_path)
+            # 모든 임베딩 삭제 표시
+            self.store.delete(face_data.get('embedding_rows', []))
 
             # 모든 이미지 파일 삭제
             image_paths = face_data.get('image_paths', [face_data.get('image_path')])
@@ -313,11 +593,14 @@ class FaceDatabase:
                     if os.path.exists(full_path):
                         os.remove(full_path)
 
-            # 데이터베이스에서 제거
+            # 데이터베이스 및 인덱스에서 제거
+            self._unindex_name(face_id)
             del self.faces[face_id]
+            self.index.remove(face_id)
+            self.stats.forget(face_id)
 
-            # 저장
-            self.save()
+            # 저널 기록
+            self._log({'op': 'delete', 'face_id': face_id})
 
             return True
 
@@ -325,6 +608,7 @@ class FaceDatabase:
             print(f"얼굴 삭제 실패: {str(e)}")
             return False
 
+    @_synchronized
     def update_metadata(self, face_id: str, metadata: Dict) -> bool:
         """
         메타데이터 업데이트
@@ -336,13 +620,18 @@ class FaceDatabase:
         Returns:
             bool: 업데이트 성공 여부
         """
+        self.refresh()
+
         if face_id not in self.faces:
             return False
 
-        self.faces[face_id]['metadata'].update(metadata)
-        self.save()
+        face_data = self._copy_face(face_id)
+        face_data['metadata'].update(metadata)
+        self.faces[face_id] = face_data
+        self._log_put(face_id)
         return True
 
+    @_synchronized
     def merge_faces_by_name(self, name: str) -> Optional[str]:
         """
         같은 이름을 가진 모든 얼굴을 하나로 통합
@@ -353,63 +642,171 @@ class FaceDatabase:
         Returns:
             Optional[str]: 통합된 메인 face_id 또는 None (실패시)
         """
-        # 같은 이름을 가진 모든 얼굴 찾기
-        matching_faces = []
-        for face_id, face_data in self.faces.items():
-            if face_data.get('name') == name:
-                matching_faces.append((face_id, face_data))
+        self.refresh()
+
+        # 같은 이름을 가진 모든 얼굴 찾기 (등록순이므로 첫 번째가 가장 오래된 얼굴)
+        matching_faces = [(face_id, self.faces[face_id]) for face_id in self.find_faces_by_name(name)]
 
         if len(matching_faces) <= 1:
             print(f"'{name}' 이름을 가진 얼굴이 1개 이하입니다. 통합할 필요가 없습니다.")
             return None
 
         # 가장 오래된 얼굴을 메인으로 선택 (registered_at 기준)
-        matching_faces.sort(key=lambda x: x[1].get('registered_at', ''))
-        main_face_id, main_face_data = matching_faces[0]
+        main_face_id = matching_faces[0][0]
 
         print(f"'{name}' 이름을 가진 {len(matching_faces)}개의 얼굴을 '{main_face_id}'로 통합합니다...")
 
         try:
-            # 나머지 얼굴들의 샘플을 메인 얼굴에 추가
-            for face_id, face_data in matching_faces[1:]:
-                print(f"  - {face_id}의 샘플들을 {main_face_id}에 추가 중...")
+            # 나머지 얼굴들의 샘플을 메인 얼굴에 추가 (변경은 한 번에 기록)
+            with self.batch():
+                self._merge_into(main_face_id, matching_faces[1:])
 
-                # 모든 임베딩 가져오기
-                embedding_paths = face_data.get('embedding_paths', [face_data.get('embedding_path')])
-                image_paths = face_data.get('image_paths', [face_data.get('image_path')])
+            print(f"'{name}' 통합 완료! 메인 ID: {main_face_id}, 총 샘플 수: {self.faces[main_face_id]['sample_count']}")
+            return main_face_id
 
-                for i, emb_path in enumerate(embedding_paths):
-                    if not emb_path:
-                        continue
+        except Exception as e:
+            print(f"얼굴 통합 실패: {str(e)}")
+            return None
 
-                    # 임베딩 로드
-                    full_emb_path = os.path.join(self.data_dir, emb_path)
-                    if not os.path.exists(full_emb_path):
-                        continue
+    def _merge_into(self, main_face_id: str, faces: List[Tuple[str, Dict]]) -> None:
+        """얼굴들의 샘플을 메인 얼굴로 옮기고 원본 얼굴 삭제"""
+        for face_id, face_data in faces:
+            print(f"  - {face_id}의 샘플들을 {main_face_id}에 추가 중...")
 
-                    embedding = np.load(full_emb_path)
+            # 모든 임베딩 가져오기
+            embedding_rows = face_data.get('embedding_rows', [])
+            image_paths = face_data.get('image_paths', [face_data.get('image_path')])
 
-                    # 이미지 로드 (있으면)
-                    face_image = None
-                    if i < len(image_paths) and image_paths[i]:
-                        full_img_path = os.path.join(self.data_dir, image_paths[i])
-                        if os.path.exists(full_img_path):
-                            face_image = cv2.imread(full_img_path)
+            for i, row in enumerate(embedding_rows):
+                # 임베딩 로드 (저장소에서 복사)
+                embedding = self.store.get(row)
 
-                    # 메인 얼굴에 샘플 추가
-                    self.add_face_sample(main_face_id, embedding, face_image)
+                # 이미지 로드 (있으면)
+                face_image = None
+                if i < len(image_paths) and image_paths[i]:
+                    full_img_path = os.path.join(self.data_dir, image_paths[i])
+                    if os.path.exists(full_img_path):
+                        face_image = cv2.imread(full_img_path)
 
-                # 원본 얼굴 삭제
-                self.remove_face(face_id)
-                print(f"  - {face_id} 삭제 완료")
+                # 메인 얼굴에 샘플 추가
+                self.add_face_sample(main_face_id, embedding, face_image)
 
-            print(f"'{name}' 통합 완료! 메인 ID: {main_face_id}, 총 샘플 수: {main_face_data['sample_count']}")
-            return main_face_id
+            # 원본 얼굴 삭제
+            self.remove_face(face_id)
+            print(f"  - {face_id} 삭제 완료")
 
-        except Exception as e:
-            print(f"얼굴 통합 실패: {str(e)}")
+    def find_faces_by_name(self, name: str) -> List[str]:
+        """
+        이름으로 얼굴 ID 조회 (선형 탐색 없이 이름 인덱스 사용)
+
+        Args:
+            name (str): 이름
+
+        Returns:
+            List[str]: face_id 리스트 (등록순, 이 인스턴스에 로드된 얼굴만)
+        """
+        if self.metadata_db is not None:
+            # 같은 SQLite 파일을 쓰는 다른 인스턴스가 등록해 아직 반영하지 않은 얼굴은 제외
+            faces = self.faces
+            return [face_id for face_id in self.metadata_db.find_by_name(name) if face_id in faces]
+
+        faces = self.faces
+        return sorted(
+            self._names.get(name, ()),
+            key=lambda face_id: faces.get(face_id, {}).get('registered_at', '')
+        )
+
+    def _index_name(self, face_id: str) -> None:
+        """이름 인덱스에 얼굴 추가"""
+        name = self.faces[face_id].get('name', face_id)
+        self._names[name] = self._names.get(name, ()) + (face_id,)
+
+    def _unindex_name(self, face_id: str) -> None:
+        """이름 인덱스에서 얼굴 제거"""
+        name = self.faces[face_id].get('name', face_id)
+        face_ids = tuple(fid for fid in self._names.get(name, ()) if fid != face_id)
+        if face_ids:
+            self._names[name] = face_ids
+        else:
+            self._names.pop(name, None)
+
+    def refresh(self) -> bool:
+        """
+        다른 워커 프로세스의 변경 반영 (공유 모드 전용)
+
+        저장소 헤더의 세대 번호만 확인하므로 변경이 없으면 비용이 거의 없습니다.
+        바뀐 경우 메타데이터 변경 로그를 따라잡고 인덱스를 새 행까지 반영합니다.
+        다른 스레드가 이미 쓰기/반영 중이면 기다리지 않고 현재 스냅샷을 사용합니다.
+
+        Returns:
+            bool: 변경을 반영했는지 여부
+        """
+        if self.index_type != 'shared':
+            return False
+
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self.store.refresh()
+            generation = self.store.generation
+            if generation == self._synced_generation:
+                return False
+
+            self._sync_metadata()
+            self.index.sync()
+            self._synced_generation = generation
+            return True
+        finally:
+            self._lock.release()
+
+    def _sync_metadata(self) -> None:
+        """SQLite 변경 로그에서 바뀐 얼굴 레코드만 다시 읽기"""
+        changes, self._metadata_seq = self.metadata_db.changes_since(self._metadata_seq)
+
+        if changes is None:
+            # 변경 로그가 정리되어 따라잡을 수 없으면 전체 재로드
+            self.faces, config = self.metadata_db.load()
+            self.config = {**self.config, **config}
+            self._names = {}
+            for face_id in self.faces:
+                self._index_name(face_id)
+            return
+
+        for face_id, face_data in changes.items():
+            if face_id in self.faces:
+                self._unindex_name(face_id)
+            if face_data is None:
+                self.faces.pop(face_id, None)
+                self.stats.forget(face_id)
+            else:
+                self.faces[face_id] = face_data
+                self._index_name(face_id)
+
+    def _copy_face(self, face_id: str) -> Dict:
+        """수정용 얼굴 레코드 사본 (다른 스레드가 읽는 기존 레코드는 그대로 유지)"""
+        return copy.deepcopy(self.faces[face_id])
+
+    def get_face(self, face_id: str) -> Optional[Dict]:
+        """
+        얼굴 정보 반환 (인식 통계는 확정 값과 대기 값을 합산)
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            Optional[Dict]: 얼굴 정보 복사본 또는 None
+        """
+        face_data = self.faces.get(face_id)
+        if face_data is None:
             return None
 
+        recognition_count, last_seen = self.stats.get(face_id)
+        return {
+            **face_data,
+            'recognition_count': recognition_count,
+            'last_seen': last_seen,
+        }
+
     def get_all_faces(self) -> List[Dict]:
         """
         등록된 모든 얼굴 정보 반환
@@ -417,62 +814,716 @@ class FaceDatabase:
         Returns:
             List[Dict]: 얼굴 정보 리스트
         """
-        return list(self.faces.values())
+        self.refresh()
+        faces = (self.get_face(face_id) for face_id in list(self.faces))
+        return [face_data for face_data in faces if face_data is not None]
+
+    @contextmanager
+    def batch(self):
+        """
+        여러 변경을 모아 한 번에 기록하는 컨텍스트
 
+        블록 안의 등록/샘플 추가/삭제는 얼굴별 마지막 상태만 남겨
+        블록이 끝날 때 하나의 SQLite 트랜잭션 또는 하나의 저널 줄로 기록합니다.
+
+        Yields:
+            FaceDatabase: 자기 자신
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                self._batch_ops = {}
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    ops, self._batch_ops = list(self._batch_ops.values()), None
+                    if ops:
+                        self._persist(ops)
+
+    def _log(self, op: Dict) -> None:
+        """변경 연산 기록 (batch() 안에서는 블록이 끝날 때까지 지연)"""
+        self._compiled_dirty = True
+        if self._batch_ops is not None:
+            # 얼굴별 마지막 연산만 유지 (재삽입으로 순서도 마지막 변경 기준)
+            self._batch_ops.pop(op['face_id'], None)
+            self._batch_ops[op['face_id']] = op
+            return
+
+        self._persist([op])
+
+    def _persist(self, ops: List[Dict]) -> None:
+        """
+        변경 연산을 저장 백엔드에 기록 (변경 크기만큼만 기록)
+
+        SQLite는 하나의 트랜잭션으로, JSON은 저널 한 줄로 기록하며
+        저널이 compact_every에 도달하면 스냅샷으로 압축합니다.
+        """
+        if self.metadata_db is not None:
+            self.metadata_db.apply(ops)
+            if self.index_type == 'shared':
+                # 메타데이터 커밋 후 세대 번호를 올려 다른 워커가 따라오도록 알림
+                self.store.touch()
+            return
+
+        self.journal.append(ops[0] if len(ops) == 1 else {'op': 'batch', 'ops': ops})
+        if len(self.journal) >= self.compact_every:
+            self.save()
+
+    def _log_put(self, face_id: str) -> None:
+        """얼굴 레코드 전체를 저널에 기록"""
+        self._log({'op': 'put', 'face_id': face_id, 'face': self.faces[face_id]})
+
+    def _apply_op(self, op: Dict) -> None:
+        """저널 연산 1개를 메모리 상태에 적용"""
+        if op.get('op') == 'put':
+            self.faces[op['face_id']] = op['face']
+        elif op.get('op') == 'delete':
+            self.faces.pop(op['face_id'], None)
+        elif op.get('op') == 'batch':
+            for sub_op in op['ops']:
+                self._apply_op(sub_op)
+
+    @_synchronized
     def save(self) -> bool:
         """
-        데이터베이스 저장
+        데이터베이스 스냅샷 저장 및 저널 압축
+
+        임시 파일에 기록한 뒤 원자적으로 교체하므로 저장 중 중단되어도
+        이전 스냅샷과 저널이 그대로 남습니다.
+        SQLite 백엔드는 얼굴 레코드가 변경 시마다 기록되므로 설정만 저장합니다.
 
         Returns:
             bool: 저장 성공 여부
         """
         try:
-            db_data = {
-                'version': '1.0',
-                'created_at': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat(),
-                'faces': self.faces,
-                'config': self.config
-            }
-
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(db_data, f, indent=2, ensure_ascii=False)
-
+            if self.metadata_db is not None:
+                self.metadata_db.save_config(self.config)
+            else:
+                self._save_snapshot()
+
+            # 학습된 IVF/PQ 인덱스 저장 (재시작 시 k-means 재학습 방지, 가져온 갤러리 보존)
+            if isinstance(self.index, IVFIndex) and self.index.is_trained:
+                self.index.save(self.index_path)
+            elif isinstance(self.index, PQIndex) and self.index.is_trained:
+                self.index.save(self.pq_path)
+
+            self._save_compiled()
             return True
 
         except Exception as e:
             print(f"데이터베이스 저장 실패: {str(e)}")
             return False
 
+    def _save_snapshot(self) -> None:
+        """JSON 스냅샷을 원자적으로 기록하고 저널 비우기"""
+        db_data = {
+            'version': '1.0',
+            'created_at': datetime.now().isoformat(),
+            'last_updated': datetime.now().isoformat(),
+            'faces': self.faces,
+            'config': self.config
+        }
+
+        tmp_path = f"{self.db_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(db_data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.db_path)
+
+        # 스냅샷에 반영된 저널 비우기
+        self.journal.truncate()
+
+    @_synchronized
     def load(self) -> bool:
         """
-        데이터베이스 로드
+        데이터베이스 로드 (스냅샷 + 저널 재적용, 또는 SQLite)
+
+        단계별 시간과 누락/손상 파일은 load_report에 모아 로드가 끝날 때 한 번에 출력합니다.
 
         Returns:
             bool: 로드 성공 여부
         """
-        if not os.path.exists(self.db_path):
-            print(f"데이터베이스 파일이 없습니다. 새로 생성합니다: {self.db_path}")
+        self.load_report = self._empty_load_report()
+        try:
+            with self._timed('metadata'):
+                if self.metadata_db is not None:
+                    loaded = self._load_sqlite()
+                else:
+                    loaded = self._load_json()
+            if not loaded:
+                return False
+
+            embedding_size = self.config.get('embedding_size', self.store.dim)
+            if embedding_size != self.store.dim:
+                print(f"데이터베이스 로드 실패: 임베딩 크기 불일치 "
+                      f"(config: {embedding_size}, 저장소: {self.store.dim})")
+                return False
+
+            with self._timed('names'):
+                # 이름 인덱스 구성
+                self._names = {}
+                for face_id in self.faces:
+                    self._index_name(face_id)
+
+                # config에서 threshold 로드
+                if 'threshold' in self.config:
+                    self.threshold = self.config['threshold']
+
+                # 스냅샷에 남아 있는 기존 인식 통계를 누적기에 반영
+                for face_id, face_data in self.faces.items():
+                    self.stats.merge_base(
+                        face_id, face_data.get('recognition_count', 0), face_data.get('last_seen')
+                    )
+
+            # 샘플별 .npy 파일을 임베딩 저장소로 이전 (1회)
+            with self._timed('migration'):
+                self._migrate_embedding_files()
+
+            # 검색 인덱스 구성
+            with self._timed('index'):
+                self._rebuild_index()
+
+            print(f"데이터베이스 로드 완료: {len(self.faces)}명의 얼굴 데이터")
+            self._print_load_report()
+            return True
+
+        except Exception as e:
+            print(f"데이터베이스 로드 실패: {str(e)}")
             return False
 
+    @staticmethod
+    def _empty_load_report() -> Dict:
+        """빈 로드 보고서"""
+        return {
+            'timings': {},
+            'missing_files': [],  # 없는 임베딩 파일 경로
+            'corrupt_files': [],  # (경로, 사유) 읽을 수 없거나 형식이 다른 임베딩 파일
+            'invalid_rows': [],  # (face_id, 행 번호, 사유) 인덱스에서 제외된 저장소 행
+            'missing_images': [],  # 없는 얼굴 이미지 경로
+        }
+
+    @contextmanager
+    def _timed(self, phase: str):
+        """블록 실행 시간을 load_report['timings'][phase]에 기록"""
+        start = time.perf_counter()
         try:
+            yield
+        finally:
+            self.load_report['timings'][phase] = time.perf_counter() - start
+
+    def _print_load_report(self) -> None:
+        """단계별 로드 시간과 누락/손상 항목을 한 번에 출력"""
+        phase_names = {
+            'metadata': '메타데이터', 'names': '이름 인덱스', 'migration': '파일 이전',
+            'validation': '파일 검사', 'index': '인덱스',
+        }
+        timings = ', '.join(
+            f"{phase_names.get(phase, phase)} {seconds:.3f}s"
+            for phase, seconds in self.load_report['timings'].items()
+        )
+        print(f"  로드 시간: {timings}")
+
+        sections = [
+            ('누락된 임베딩 파일', self.load_report['missing_files']),
+            ('손상된 임베딩 파일', self.load_report['corrupt_files']),
+            ('인덱스에서 제외된 저장소 행', self.load_report['invalid_rows']),
+            ('누락된 얼굴 이미지', self.load_report['missing_images']),
+        ]
+        problems = [(title, items) for title, items in sections if items]
+        if not problems:
+            return
+
+        print("  로드 검사 결과: " + ', '.join(f"{title} {len(items)}개" for title, items in problems))
+        for title, items in problems:
+            for item in items[:self.LOAD_REPORT_EXAMPLES]:
+                print(f"    - {title}: {item}")
+            if len(items) > self.LOAD_REPORT_EXAMPLES:
+                print(f"    - {title}: ... 외 {len(items) - self.LOAD_REPORT_EXAMPLES}개")
+
+    def _read_json(self) -> bool:
+        """JSON 스냅샷을 읽고 저널 재적용 (파일이 없으면 False)"""
+        if not os.path.exists(self.db_path) and not os.path.exists(self.journal_path):
+            return False
+
+        if os.path.exists(self.db_path):
             with open(self.db_path, 'r', encoding='utf-8') as f:
                 db_data = json.load(f)
 
             self.faces = db_data.get('faces', {})
             self.config = db_data.get('config', self.config)
 
-            # config에서 threshold 로드
-            if 'threshold' in self.config:
-                self.threshold = self.config['threshold']
+        # 마지막 스냅샷 이후의 변경 재적용
+        journal = self.journal or FaceJournal(self.journal_path)
+        try:
+            for op in journal.replay():
+                self._apply_op(op)
+        finally:
+            if journal is not self.journal:
+                journal.close()
 
-            print(f"데이터베이스 로드 완료: {len(self.faces)}명의 얼굴 데이터")
+        return True
+
+    def _load_json(self) -> bool:
+        """JSON 백엔드 로드"""
+        if not os.path.exists(self.db_path) and len(self.journal) == 0:
+            print(f"데이터베이스 파일이 없습니다. 새로 생성합니다: {self.db_path}")
+            return False
+
+        return self._read_json()
+
+    def _load_sqlite(self) -> bool:
+        """SQLite 백엔드 로드 (비어 있으면 기존 JSON 데이터를 한 트랜잭션으로 이전)"""
+        # 로드 이후의 변경만 따라잡도록 변경 순번을 먼저 기록
+        self._metadata_seq = self.metadata_db.last_seq()
+
+        if self.metadata_db.count() > 0:
+            faces, config = self.metadata_db.load()
+            self.faces = faces
+            self.config = {**self.config, **config}
             return True
 
-        except Exception as e:
-            print(f"데이터베이스 로드 실패: {str(e)}")
+        if not self._read_json() or not self.faces:
+            print(f"데이터베이스 파일이 없습니다. 새로 생성합니다: {self.metadata_db_path}")
             return False
 
+        self.metadata_db.replace_all(self.faces, self.config)
+
+        # 이전이 끝난 JSON 파일은 남겨 두되 다시 읽히지 않도록 이름 변경
+        for path in (self.db_path, self.journal_path):
+            if os.path.exists(path):
+                os.replace(path, f"{path}.migrated")
+        print(f"JSON 데이터베이스 {len(self.faces)}명을 SQLite로 이전했습니다: {self.metadata_db_path}")
+        return True
+
+    def _migrate_embedding_files(self) -> None:
+        """
+        샘플별 .npy 파일(embedding_path/embedding_paths)을 임베딩 저장소로 이전
+
+        파일은 스레드 풀에서 병렬로 읽어 검사한 뒤 한 번에 저장소에 추가합니다.
+        이전된 얼굴은 embedding_rows로 저장소 행을 참조하며,
+        데이터베이스 저장이 끝난 뒤 기존 .npy 파일을 삭제합니다.
+        없거나 손상된 파일은 건너뛰고 load_report에 기록합니다.
+        """
+        migrated_ids = []
+        samples = []  # (face_id, 샘플 번호, 파일 경로)
+
+        for face_id, face_data in self.faces.items():
+            if 'embedding_paths' not in face_data and 'embedding_path' not in face_data:
+                continue
+            migrated_ids.append(face_id)
+
+            embedding_paths = face_data.get('embedding_paths') or [face_data.get('embedding_path')]
+            face_data.setdefault('embedding_rows', [])
+            for sample_idx, emb_path in enumerate(embedding_paths):
+                if emb_path:
+                    samples.append((face_id, sample_idx, os.path.join(self.data_dir, emb_path)))
+
+            face_data.pop('embedding_path', None)
+            face_data.pop('embedding_paths', None)
+
+        if not migrated_ids:
+            return
+
+        # 이전은 스냅샷 없이 하는 전체 로드이므로 이미지 파일도 함께 검사
+        with self._timed('validation'):
+            self._check_image_files()
+        if not samples:
+            return
+
+        results = self._parallel_map(self._read_embedding_file, [path for _, _, path in samples])
+
+        loaded = []
+        for (face_id, sample_idx, full_path), (status, embedding) in zip(samples, results):
+            if status == 'ok':
+                loaded.append((face_id, sample_idx, full_path, embedding))
+            elif status == 'missing':
+                self.load_report['missing_files'].append(full_path)
+            else:
+                self.load_report['corrupt_files'].append((full_path, status))
+
+        if not loaded:
+            return
+
+        rows = self.store.append_many(
+            [face_id for face_id, _, _, _ in loaded],
+            [sample_idx for _, sample_idx, _, _ in loaded],
+            np.stack([embedding for _, _, _, embedding in loaded])
+        )
+        for (face_id, _, _, _), row in zip(loaded, rows.tolist()):
+            self.faces[face_id]['embedding_rows'].append(row)
+        migrated_files = [full_path for _, _, full_path, _ in loaded]
+
+        with self.batch():
+            for face_id in migrated_ids:
+                self._log_put(face_id)
+
+        if self.save():
+            for full_path in migrated_files:
+                os.remove(full_path)
+            print(f"임베딩 파일 {len(migrated_files)}개를 저장소로 이전했습니다: {self.store.path}")
+
+    def _parallel_map(self, func: Callable, items: List) -> List:
+        """
+        항목을 load_workers개 구간으로 나눠 스레드 풀에서 func 적용 (입력 순서 유지)
+
+        항목마다 작업을 만들면 작은 파일 검사에서는 스케줄링 비용이 I/O보다 커지므로 구간 단위로 나눕니다.
+        """
+        size = max(1, -(-len(items) // self.load_workers))
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        with ThreadPoolExecutor(max_workers=self.load_workers) as pool:
+            parts = pool.map(lambda chunk: [func(item) for item in chunk], chunks)
+            return [result for part in parts for result in part]
+
+    def _read_embedding_file(self, path: str) -> Tuple[str, Optional[np.ndarray]]:
+        """
+        .npy 임베딩 파일 하나를 읽고 형식 검사 (스레드 풀에서 호출)
+
+        Args:
+            path (str): 파일 경로
+
+        Returns:
+            Tuple[str, Optional[np.ndarray]]: ('ok', (D,) float32 임베딩),
+                ('missing', None) 또는 (손상 사유, None)
+        """
+        if not os.path.exists(path):
+            return 'missing', None
+        try:
+            embedding = np.load(path, allow_pickle=False)
+        except Exception as e:
+            return f"읽기 실패: {str(e)}", None
+
+        if not np.issubdtype(embedding.dtype, np.floating):
+            return f"자료형 불일치: {embedding.dtype}", None
+        if embedding.size != self.store.dim:
+            return f"크기 불일치: {embedding.shape} (기대값: ({self.store.dim},))", None
+        if not np.isfinite(embedding).all():
+            return "NaN/Inf 값 포함", None
+        return 'ok', embedding.reshape(-1).astype(np.float32)
+
+    def _check_image_files(self) -> None:
+        """등록된 얼굴 이미지가 있는지 스레드 풀에서 병렬로 확인하여 load_report에 기록"""
+        paths = sorted({
+            image_path
+            for face_data in self.faces.values()
+            for image_path in (face_data.get('image_paths') or [face_data.get('image_path')])
+            if image_path
+        })
+        if not paths:
+            return
+
+        exists = self._parallel_map(os.path.exists, [os.path.join(self.data_dir, path) for path in paths])
+        self.load_report['missing_images'] = [
+            path for path, found in zip(paths, exists) if not found
+        ]
+
+    def _create_index(self) -> EmbeddingIndex:
+        """설정된 종류의 빈 검색 인덱스 생성"""
+        dim = self.config.get('embedding_size', 512)
+
+        if self.index_type == 'flat':
+            return EmbeddingIndex(dim=dim)
+        if self.index_type == 'shared':
+            # 메타데이터가 가리키는 행만 검색 (등록 도중 실패해 남은 행 제외)
+            return SharedIndex(self.store, referenced_rows=lambda: self._gallery_layout()[2])
+        if self.index_type == 'quantized':
+            return QuantizedIndex(self.store, precision=self.precision)
+        if self.index_type == 'pq':
+            return PQIndex(dim=dim, num_subspaces=self.pq_subspaces)
+        if self.index_type == 'template':
+            return TemplateIndex(dim=dim, sample_budget=self.sample_budget)
+
+        # 'ivf'도 k-means가 의미 있는 최소 규모(256 샘플) 전까지는 전수 탐색
+        min_train_size = self.ann_min_size if self.index_type == 'auto' else 256
+        return IVFIndex(dim=dim, nprobe=self.nprobe, min_train_size=min_train_size)
+
+    def _rebuild_index(self) -> None:
+        """
+        저장된 임베딩으로 검색 인덱스 재구성
+
+        새 인덱스를 모두 만든 뒤 교체하므로 재구성 중에도 검색은 이전 인덱스를 사용합니다.
+        """
+        index = self._create_index()
+
+        # 공유/저정밀도 모드: 저장소 memory-map을 그대로 사용 (라벨/배율/코드만 계산)
+        if isinstance(index, SharedIndex):
+            self._synced_generation = self.store.generation
+            index.sync()
+            self.index = index
+            return
+
+        saved_path = {IVFIndex: self.index_path, PQIndex: self.pq_path}.get(type(index))
+        if saved_path and os.path.exists(saved_path) and index.load(saved_path):
+            # 저장된 PQ 인덱스: 가져온 샘플은 원본이 없으므로 재구성하지 않고 차이만 반영
+            if isinstance(index, PQIndex):
+                self._reconcile_index(index)
+                self.index = index
+                return
+
+            # 저장된 IVF 인덱스가 현재 데이터와 일치하면 그대로 사용
+            expected_ids = {fid for fid, f in self.faces.items() if f.get('embedding_rows')}
+            expected_rows = sum(len(f.get('embedding_rows', [])) for f in self.faces.values())
+            if set(index.face_ids) == expected_ids and len(index) == expected_rows:
+                self.index = index
+                return
+            print("저장된 IVF 인덱스가 데이터와 일치하지 않아 재구성합니다.")
+
+        imported = sum(face_data.get('imported_samples', 0) for face_data in self.faces.values())
+        if imported:
+            print(f"가져온 갤러리 샘플 {imported}개는 저장소에 원본이 없어 인덱스에서 제외됩니다.")
+
+        # PQ: 저장소에서 블록 단위로 인코딩 (float32 전체 갤러리를 메모리에 만들지 않음)
+        if isinstance(index, PQIndex):
+            if 'validation' not in self.load_report['timings']:
+                with self._timed('validation'):
+                    self._check_image_files()
+            self._build_pq_index(index)
+            self.index = index
+            return
+
+        # 학습된 중심점/코드북이 로드된 경우 재학습 없이 할당/인코딩만 다시 수행
+        index.build_compiled(self._compiled_gallery())
+        self.index = index
+
+    def _build_pq_index(self, index: PQIndex) -> None:
+        """
+        저장소 memory-map 행을 블록 단위로 정규화/인코딩하여 PQ 인덱스 구성
+
+        NaN/Inf 행은 0 벡터로 두고 load_report['invalid_rows']에 기록합니다.
+
+        Args:
+            index (PQIndex): 구성할 인덱스 (학습된 코드북이 있으면 인코딩만 수행)
+        """
+        face_ids, labels, rows = self._gallery_layout()
+        vectors = self.store.vectors()
+        corrupt = set()
+
+        def read_rows(positions: np.ndarray) -> np.ndarray:
+            matrix = EmbeddingIndex.normalize(vectors[rows[positions]])
+            invalid = ~np.isfinite(matrix).all(axis=1)
+            matrix[invalid] = 0.0
+            corrupt.update(positions[invalid].tolist())
+            return matrix
+
+        index.build_rows(face_ids, labels, read_rows)
+        self.load_report['invalid_rows'] += [
+            (face_ids[labels[i]], int(rows[i]), 'NaN/Inf 값 포함') for i in sorted(corrupt)
+        ]
+
+    def _reconcile_index(self, index: PQIndex) -> None:
+        """
+        저장된 PQ 인덱스에 마지막 저장 이후의 변경만 저장소 행으로 반영
+
+        얼굴별 기대 샘플 수는 저장소 행 수 + 가져온 샘플 수(imported_samples)이며,
+        샘플 추가만 있었던 얼굴은 새 행만 추가하여 가져온 코드를 유지합니다.
+        """
+        snapshot = index.snapshot()
+        indexed = Counter(snapshot.face_ids[label] for label in snapshot.labels)
+        for face_id in set(indexed) - set(self.faces):
+            index.remove(face_id)
+
+        vectors = self.store.vectors()
+        for face_id, face_data in self.faces.items():
+            rows = face_data.get('embedding_rows', [])
+            missing = len(rows) + face_data.get('imported_samples', 0) - indexed.get(face_id, 0)
+            if missing == 0:
+                continue
+            if 0 < missing <= len(rows) and face_id in index:
+                index.add(face_id, vectors[rows[-missing:]])
+            elif rows:
+                index.replace(face_id, vectors[rows])
+            else:
+                index.remove(face_id)
+
+    def _gallery_layout(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        face_id 순서대로 (얼굴 ID 테이블, 행별 라벨, 행별 저장소 행 번호)
+
+        메타데이터 백엔드마다 얼굴 로드 순서가 달라도 같은 배치가 되도록 face_id로 정렬합니다.
+        """
+        face_ids = sorted(fid for fid, face_data in self.faces.items() if face_data.get('embedding_rows'))
+        row_lists = [self.faces[face_id]['embedding_rows'] for face_id in face_ids]
+        counts = [len(embedding_rows) for embedding_rows in row_lists]
+        labels = np.repeat(np.arange(len(face_ids), dtype=np.int64), counts)
+        rows = np.fromiter(itertools.chain.from_iterable(row_lists), dtype=np.int64, count=sum(counts))
+        return self._validate_layout(face_ids, labels, rows)
+
+    def _validate_layout(
+        self,
+        face_ids: List[str],
+        labels: np.ndarray,
+        rows: np.ndarray
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        저장소에 없거나 삭제되었거나 다른 얼굴의 행을 가리키는 참조를 제외
+
+        제외된 행은 load_report['invalid_rows']에 기록합니다 (호출마다 최신 결과로 교체).
+
+        Args:
+            face_ids (List[str]): 얼굴 ID 테이블
+            labels (np.ndarray): 행별 라벨
+            rows (np.ndarray): 행별 저장소 행 번호
+
+        Returns:
+            Tuple[List[str], np.ndarray, np.ndarray]: 유효한 행만 남긴 배치
+        """
+        table = self.store.table()
+        in_range = (rows >= 0) & (rows < len(table))
+        valid = in_range.copy()
+        if in_range.any():
+            records = table[rows[in_range]]
+            expected = np.array([face_id.encode('utf-8') for face_id in face_ids], dtype=table.dtype['face_id'])
+            valid[in_range] = (
+                ((records['flags'] & EmbeddingStore.FLAG_DELETED) == 0)
+                & (records['face_id'] == expected[labels[in_range]])
+            )
+
+        invalid = np.flatnonzero(~valid).tolist()
+        self.load_report['invalid_rows'] = [
+            (face_ids[labels[i]], int(rows[i]), '저장소 범위 밖' if not in_range[i] else '삭제되었거나 다른 얼굴의 행')
+            for i in invalid
+        ]
+        if not invalid:
+            return face_ids, labels, rows
+
+        labels, rows = labels[valid], rows[valid]
+        used = np.unique(labels)
+        return [face_ids[label] for label in used.tolist()], np.searchsorted(used, labels), rows
+
+    def _compile_gallery(self, face_ids: List[str], labels: np.ndarray, rows: np.ndarray) -> CompiledGallery:
+        """_gallery_layout 배치대로 저장소 행을 모아 정규화한 갤러리 (NaN/Inf 행은 0으로 두어 매칭 제외)"""
+        matrix = EmbeddingIndex.normalize(self.store.vectors()[rows])
+        corrupt = np.flatnonzero(~np.isfinite(matrix).all(axis=1)).tolist()
+        if corrupt:
+            matrix[corrupt] = 0.0
+            self.load_report['invalid_rows'] += [
+                (face_ids[labels[i]], int(rows[i]), 'NaN/Inf 값 포함') for i in corrupt
+            ]
+        return CompiledGallery(
+            matrix=matrix,
+            labels=labels,
+            face_ids=face_ids,
+            rows=rows,
+            generation=self.store.generation
+        )
+
+    def _compiled_gallery(self) -> CompiledGallery:
+        """
+        인덱스 구성용 갤러리 (컴파일된 스냅샷이 현재 데이터와 같으면 파일에서 한 번에 로드)
+
+        스냅샷이 없거나 저장소 세대 번호/행 구성이 다르면 이미지 파일을 검사하고
+        저장소에서 다시 컴파일해 기록합니다.
+        """
+        layout = self._gallery_layout()
+        gallery = CompiledGallery.load(self.compiled_path, self.store.dim)
+        if gallery is not None and gallery.matches(*layout, self.store.generation):
+            self._compiled_dirty = False
+            return gallery
+
+        if gallery is not None:
+            print("컴파일된 스냅샷이 현재 데이터와 달라 다시 만듭니다.")
+        if 'validation' not in self.load_report['timings']:
+            with self._timed('validation'):
+                self._check_image_files()
+        gallery = self._compile_gallery(*layout)
+        if len(gallery.rows) > 0 and gallery.save(self.compiled_path):
+            self._compiled_dirty = False
+        return gallery
+
+    def _save_compiled(self) -> None:
+        """마지막 기록 이후 갤러리가 바뀌었으면 컴파일된 스냅샷 다시 기록"""
+        # 공유 모드는 저장소 memory-map을 직접 검색하고, PQ는 코드(pq_path)로 재시작하므로 스냅샷이 필요 없음
+        if not self._compiled_dirty or isinstance(self.index, (SharedIndex, PQIndex)):
+            return
+        if self._compile_gallery(*self._gallery_layout()).save(self.compiled_path):
+            self._compiled_dirty = False
+
+    @_synchronized
+    def export_gallery(self, path: str) -> bool:
+        """
+        갤러리를 PQ 압축 단일 파일로 내보내기 (메모리가 작은 단말의 오프라인 검색용)
+
+        현재 인덱스가 학습된 PQ 인덱스면 그대로, 아니면 저장소의 전체 샘플로
+        코드북을 학습해 인코딩합니다. 얼굴 이미지와 인식 통계는 포함하지 않습니다.
+
+        Args:
+            path (str): 내보낼 파일 경로 (.npz)
+
+        Returns:
+            bool: 내보내기 성공 여부
+        """
+        self.refresh()
+
+        index = self.index
+        if not (isinstance(index, PQIndex) and index.is_trained):
+            index = PQIndex(
+                dim=self.config.get('embedding_size', 512),
+                num_subspaces=self.pq_subspaces,
+                min_train_size=0
+            )
+            self._build_pq_index(index)
+
+        excluded = ('embedding_rows', 'imported_samples', 'image_path', 'image_paths',
+                    'recognition_count', 'last_seen')
+        metadata = {
+            face_id: {key: value for key, value in face_data.items() if key not in excluded}
+            for face_id, face_data in self.faces.items()
+        }
+        return index.save(path, metadata)
+
+    @_synchronized
+    def import_gallery(self, path: str) -> int:
+        """
+        export_gallery로 내보낸 PQ 갤러리로 현재 갤러리를 교체
+
+        가져온 샘플은 PQ 코드로만 존재하므로 index_type='pq'에서만 지원하며,
+        인덱스는 저장 시 pq_path에 기록되어 재시작 후에도 그대로 로드됩니다.
+
+        Args:
+            path (str): 가져올 파일 경로 (.npz)
+
+        Returns:
+            int: 가져온 얼굴 수
+        """
+        if self.index_type != 'pq':
+            raise ValueError("갤러리 가져오기는 index_type='pq'에서만 지원합니다.")
+
+        index = self._create_index()
+        if not index.load(path):
+            return 0
+        metadata = PQIndex.load_metadata(path)
+        snapshot = index.snapshot()
+        sample_counts = Counter(snapshot.face_ids[label] for label in snapshot.labels)
+
+        with self.batch():
+            for face_id in list(self.faces):
+                self.store.delete(self.faces[face_id].get('embedding_rows', []))
+                self._unindex_name(face_id)
+                del self.faces[face_id]
+                self.stats.forget(face_id)
+                self._log({'op': 'delete', 'face_id': face_id})
+
+            for face_id, face_info in metadata.items():
+                self.faces[face_id] = {
+                    **face_info,
+                    'face_id': face_id,
+                    'embedding_rows': [],
+                    'imported_samples': sample_counts.get(face_id, 0),
+                    'image_path': None,
+                    'image_paths': [],
+                    'last_seen': None,
+                    'recognition_count': 0,
+                }
+                self._index_name(face_id)
+                self._log_put(face_id)
+
+        self.index = index
+        self.save()
+        print(f"PQ 갤러리 {len(metadata)}명을 가져왔습니다: {path}")
+        return len(metadata)
+
     def get_statistics(self) -> Dict:
         """
         데이터베이스 통계 반환
@@ -481,7 +1532,7 @@ class FaceDatabase:
             Dict: 통계 정보
         """
         total_recognitions = sum(
-            face['recognition_count'] for face in self.faces.values()
+            self.stats.get(face_id)[0] for face_id in list(self.faces)
         )
 
         return {
@@ -489,9 +1540,20 @@ class FaceDatabase:
             'total_recognitions': total_recognitions,
             'threshold': self.threshold,
             'model_name': self.config.get('model_name', 'default'),
-            'db_path': self.db_path
+            'db_path': self.metadata_db_path if self.metadata_db is not None else self.db_path,
+            'storage': self.storage,
+            'index': repr(self.index)
         }
 
+    @_synchronized
+    def close(self) -> None:
+        """대기 중인 인식 통계와 컴파일된 스냅샷을 기록하고 파일 닫기"""
+        self._save_compiled()
+        self.stats.close()
+        if self.journal is not None:
+            self.journal.close()
+        self.store.close()
+
     def __enter__(self):
         """Context manager 진입"""
         return self
@@ -499,6 +1561,7 @@ class FaceDatabase:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager 종료 (자동 저장)"""
         self.save()
+        self.stats.flush()
 
     def __len__(self) -> int:
         """데이터베이스 크기 반환"""
@@ -0,0 +1,127 @@
+"""
+얼굴 데이터베이스 저널 모듈
+
+변경 연산을 JSONL 파일에 순서대로 추가 기록 (write-ahead journal)
+"""
+
+import os
+import json
+from typing import Dict, Iterator
+
+
+class FaceJournal:
+    """
+    append-only JSONL 저널
+
+    각 변경 연산을 한 줄의 JSON으로 추가 기록합니다.
+    스냅샷(face_database.json)을 저장한 뒤에는 truncate()로 비우며,
+    로드 시에는 스냅샷 위에 저널을 순서대로 재적용(replay)합니다.
+
+    Attributes:
+        path (str): 저널 파일 경로
+        fsync (bool): 기록마다 디스크 동기화 여부
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        저널 열기 (파일이 없으면 생성)
+
+        Args:
+            path (str): 저널 파일 경로
+            fsync (bool): 기록마다 os.fsync 수행 여부
+        """
+        self.path = path
+        self.fsync = fsync
+        self._count = self._repair()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _repair(self) -> int:
+        """
+        기록 도중 중단되어 손상된 꼬리 제거
+
+        첫 손상 줄부터 파일 끝까지 잘라내고, 마지막 줄에 줄바꿈이 없으면 추가합니다.
+        그대로 두면 다음 append()가 손상된 줄에 이어 써져 이후 기록이 모두 무시됩니다.
+
+        Returns:
+            int: 유효한 연산 수
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        count, valid_end = 0, 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        break
+                    count += 1
+                valid_end += len(line)
+            size = f.seek(0, os.SEEK_END)
+
+        if valid_end < size:
+            print(f"저널 손상 구간 제거: {self.path} ({size - valid_end} bytes)")
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_end)
+            if valid_end > 0:
+                f.seek(valid_end - 1)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        return count
+
+    def append(self, op: Dict) -> None:
+        """
+        연산 1개 기록
+
+        Args:
+            op (Dict): 연산 (예: {'op': 'put', 'face_id': ..., 'face': {...}})
+        """
+        self._file.write(json.dumps(op, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._count += 1
+
+    def replay(self) -> Iterator[Dict]:
+        """
+        기록된 연산을 순서대로 반환
+
+        마지막 줄이 기록 도중 중단되어 손상된 경우 해당 줄부터 무시합니다.
+
+        Yields:
+            Dict: 연산
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"저널 {line_no}번째 줄이 손상되어 이후 기록을 무시합니다: {self.path}")
+                    return
+
+    def truncate(self) -> None:
+        """저널 비우기 (스냅샷 저장 후 호출)"""
+        self._file.close()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.close()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._count = 0
+
+    def close(self) -> None:
+        """파일 닫기"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __len__(self) -> int:
+        """마지막 스냅샷 이후 기록된 연산 수"""
+        return self._count
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return f"FaceJournal(path={self.path}, entries={self._count})"
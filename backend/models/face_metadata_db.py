@@ -0,0 +1,282 @@
+"""
+얼굴 메타데이터 데이터베이스 모듈
+
+SQLite를 사용한 얼굴 메타데이터 저장 (FaceDatabase의 선택적 저장 백엔드)
+- 이름/face_id/그룹 컬럼 인덱스로 조회
+- 여러 변경을 하나의 트랜잭션으로 기록
+- 변경 로그(changes)로 다른 프로세스가 바뀐 레코드만 따라잡기
+"""
+
+import os
+import json
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+
+class FaceMetadataDB:
+    """
+    얼굴 메타데이터 SQLite 저장소
+
+    얼굴 레코드 전체는 data 컬럼(JSON)에 저장하고,
+    조회에 쓰이는 name, group_name은 인덱스가 있는 별도 컬럼으로 유지합니다.
+    임베딩은 EmbeddingStore에 따로 저장되며 여기에는 행 번호만 기록됩니다.
+    변경마다 changes 테이블에 순번(seq)을 남기므로, 다른 프로세스는 마지막으로 본
+    순번 이후에 바뀐 face_id만 다시 읽습니다 (오래된 로그는 CHANGE_LOG_SIZE개만 유지).
+    """
+
+    CHANGE_LOG_SIZE = 10000
+
+    def __init__(self, db_path: str):
+        """
+        메타데이터 데이터베이스 초기화
+
+        Args:
+            db_path: 데이터베이스 파일 경로 (절대 경로)
+        """
+        self.db_path = db_path
+
+        # 디렉토리 생성
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        # 테이블 생성
+        self._create_tables()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """SQLite 연결 생성 (thread-safe)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_tables(self) -> None:
+        """얼굴/설정 테이블 생성"""
+        conn = self._get_connection()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS faces (
+                    face_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    group_name TEXT,
+                    registered_at TEXT,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS config (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    face_id TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_faces_name ON faces(name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_faces_group ON faces(group_name)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _face_row(face_data: Dict) -> Tuple:
+        """얼굴 레코드 → faces 테이블 행"""
+        metadata = face_data.get('metadata') or {}
+        return (
+            face_data['face_id'],
+            face_data.get('name', face_data['face_id']),
+            metadata.get('group'),
+            face_data.get('registered_at'),
+            json.dumps(face_data, ensure_ascii=False),
+        )
+
+    def apply(self, ops: List[Dict]) -> None:
+        """
+        변경 연산 목록을 하나의 트랜잭션으로 기록
+
+        Args:
+            ops: 연산 목록 ({'op': 'put', 'face': {...}} 또는 {'op': 'delete', 'face_id': ...})
+        """
+        conn = self._get_connection()
+        try:
+            with conn:
+                for op in ops:
+                    if op['op'] == 'put':
+                        conn.execute(
+                            "INSERT OR REPLACE INTO faces (face_id, name, group_name, registered_at, data) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            self._face_row(op['face'])
+                        )
+                    elif op['op'] == 'delete':
+                        conn.execute("DELETE FROM faces WHERE face_id = ?", (op['face_id'],))
+                self._log_changes(conn, [op['face_id'] for op in ops])
+        finally:
+            conn.close()
+
+    def _log_changes(self, conn: sqlite3.Connection, face_ids: List[str]) -> None:
+        """변경 로그 기록 및 오래된 로그 정리"""
+        conn.executemany(
+            "INSERT INTO changes (face_id) VALUES (?)", [(face_id,) for face_id in face_ids]
+        )
+        last_seq = conn.execute("SELECT MAX(seq) FROM changes").fetchone()[0]
+        conn.execute("DELETE FROM changes WHERE seq <= ?", (last_seq - self.CHANGE_LOG_SIZE,))
+
+    def last_seq(self) -> int:
+        """마지막 변경 순번 (변경이 없으면 0)"""
+        conn = self._get_connection()
+        try:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        finally:
+            conn.close()
+
+    def changes_since(self, seq: int) -> Tuple[Optional[Dict[str, Optional[Dict]]], int]:
+        """
+        순번 seq 이후에 바뀐 얼굴 레코드 조회 (하나의 읽기 트랜잭션)
+
+        Args:
+            seq: 마지막으로 반영한 변경 순번
+
+        Returns:
+            (face_id → 현재 레코드 (삭제되었으면 None), 새 순번)
+            로그가 이미 정리되어 따라잡을 수 없으면 레코드 자리에 None 반환 (전체 재로드 필요)
+        """
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN")
+            first_seq, last_seq = conn.execute(
+                "SELECT COALESCE(MIN(seq), 0), COALESCE(MAX(seq), 0) FROM changes"
+            ).fetchone()
+            if last_seq == seq:
+                return {}, seq
+            if seq < first_seq - 1:
+                return None, last_seq
+
+            changed = {}
+            cursor = conn.execute(
+                "SELECT DISTINCT c.face_id, f.data FROM changes c "
+                "LEFT JOIN faces f ON f.face_id = c.face_id WHERE c.seq > ?",
+                (seq,)
+            )
+            for row in cursor.fetchall():
+                changed[row['face_id']] = json.loads(row['data']) if row['data'] else None
+            return changed, last_seq
+        finally:
+            conn.rollback()
+            conn.close()
+
+    def replace_all(self, faces: Dict[str, Dict], config: Dict) -> None:
+        """
+        전체 얼굴/설정을 하나의 트랜잭션으로 교체 (JSON 마이그레이션용)
+
+        Args:
+            faces: face_id → 얼굴 레코드
+            config: 데이터베이스 설정
+        """
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.execute("DELETE FROM faces")
+                conn.executemany(
+                    "INSERT INTO faces (face_id, name, group_name, registered_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [self._face_row(face_data) for face_data in faces.values()]
+                )
+                self._write_config(conn, config)
+        finally:
+            conn.close()
+
+    def save_config(self, config: Dict) -> None:
+        """설정 저장"""
+        conn = self._get_connection()
+        try:
+            with conn:
+                self._write_config(conn, config)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write_config(conn: sqlite3.Connection, config: Dict) -> None:
+        """설정 테이블 기록"""
+        conn.executemany(
+            "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in config.items()]
+        )
+
+    def load(self) -> Tuple[Dict[str, Dict], Dict]:
+        """
+        전체 얼굴 레코드와 설정 로드
+
+        Returns:
+            (face_id → 얼굴 레코드, 설정)
+        """
+        conn = self._get_connection()
+        try:
+            faces = {
+                row['face_id']: json.loads(row['data'])
+                for row in conn.execute("SELECT face_id, data FROM faces ORDER BY registered_at")
+            }
+            config = {
+                row['key']: json.loads(row['value'])
+                for row in conn.execute("SELECT key, value FROM config")
+            }
+            return faces, config
+        finally:
+            conn.close()
+
+    def find_by_name(self, name: str) -> List[str]:
+        """
+        이름으로 face_id 조회 (인덱스 사용, 등록순)
+
+        Args:
+            name: 이름
+
+        Returns:
+            face_id 리스트
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                "SELECT face_id FROM faces WHERE name = ? ORDER BY registered_at",
+                (name,)
+            )
+            return [row['face_id'] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def find_by_group(self, group: str) -> List[str]:
+        """
+        그룹으로 face_id 조회 (인덱스 사용, 등록순)
+
+        Args:
+            group: 그룹 이름 (metadata['group'])
+
+        Returns:
+            face_id 리스트
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                "SELECT face_id FROM faces WHERE group_name = ? ORDER BY registered_at",
+                (group,)
+            )
+            return [row['face_id'] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        """등록된 얼굴 수"""
+        conn = self._get_connection()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM faces").fetchone()[0]
+        finally:
+            conn.close()
+
+    def get(self, face_id: str) -> Optional[Dict]:
+        """face_id로 얼굴 레코드 조회"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute("SELECT data FROM faces WHERE face_id = ?", (face_id,)).fetchone()
+            return json.loads(row['data']) if row else None
+        finally:
+            conn.close()
@@ -7,8 +7,22 @@ InsightFace를 이용한 얼굴 임베딩 추출 및 인식
 import cv2
 import numpy as np
 from typing import Optional, Tuple, List, Dict
-from sklearn.metrics.pairwise import cosine_similarity
+from utils.similarity import cosine
 from utils.text_utils import put_korean_text, get_text_size
+from models.model_zoo import LEGACY_MODELS, embedding_model, resolve_model_name, validate_model_name
+
+
+# 추론 프로필 → 실행할 InsightFace 모듈 (None이면 모델 팩 전체)
+INFERENCE_PROFILES = {
+    'recognition_only': ('detection', 'recognition'),
+    'with_pose': ('detection', 'recognition', 'landmark_3d_68'),  # Head Pose (liveness)
+    'with_attributes': ('detection', 'recognition', 'genderage'),  # 나이/성별
+    'full': None,
+}
+
+# 2단계 해상도 감지: 감지 입력에서 안정적으로 찾을 수 있는 얼굴 크기(px)와 감지 이미지 최소 긴 변
+DETECTABLE_FACE_SIZE = 32
+MIN_DETECTION_SIDE = 128
 
 
 class FaceRecognizer:
@@ -26,18 +40,55 @@ class FaceRecognizer:
         self,
         model_name: Optional[str] = None,
         device: str = 'auto',
-        det_size: Tuple[int, int] = (640, 640)
+        det_size: Tuple[int, int] = (640, 640),
+        max_batch_size: int = 32,
+        profile: str = 'full',
+        engine=None,
+        quantization: Optional[str] = None,
+        multi_resolution: bool = False,
+        min_face_size: Optional[int] = None
     ):
         """
         얼굴 인식기 초기화
 
         Args:
-            model_name (Optional[str]): InsightFace 모델 이름 (최신 버전에서만 사용, 구버전은 None)
+            model_name (Optional[str]): InsightFace 모델 팩 이름 (model_zoo.MODEL_ZOO 또는 로컬에 설치된 팩,
+                None이면 buffalo_l, 구버전은 LEGACY_MODELS를 순서대로 시도)
             device (str): 실행 디바이스 ('auto', 'cuda', 'cpu')
             det_size (Tuple[int, int]): 얼굴 감지 입력 크기
+            max_batch_size (int): 인식 모델에 한 번에 입력할 최대 얼굴 수 (배치 추출)
+            profile (str): 기본 추론 프로필 (INFERENCE_PROFILES, 시작 시 이 프로필의 모듈만 로드하고
+                다른 프로필을 요청하면 필요한 모듈을 그때 로드)
+            engine (Optional[InferenceEngine]): ONNX Runtime 세션 설정
+                (None이면 환경 변수 FACE_ENGINE_CONFIG의 설정 파일, 없으면 기본 설정)
+            quantization (Optional[str]): INT8 모델 사용 ('dynamic', 'static', None이면 FP32,
+                quantize_models.py로 만든 감지/인식 모델만 교체되며 없는 모델은 FP32로 로드)
+            multi_resolution (bool): 축소한 프레임에서 감지하고 원본 해상도 프레임에서 정렬/임베딩
+                (1080p/4K 카메라용, 감지 입력은 프레임 비율을 유지해 det_size 정사각형 여백을 만들지 않음)
+            min_face_size (Optional[int]): 원본 프레임에서 예상되는 가장 작은 얼굴 크기(px)
+                (multi_resolution에서 이 얼굴이 감지 입력에서 DETECTABLE_FACE_SIZE가 되도록 축소 비율 결정,
+                None이면 긴 변을 det_size에 맞춤)
         """
-        self.model_name = model_name or 'default'
+        if profile not in INFERENCE_PROFILES:
+            raise ValueError(f"지원하지 않는 추론 프로필: {profile} (가능: {', '.join(INFERENCE_PROFILES)})")
+        if quantization is not None:
+            from models.inference_engine import QUANTIZATION_MODES
+            if quantization not in QUANTIZATION_MODES:
+                raise ValueError(
+                    f"지원하지 않는 양자화 방식: {quantization} (가능: {', '.join(QUANTIZATION_MODES)})"
+                )
+
+        if model_name is not None:
+            validate_model_name(model_name)
+
+        self.model_name = resolve_model_name(model_name)
         self.det_size = det_size
+        self.max_batch_size = max_batch_size
+        self.profile = profile
+        self.quantization = quantization
+        self.multi_resolution = multi_resolution
+        self.min_face_size = min_face_size
+        self.engine = None
 
         # InsightFace import (지연 로딩)
         try:
@@ -69,7 +120,10 @@ class FaceRecognizer:
             ctx_id = -1
             self.device = 'cpu'
 
-        print(f"얼굴 인식 초기화 중... (모델: {self.model_name}, 디바이스: {self.device})")
+        print(
+            f"얼굴 인식 초기화 중... (모델: {self.model_name}, 디바이스: {self.device}, "
+            f"프로필: {self.profile}, 양자화: {self.quantization or '없음'})"
+        )
 
         # InsightFace 모델 로드
         try:
@@ -78,27 +132,40 @@ class FaceRecognizer:
             version = getattr(insightface, '__version__', '0.2.1')
 
             if version.startswith('0.2'):
-                # 구버전: retinaface와 arcface 모델 조합 사용
+                # 구버전: retinaface와 arcface 모델 조합 사용 (지정한 모델이 없으면 LEGACY_MODELS 순서대로)
                 print(f"InsightFace 구버전 감지 (v{version}), retinaface-arcface 모델 사용")
-                # 구버전에서는 빈 문자열 또는 특정 모델명 필요
-                # name='antelopev2'를 시도하거나, 빈 문자열 사용
-                try:
-                    self.app = FaceAnalysis(name='')
-                except:
-                    # 빈 문자열도 안 되면 기본 모델 시도
+                self.app = None
+                errors = []
+                for name in ([model_name] if model_name is not None else LEGACY_MODELS):
                     try:
-                        self.app = FaceAnalysis(name='antelopev2')
-                    except:
-                        # 마지막 시도: retinaface_r50_v1
-                        self.app = FaceAnalysis(name='retinaface_r50_v1')
+                        self.app = FaceAnalysis(name=name)
+                        self.model_name = name or 'default'
+                        break
+                    except Exception as e:
+                        errors.append(f"{name or '(기본)'}: {e}")
+                        print(f"구버전 모델 로드 실패 - {errors[-1]}")
+                if self.app is None:
+                    raise RuntimeError(', '.join(errors))
             else:
-                # 최신 버전: buffalo 모델 사용
-                if model_name:
-                    self.app = FaceAnalysis(name=model_name)
-                else:
-                    self.app = FaceAnalysis(name='buffalo_l')
+                # 최신 버전: buffalo 모델에서 프로필에 필요한 모듈만 로드
+                from models.face_analysis import LazyFaceAnalysis
+                from models.inference_engine import InferenceEngine
+                self.engine = engine or InferenceEngine.from_env()
+                providers = ['CPUExecutionProvider']
+                if ctx_id >= 0:
+                    providers.insert(0, 'CUDAExecutionProvider')
+                self.app = LazyFaceAnalysis(
+                    name=self.model_name,
+                    allowed_modules=INFERENCE_PROFILES[profile],
+                    providers=providers,
+                    engine=self.engine,
+                    quantization=quantization
+                )
 
             self.app.prepare(ctx_id=ctx_id, det_size=det_size)
+            if self.multi_resolution and self._recognition_model() is None:
+                print("구버전 InsightFace는 2단계 해상도 감지를 지원하지 않아 원본 프레임으로 감지합니다.")
+                self.multi_resolution = False
             print(f"얼굴 인식기 초기화 완료")
 
             # 임베딩 크기 설정 (일반적으로 512차원)
@@ -126,14 +193,8 @@ class FaceRecognizer:
         if image is None or image.size == 0:
             return None
 
-        # RGB로 변환 (InsightFace는 RGB를 사용)
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        else:
-            image_rgb = image
-
-        # 얼굴 감지 및 분석
-        faces = self.app.get(image_rgb)
+        # 얼굴 감지 및 임베딩 (나이/성별/랜드마크 모듈은 실행하지 않음)
+        faces = self._analyze(image, 'recognition_only')
 
         if len(faces) == 0:
             return None
@@ -165,24 +226,91 @@ class FaceRecognizer:
 
     def extract_embeddings_batch(
         self,
-        images: List[np.ndarray]
+        images: List[np.ndarray],
+        max_batch_size: Optional[int] = None
     ) -> List[Optional[np.ndarray]]:
         """
         여러 이미지에서 배치로 임베딩 추출
 
+        이미지마다 얼굴을 감지하고 (extract_embedding과 같이 첫 번째 얼굴 사용),
+        정렬된 얼굴 이미지를 모아 인식 모델에 max_batch_size개씩 하나의 텐서로 입력합니다.
+
         Args:
-            images (List[np.ndarray]): 이미지 리스트
+            images (List[np.ndarray]): 이미지 리스트 (BGR 형식)
+            max_batch_size (Optional[int]): 인식 모델 1회 입력 최대 얼굴 수 (None이면 self.max_batch_size)
 
         Returns:
-            List[Optional[np.ndarray]]: 임베딩 벡터 리스트
+            List[Optional[np.ndarray]]: 이미지별 임베딩 벡터 (얼굴 미감지 시 None)
         """
-        embeddings = []
-        for image in images:
-            embedding = self.extract_embedding(image)
-            embeddings.append(embedding)
+        rec_model = self._recognition_model()
+        if rec_model is None:
+            # 인식 모델에 직접 접근할 수 없는 구버전은 이미지별로 처리
+            return [self.extract_embedding(image) for image in images]
+
+        from insightface.utils import face_align
+
+        # 1. 이미지별 감지 후 첫 번째 얼굴 정렬 (app.get과 같은 RGB 입력)
+        crops, owners = [], []
+        for i, image in enumerate(images):
+            if image is None or image.size == 0:
+                continue
+            image_rgb = self._to_rgb(image)
+            bboxes, kpss = self.app.det_model.detect(image_rgb, max_num=0, metric='default')
+            if bboxes.shape[0] == 0 or kpss is None:
+                continue
+            crops.append(face_align.norm_crop(image_rgb, landmark=kpss[0], image_size=rec_model.input_size[0]))
+            owners.append(i)
+
+        # 2. 정렬된 얼굴을 배치로 임베딩 후 이미지별로 되돌림
+        embeddings: List[Optional[np.ndarray]] = [None] * len(images)
+        for owner, embedding in zip(owners, self._embed_aligned(crops, max_batch_size)):
+            embeddings[owner] = embedding
 
         return embeddings
 
+    def _recognition_model(self):
+        """InsightFace 인식 모델 (배치 입력 불가능한 구버전이면 None)"""
+        models = getattr(self.app, 'models', None)
+        if not models or 'recognition' not in models or not hasattr(self.app, 'det_model'):
+            return None
+        return models['recognition']
+
+    def _embed_aligned(
+        self,
+        crops: List[np.ndarray],
+        max_batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        정렬된 얼굴 이미지들을 인식 모델에 배치로 입력
+
+        Args:
+            crops (List[np.ndarray]): norm_crop으로 정렬된 얼굴 이미지
+            max_batch_size (Optional[int]): 1회 입력 최대 얼굴 수 (None이면 self.max_batch_size)
+
+        Returns:
+            np.ndarray: (N, D) 임베딩
+        """
+        rec_model = self._recognition_model()
+        batch_size = max(1, max_batch_size or self.max_batch_size)
+        if isinstance(rec_model.input_shape[0], int):
+            # 배치 차원이 고정된 모델 (예: 1)
+            batch_size = rec_model.input_shape[0]
+
+        if not crops:
+            return np.empty((0, self.embedding_size), dtype=np.float32)
+
+        return np.concatenate([
+            rec_model.get_feat(crops[start:start + batch_size])
+            for start in range(0, len(crops), batch_size)
+        ])
+
+    @staticmethod
+    def _to_rgb(image: np.ndarray) -> np.ndarray:
+        """BGR 이미지를 InsightFace 입력(RGB)으로 변환"""
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image
+
     @staticmethod
     def compute_similarity(
         embedding1: np.ndarray,
@@ -203,14 +331,9 @@ class FaceRecognizer:
         if embedding1 is None or embedding2 is None:
             return 0.0
 
-        # 임베딩을 2D 배열로 변환 (sklearn 요구사항)
-        emb1 = embedding1.reshape(1, -1)
-        emb2 = embedding2.reshape(1, -1)
-
         if metric == 'cosine':
-            # 코사인 유사도 계산
-            similarity = cosine_similarity(emb1, emb2)[0][0]
-            return float(similarity)
+            # 코사인 유사도 계산 (simsimd SIMD 커널, 없으면 NumPy)
+            return cosine(embedding1, embedding2)
 
         elif metric == 'euclidean':
             # 유클리드 거리를 유사도로 변환
@@ -224,13 +347,15 @@ class FaceRecognizer:
 
     def detect_and_extract(
         self,
-        image: np.ndarray
+        image: np.ndarray,
+        profile: Optional[str] = None
     ) -> List[dict]:
         """
         이미지에서 모든 얼굴 감지 및 임베딩 추출
 
         Args:
             image (np.ndarray): 입력 이미지
+            profile (Optional[str]): 추론 프로필 (None이면 self.profile, 프로필에 없는 항목은 None)
 
         Returns:
             List[dict]: 각 얼굴 정보 딕셔너리 리스트
@@ -238,39 +363,231 @@ class FaceRecognizer:
                 embedding: 512차원 임베딩 벡터
                 age: 추정 나이 (int) 또는 None
                 gender: 0=여성, 1=남성 또는 None
+                pose: [yaw, pitch, roll] 또는 None
+                kps: (5, 2) 랜드마크, det_score: 감지 점수
         """
         if image is None or image.size == 0:
             return []
 
-        # RGB로 변환
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # 얼굴 감지 및 분석
+        faces = self._analyze(image, profile)
+
+        return [self._face_result(face) for face in faces]
+
+    def detect(
+        self,
+        image: np.ndarray,
+        profile: str = 'recognition_only'
+    ) -> List[dict]:
+        """
+        얼굴 감지만 수행 (인식 모델은 실행하지 않음)
+
+        매 프레임 감지하고 임베딩은 새 얼굴이나 미확인 얼굴에만 embed()로 계산하는 용도입니다.
+
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR 형식)
+            profile (str): 감지와 함께 실행할 모듈의 추론 프로필
+                ('recognition_only'면 감지만, 'with_attributes'면 나이/성별도 실행)
+
+        Returns:
+            List[dict]: detect_and_extract와 같은 형식 (embedding은 None),
+                kps: (5, 2) 랜드마크 (embed 입력), det_score: 감지 점수
+        """
+        if image is None or image.size == 0:
+            return []
+
+        faces = self._analyze(image, profile, embed=False)
+        return [self._face_result(face) for face in faces]
+
+    def _analyze(self, image: np.ndarray, profile: Optional[str], embed: bool = True) -> list:
+        """
+        프로필의 모듈만 실행한 InsightFace 얼굴 목록
+
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR 형식)
+            profile (Optional[str]): 추론 프로필 (None이면 self.profile)
+            embed (bool): 인식 모델 실행 여부
+
+        Returns:
+            list: InsightFace Face 목록
+        """
+        profile = profile or self.profile
+        if profile not in INFERENCE_PROFILES:
+            raise ValueError(f"지원하지 않는 추론 프로필: {profile}")
+
+        if not hasattr(self.app, 'load_modules'):
+            # 구버전은 로드된 모든 모듈 실행
+            return self.app.get(self._to_rgb(image))
+
+        modules = INFERENCE_PROFILES[profile]
+        if modules is None:
+            self.app.load_modules(None)
+            modules = tuple(self.app.models)
+        if not embed:
+            modules = tuple(module for module in modules if module != 'recognition')
+
+        if self.multi_resolution:
+            return self._analyze_multi_resolution(image, modules)
+        return self.app.get(self._to_rgb(image), modules=modules)
+
+    @staticmethod
+    def detection_scale(
+        height: int,
+        width: int,
+        det_size: Tuple[int, int] = (640, 640),
+        min_face_size: Optional[int] = None
+    ) -> float:
+        """
+        2단계 해상도 감지의 축소 비율
+
+        min_face_size가 있으면 그 얼굴이 감지 입력에서 DETECTABLE_FACE_SIZE가 되도록,
+        없으면 긴 변이 det_size에 맞도록 축소합니다 (확대하지 않음, 긴 변은 MIN_DETECTION_SIDE 이상).
+
+        Args:
+            height (int): 원본 프레임 높이
+            width (int): 원본 프레임 너비
+            det_size (Tuple[int, int]): 기본 감지 입력 크기
+            min_face_size (Optional[int]): 원본 프레임에서 예상되는 가장 작은 얼굴 크기(px)
+
+        Returns:
+            float: 축소 비율 (0 < scale <= 1)
+        """
+        long_side = max(height, width)
+        if min_face_size:
+            scale = DETECTABLE_FACE_SIZE / min_face_size
         else:
-            image_rgb = image
+            scale = max(det_size) / long_side
+        scale = max(scale, MIN_DETECTION_SIDE / long_side)
+        return min(1.0, scale)
 
-        # 얼굴 감지 및 분석
-        faces = self.app.get(image_rgb)
-
-        results = []
-        for face in faces:
-            bbox = face.bbox.astype(int)
-            embedding = face.embedding
-            age = getattr(face, 'age', None)
-            gender = getattr(face, 'gender', None)
-            # Head Pose 추출 (yaw, pitch, roll)
-            pose = getattr(face, 'pose', None)
-            if pose is not None:
-                pose = [float(v) for v in pose]
-
-            results.append({
-                'bbox': bbox,
-                'embedding': embedding,
-                'age': age,
-                'gender': gender,
-                'pose': pose,
-            })
-
-        return results
+    def _analyze_multi_resolution(self, image: np.ndarray, modules: Tuple[str, ...]) -> list:
+        """
+        축소한 프레임에서 감지하고, bbox/랜드마크를 원본 좌표로 되돌려 원본 프레임에서 나머지 모듈 실행
+
+        인식 모델 입력은 원본(BGR) 프레임에서 정렬한 얼굴만 RGB로 바꾸므로 전체 프레임 색 변환이 없고,
+        프레임 내 얼굴을 한 번에 배치로 임베딩합니다.
+
+        Args:
+            image (np.ndarray): 원본 프레임 (BGR 형식)
+            modules (Tuple[str, ...]): 실행할 태스크
+
+        Returns:
+            list: InsightFace Face 목록 (원본 프레임 좌표)
+        """
+        from insightface.app.common import Face
+
+        self.app.load_modules(set(modules) | {'detection'})
+        det_model = self.app.det_model
+
+        # 1. 비율을 유지한 채 축소 (INTER_AREA: 큰 축소에서도 에일리어싱이 적음)
+        height, width = image.shape[:2]
+        scale = self.detection_scale(height, width, self.det_size, self.min_face_size)
+        small = image
+        if scale < 1.0:
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        small_rgb = self._to_rgb(small)
+
+        # 감지 입력 크기는 축소 프레임을 32 배수로 올린 크기 (입력 크기가 고정된 모델은 그 크기)
+        input_shape = det_model.input_shape
+        if isinstance(input_shape[2], int) and isinstance(input_shape[3], int):
+            input_size = (input_shape[3], input_shape[2])
+        else:
+            input_size = (-(-small.shape[1] // 32) * 32, -(-small.shape[0] // 32) * 32)
+
+        bboxes, kpss = det_model.detect(small_rgb, input_size=input_size, max_num=0, metric='default')
+        scale_xy = np.array([small.shape[1] / width, small.shape[0] / height], dtype=np.float32)
+
+        faces = []
+        for i in range(bboxes.shape[0]):
+            faces.append(Face(
+                bbox=bboxes[i, 0:4] / np.tile(scale_xy, 2),
+                kps=kpss[i] / scale_xy if kpss is not None else None,
+                det_score=bboxes[i, 4]
+            ))
+
+        # 2. 나이/성별/자세 등은 원본 해상도 RGB 프레임에서 실행 (필요할 때만 변환)
+        extra = [taskname for taskname in self.app.models if taskname in modules
+                 and taskname not in ('detection', 'recognition')]
+        if faces and extra:
+            image_rgb = self._to_rgb(image)
+            for face in faces:
+                for taskname in extra:
+                    self.app.models[taskname].get(image_rgb, face)
+
+        # 3. 원본 해상도에서 정렬한 얼굴을 배치로 임베딩
+        if faces and 'recognition' in modules and kpss is not None:
+            embeddings = self._embed_aligned(self._align(image, [face.kps for face in faces]))
+            for face, embedding in zip(faces, embeddings):
+                face.embedding = embedding
+
+        return faces
+
+    def _align(self, image: np.ndarray, kpss: List[np.ndarray]) -> List[np.ndarray]:
+        """
+        BGR 이미지에서 얼굴을 정렬한 뒤 정렬된 얼굴만 RGB로 변환 (전체 이미지 변환과 결과 동일)
+
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR 형식)
+            kpss (List[np.ndarray]): 얼굴별 (5, 2) 랜드마크
+
+        Returns:
+            List[np.ndarray]: 인식 모델 입력 크기로 정렬된 RGB 얼굴 이미지
+        """
+        from insightface.utils import face_align
+
+        image_size = self._recognition_model().input_size[0]
+        return [
+            self._to_rgb(face_align.norm_crop(image, landmark=kps, image_size=image_size))
+            for kps in kpss
+        ]
+
+    def embed(
+        self,
+        image: np.ndarray,
+        faces: List[dict],
+        max_batch_size: Optional[int] = None
+    ) -> List[np.ndarray]:
+        """
+        detect()로 찾은 얼굴들의 임베딩을 배치로 계산 (각 얼굴의 'embedding'도 채움)
+
+        Args:
+            image (np.ndarray): detect()에 입력한 이미지 (BGR 형식)
+            faces (List[dict]): detect() 결과 중 임베딩이 필요한 얼굴
+            max_batch_size (Optional[int]): 인식 모델 1회 입력 최대 얼굴 수
+
+        Returns:
+            List[np.ndarray]: 얼굴별 임베딩 벡터
+        """
+        rec_model = self._recognition_model()
+        if rec_model is None or any(face.get('kps') is None for face in faces):
+            # 구버전 detect()는 임베딩까지 계산된 결과를 반환
+            return [face['embedding'] for face in faces]
+
+        crops = self._align(image, [np.asarray(face['kps'], dtype=np.float32) for face in faces])
+        embeddings = list(self._embed_aligned(crops, max_batch_size))
+        for face, embedding in zip(faces, embeddings):
+            face['embedding'] = embedding
+
+        return embeddings
+
+    @staticmethod
+    def _face_result(face) -> dict:
+        """InsightFace Face 객체를 결과 딕셔너리로 변환"""
+        # Head Pose 추출 (yaw, pitch, roll)
+        pose = getattr(face, 'pose', None)
+        if pose is not None:
+            pose = [float(v) for v in pose]
+
+        return {
+            'bbox': face.bbox.astype(int),
+            'embedding': getattr(face, 'embedding', None),
+            'age': getattr(face, 'age', None),
+            'gender': getattr(face, 'gender', None),
+            'pose': pose,
+            'kps': getattr(face, 'kps', None),
+            'det_score': float(face.det_score) if getattr(face, 'det_score', None) is not None else None,
+        }
 
     def get_model_info(self) -> Dict:
         """
@@ -281,9 +598,18 @@ class FaceRecognizer:
         """
         return {
             'model_name': self.model_name,
+            'embedding_model': embedding_model(self.model_name),
             'device': self.device,
             'embedding_size': self.embedding_size,
-            'det_size': self.det_size
+            'det_size': self.det_size,
+            'max_batch_size': self.max_batch_size,
+            'profile': self.profile,
+            'multi_resolution': self.multi_resolution,
+            'min_face_size': self.min_face_size,
+            'loaded_modules': sorted(getattr(self.app, 'models', {})),
+            'quantization': self.quantization,
+            'quantized_modules': dict(getattr(self.app, 'quantized', {})),
+            'engine': self.engine.describe() if self.engine is not None else None
         }
 
 
@@ -443,9 +769,13 @@ def demo_face_recognition(camera_id: int = 0) -> None:
             # 모든 얼굴 감지 및 임베딩 추출
             results = recognizer.detect_and_extract(frame)
 
-            for face_result in results:
+            # 프레임 내 모든 얼굴을 한 번에 매칭
+            matches = database.recognize_faces(
+                np.stack([face_result['embedding'] for face_result in results])
+            ) if results else []
+
+            for face_result, match in zip(results, matches):
                 bbox = face_result['bbox']
-                embedding = face_result['embedding']
                 age = face_result.get('age')
                 gender = face_result.get('gender')
                 x1, y1, x2, y2 = bbox
@@ -458,9 +788,6 @@ def demo_face_recognition(camera_id: int = 0) -> None:
                     ag_parts.append(f"{age}세")
                 age_gender_str = ", ".join(ag_parts)
 
-                # 데이터베이스에서 매칭
-                match = database.recognize_face(embedding)
-
                 if match:
                     face_id, confidence = match
                     face_data = database.faces.get(face_id)
@@ -0,0 +1,143 @@
+"""
+얼굴 추적 모듈
+
+연속 프레임의 감지 결과를 bbox IoU로 이어 붙여, 이미 인식된 얼굴은
+임베딩/검색을 건너뛰고 새 얼굴·미확인 얼굴·오래된 트랙만 다시 인식하도록 판단
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class Track:
+    """추적 중인 얼굴 1개"""
+    bbox: np.ndarray  # 마지막 bbox [x1, y1, x2, y2]
+    match: Optional[Tuple[str, float]] = None  # 마지막 인식 결과 (face_id, 유사도)
+    embedded_at: int = -1  # 마지막으로 임베딩을 계산한 프레임 번호 (-1이면 아직 없음)
+    last_seen: int = 0  # 마지막으로 감지된 프레임 번호
+
+
+class FaceTracker:
+    """
+    IoU 기반 얼굴 추적기
+
+    Attributes:
+        iou_threshold (float): 같은 얼굴로 볼 최소 bbox IoU
+        reembed_interval (int): 인식된 얼굴도 이 프레임 수마다 다시 인식
+        max_missed (int): 이 프레임 수 이상 감지되지 않은 트랙은 삭제
+    """
+
+    def __init__(self, iou_threshold: float = 0.5, reembed_interval: int = 30, max_missed: int = 5):
+        """
+        추적기 초기화
+
+        Args:
+            iou_threshold (float): 같은 얼굴로 볼 최소 bbox IoU
+            reembed_interval (int): 인식된 얼굴의 재인식 주기 (프레임)
+            max_missed (int): 트랙 유지 최대 미감지 프레임 수
+        """
+        self.iou_threshold = iou_threshold
+        self.reembed_interval = reembed_interval
+        self.max_missed = max_missed
+        self.tracks: Dict[int, Track] = {}
+        self.frame_index = 0
+        self._next_id = 0
+
+    @staticmethod
+    def iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+        """
+        두 bbox 집합의 IoU 행렬
+
+        Args:
+            boxes_a (np.ndarray): (N, 4) [x1, y1, x2, y2]
+            boxes_b (np.ndarray): (M, 4) [x1, y1, x2, y2]
+
+        Returns:
+            np.ndarray: (N, M) IoU
+        """
+        a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 1, 4)
+        b = np.asarray(boxes_b, dtype=np.float32).reshape(1, -1, 4)
+        width = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+        height = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+        inter = width * height
+        area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+        area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+        return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+    def associate(self, faces: List[dict]) -> List[int]:
+        """
+        현재 프레임의 감지 결과를 트랙에 연결 (IoU가 큰 쌍부터, 연결되지 않은 얼굴은 새 트랙)
+
+        Args:
+            faces (List[dict]): FaceRecognizer.detect() 결과
+
+        Returns:
+            List[int]: 얼굴별 트랙 ID
+        """
+        self.frame_index += 1
+        track_ids = list(self.tracks)
+        assigned: List[Optional[int]] = [None] * len(faces)
+
+        if faces and track_ids:
+            overlaps = self.iou(
+                np.stack([face['bbox'] for face in faces]),
+                np.stack([self.tracks[track_id].bbox for track_id in track_ids])
+            )
+            used = set()
+            for flat in np.argsort(overlaps, axis=None)[::-1]:
+                face_idx, track_idx = divmod(int(flat), len(track_ids))
+                if overlaps[face_idx, track_idx] < self.iou_threshold:
+                    break
+                if assigned[face_idx] is None and track_idx not in used:
+                    assigned[face_idx] = track_ids[track_idx]
+                    used.add(track_idx)
+
+        for face_idx, face in enumerate(faces):
+            if assigned[face_idx] is None:
+                assigned[face_idx] = self._next_id
+                self.tracks[self._next_id] = Track(bbox=face['bbox'])
+                self._next_id += 1
+            track = self.tracks[assigned[face_idx]]
+            track.bbox = face['bbox']
+            track.last_seen = self.frame_index
+
+        # 오래 감지되지 않은 트랙 정리
+        for track_id in [tid for tid, track in self.tracks.items()
+                         if self.frame_index - track.last_seen >= self.max_missed]:
+            del self.tracks[track_id]
+
+        return assigned
+
+    def pending(self, track_ids: List[int]) -> List[int]:
+        """
+        임베딩이 필요한 얼굴 위치 (새 트랙, 미확인 트랙, 재인식 주기가 지난 트랙)
+
+        Args:
+            track_ids (List[int]): associate() 결과
+
+        Returns:
+            List[int]: track_ids 내 위치 목록
+        """
+        return [
+            i for i, track_id in enumerate(track_ids)
+            if self.tracks[track_id].match is None
+            or self.frame_index - self.tracks[track_id].embedded_at >= self.reembed_interval
+        ]
+
+    def resolve(self, track_id: int, match: Optional[Tuple[str, float]]) -> None:
+        """
+        트랙의 인식 결과 갱신
+
+        Args:
+            track_id (int): 트랙 ID
+            match (Optional[Tuple[str, float]]): 인식 결과 (미등록이면 None)
+        """
+        track = self.tracks[track_id]
+        track.match = match
+        track.embedded_at = self.frame_index
+
+    def match_of(self, track_id: int) -> Optional[Tuple[str, float]]:
+        """트랙의 마지막 인식 결과"""
+        return self.tracks[track_id].match
@@ -0,0 +1,408 @@
+"""
+ONNX Runtime 실행 설정 모듈
+
+모델(태스크)별 SessionOptions(스레드 수, 그래프 최적화, 메모리 아레나, 실행 모드),
+프로세스 CPU 친화도, 최적화된 그래프의 디스크 캐시를 관리하고
+InsightFace 모델 객체를 직접 생성합니다 (model_zoo.get_model은 SessionOptions를 전달하지 않음).
+
+설정 파일 (JSON, 환경 변수 FACE_ENGINE_CONFIG로 지정):
+    {
+        "default": {"intra_op_threads": 4, "inter_op_threads": 1, "allow_spinning": false},
+        "models": {"detection": {"intra_op_threads": 2}},
+        "cpu_affinity": [0, 1, 2, 3],
+        "cache_dir": "~/.insightface/optimized"
+    }
+"""
+
+import os
+import json
+import time
+import hashlib
+import platform
+import threading
+import onnxruntime
+from dataclasses import dataclass, asdict, fields, replace
+from typing import Dict, Iterable, List, Optional
+
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    'disabled': onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    'basic': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    'extended': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    'all': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    'sequential': onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+    'parallel': onnxruntime.ExecutionMode.ORT_PARALLEL,
+}
+
+ENGINE_CONFIG_ENV = 'FACE_ENGINE_CONFIG'
+CACHE_DIR_NAME = '.optimized'  # cache_dir 미지정 시 모델 폴더 아래 캐시 폴더
+
+QUANTIZATION_MODES = ('dynamic', 'static')
+QUANTIZED_DIR_NAME = 'int8'  # 모델 폴더 아래 INT8 모델 폴더 (quantize_models.py가 생성)
+
+
+@dataclass(frozen=True)
+class SessionConfig:
+    """
+    세션 1개의 실행 설정 (0은 ONNX Runtime 기본값)
+
+    Attributes:
+        intra_op_threads (int): 연산 내부 병렬 스레드 수
+        inter_op_threads (int): 연산 간 병렬 스레드 수 (parallel 모드에서만 사용)
+        graph_optimization (str): 그래프 최적화 수준 ('disabled', 'basic', 'extended', 'all')
+        execution_mode (str): 실행 모드 ('sequential', 'parallel')
+        enable_mem_arena (bool): CPU 메모리 아레나 사용 여부
+        enable_mem_pattern (bool): 메모리 패턴 최적화 사용 여부
+        allow_spinning (bool): 작업 대기 중 스레드 스핀 여부 (코어를 공유하는 서버에서는 False 권장)
+    """
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    graph_optimization: str = 'all'
+    execution_mode: str = 'sequential'
+    enable_mem_arena: bool = True
+    enable_mem_pattern: bool = True
+    allow_spinning: bool = True
+
+    def __post_init__(self):
+        if self.graph_optimization not in GRAPH_OPTIMIZATION_LEVELS:
+            raise ValueError(
+                f"지원하지 않는 그래프 최적화 수준: {self.graph_optimization} "
+                f"(가능: {', '.join(GRAPH_OPTIMIZATION_LEVELS)})"
+            )
+        if self.execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"지원하지 않는 실행 모드: {self.execution_mode} (가능: {', '.join(EXECUTION_MODES)})"
+            )
+        if self.intra_op_threads < 0 or self.inter_op_threads < 0:
+            raise ValueError("스레드 수는 0 이상이어야 합니다")
+
+    @classmethod
+    def from_dict(cls, data: Dict, base: Optional['SessionConfig'] = None) -> 'SessionConfig':
+        """
+        딕셔너리에서 설정 생성
+
+        Args:
+            data (Dict): 설정 값 (일부만 지정 가능)
+            base (Optional[SessionConfig]): 지정하지 않은 값의 기준 설정 (None이면 기본값)
+
+        Returns:
+            SessionConfig: 세션 설정
+        """
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"알 수 없는 세션 설정: {', '.join(sorted(unknown))}")
+        return replace(base or cls(), **data)
+
+
+class InferenceEngine:
+    """
+    ONNX Runtime 세션 생성기
+
+    Attributes:
+        default (SessionConfig): 기본 세션 설정
+        models (Dict[str, SessionConfig]): 태스크 이름별 세션 설정 (detection, recognition 등)
+        cpu_affinity (Optional[List[int]]): 프로세스를 고정할 CPU 번호 (None이면 고정하지 않음)
+        cache_dir (Optional[str]): 최적화 그래프 캐시 폴더 (None이면 모델 폴더 아래 .optimized)
+        cache_enabled (bool): 최적화 그래프 캐시 사용 여부
+        sessions (Dict[str, Dict]): ONNX 파일 이름별 로드 기록
+    """
+
+    def __init__(
+        self,
+        default: Optional[SessionConfig] = None,
+        models: Optional[Dict[str, SessionConfig]] = None,
+        cpu_affinity: Optional[Iterable[int]] = None,
+        cache_dir: Optional[str] = None,
+        cache_enabled: bool = True
+    ):
+        """
+        Args:
+            default (Optional[SessionConfig]): 기본 세션 설정 (None이면 ONNX Runtime 기본값)
+            models (Optional[Dict[str, SessionConfig]]): 태스크 이름별 세션 설정
+            cpu_affinity (Optional[Iterable[int]]): 프로세스를 고정할 CPU 번호
+            cache_dir (Optional[str]): 최적화 그래프 캐시 폴더
+            cache_enabled (bool): 최적화 그래프 캐시 사용 여부
+        """
+        self.default = default or SessionConfig()
+        self.models = dict(models or {})
+        self.cpu_affinity = sorted(set(cpu_affinity)) if cpu_affinity is not None else None
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.cache_enabled = cache_enabled
+        self.sessions: Dict[str, Dict] = {}
+        self._affinity_applied = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'InferenceEngine':
+        """
+        딕셔너리에서 엔진 생성 (모델별 설정은 default 위에 덮어씀)
+
+        Args:
+            data (Dict): default, models, cpu_affinity, cache_dir, cache_enabled
+
+        Returns:
+            InferenceEngine: 엔진
+        """
+        unknown = set(data) - {'default', 'models', 'cpu_affinity', 'cache_dir', 'cache_enabled'}
+        if unknown:
+            raise ValueError(f"알 수 없는 엔진 설정: {', '.join(sorted(unknown))}")
+
+        default = SessionConfig.from_dict(data.get('default') or {})
+        models = {
+            taskname: SessionConfig.from_dict(override or {}, base=default)
+            for taskname, override in (data.get('models') or {}).items()
+        }
+        return cls(
+            default=default,
+            models=models,
+            cpu_affinity=data.get('cpu_affinity'),
+            cache_dir=data.get('cache_dir'),
+            cache_enabled=data.get('cache_enabled', True)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'InferenceEngine':
+        """JSON 설정 파일에서 엔진 생성"""
+        with open(os.path.expanduser(path), 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_env(cls) -> 'InferenceEngine':
+        """환경 변수 FACE_ENGINE_CONFIG의 설정 파일로 엔진 생성 (없으면 기본 설정)"""
+        path = os.environ.get(ENGINE_CONFIG_ENV)
+        if path:
+            print(f"추론 엔진 설정 로드: {path}")
+            return cls.load(path)
+        return cls()
+
+    def session_config(self, taskname: Optional[str]) -> SessionConfig:
+        """태스크 이름의 세션 설정 (지정되지 않았으면 기본 설정)"""
+        return self.models.get(taskname, self.default) if taskname else self.default
+
+    def apply_cpu_affinity(self) -> None:
+        """프로세스 CPU 친화도 적용 (Linux에서만 지원, 한 번만 적용)"""
+        if self.cpu_affinity is None or self._affinity_applied:
+            return
+        if not hasattr(os, 'sched_setaffinity'):
+            print("CPU 친화도는 이 플랫폼에서 지원되지 않아 무시합니다.")
+            return
+        os.sched_setaffinity(0, self.cpu_affinity)
+        self._affinity_applied = True
+        print(f"CPU 친화도 적용: {self.cpu_affinity}")
+
+    def session_options(self, config: SessionConfig) -> onnxruntime.SessionOptions:
+        """
+        세션 설정을 SessionOptions로 변환
+
+        CPU 친화도를 지정하고 intra_op_threads가 0이면 고정한 CPU 수만큼 스레드를 사용
+        (ONNX Runtime 기본값은 머신의 전체 코어 수라 다른 프로세스와 겹침)
+
+        Args:
+            config (SessionConfig): 세션 설정
+
+        Returns:
+            onnxruntime.SessionOptions: 세션 옵션
+        """
+        options = onnxruntime.SessionOptions()
+        intra_op_threads = config.intra_op_threads
+        if intra_op_threads == 0 and self.cpu_affinity:
+            intra_op_threads = len(self.cpu_affinity)
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = config.inter_op_threads
+        options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[config.graph_optimization]
+        options.execution_mode = EXECUTION_MODES[config.execution_mode]
+        options.enable_cpu_mem_arena = config.enable_mem_arena
+        options.enable_mem_pattern = config.enable_mem_pattern
+        if not config.allow_spinning:
+            options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+            options.add_session_config_entry('session.inter_op.allow_spinning', '0')
+        options.log_severity_level = 3
+        return options
+
+    def _cache_path(self, onnx_file: str, config: SessionConfig, providers: List[str]) -> Optional[str]:
+        """
+        최적화 그래프 캐시 파일 경로
+
+        최적화된 그래프는 실행 제공자와 하드웨어에 종속되므로 CPU 전용 세션만 캐시하며,
+        원본 파일·ONNX Runtime 버전·최적화 수준·머신이 바뀌면 다른 키가 됩니다.
+        """
+        if not self.cache_enabled or config.graph_optimization == 'disabled':
+            return None
+        if list(providers) != ['CPUExecutionProvider']:
+            return None
+
+        stat = os.stat(onnx_file)
+        key = '|'.join([
+            os.path.abspath(onnx_file), str(stat.st_size), str(stat.st_mtime_ns),
+            onnxruntime.__version__, config.graph_optimization, platform.machine()
+        ])
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        cache_dir = self.cache_dir or os.path.join(os.path.dirname(onnx_file), CACHE_DIR_NAME)
+        name = os.path.splitext(os.path.basename(onnx_file))[0]
+        return os.path.join(cache_dir, f"{name}.{digest}.onnx")
+
+    def create_session(
+        self,
+        onnx_file: str,
+        providers: List[str],
+        taskname: Optional[str] = None,
+        session_file: Optional[str] = None
+    ) -> onnxruntime.InferenceSession:
+        """
+        세션 생성 (캐시된 최적화 그래프가 있으면 추가 최적화 없이 로드)
+
+        Args:
+            onnx_file (str): ONNX 모델 파일
+            providers (List[str]): 실행 제공자 목록
+            taskname (Optional[str]): 태스크 이름 (모델별 설정 선택, 모르면 None)
+            session_file (Optional[str]): onnx_file 대신 세션을 만들 파일 (INT8 모델 등)
+
+        Returns:
+            onnxruntime.InferenceSession: 세션
+        """
+        self.apply_cpu_affinity()
+        config = self.session_config(taskname)
+        options = self.session_options(config)
+        session_file = session_file or onnx_file
+        cache_path = self._cache_path(session_file, config, providers)
+        cache = 'off'
+        start = time.perf_counter()
+
+        session = None
+        if cache_path and os.path.exists(cache_path):
+            options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS['disabled']
+            try:
+                session = onnxruntime.InferenceSession(cache_path, sess_options=options, providers=providers)
+                cache = 'hit'
+            except Exception as e:
+                print(f"최적화 그래프 캐시 로드 실패, 원본 모델 사용: {cache_path} ({e})")
+                options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[config.graph_optimization]
+
+        if session is None:
+            temp_path = None
+            if cache_path:
+                try:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                    options.optimized_model_filepath = temp_path
+                except OSError:
+                    temp_path = None  # 캐시 폴더에 쓸 수 없으면 캐시 없이 로드
+            session = onnxruntime.InferenceSession(session_file, sess_options=options, providers=providers)
+            if temp_path and os.path.exists(temp_path):
+                os.replace(temp_path, cache_path)
+                cache = 'miss'
+
+        with self._lock:
+            self.sessions[os.path.basename(onnx_file)] = {
+                'taskname': taskname,
+                'file': os.path.basename(session_file),
+                'load_seconds': round(time.perf_counter() - start, 4),
+                'cache': cache,
+                'providers': session.get_providers(),
+                'config': asdict(config),
+            }
+        return session
+
+    def load_model(
+        self,
+        onnx_file: str,
+        providers: List[str],
+        taskname: Optional[str] = None,
+        session_file: Optional[str] = None
+    ):
+        """
+        InsightFace 모델 객체 생성 (model_zoo.ModelRouter와 같은 규칙으로 모델 종류 판별)
+
+        태스크 이름을 모르고 로드한 뒤 판별된 태스크에 별도 설정이 있으면 그 설정으로 다시 로드
+
+        Args:
+            onnx_file (str): ONNX 모델 파일
+            providers (List[str]): 실행 제공자 목록
+            taskname (Optional[str]): 이전에 판별된 태스크 이름 (모르면 None)
+            session_file (Optional[str]): onnx_file 대신 세션을 만들 파일 (INT8 모델 등)
+
+        Returns:
+            InsightFace 모델 객체 (판별할 수 없으면 None)
+        """
+        session = self.create_session(onnx_file, providers, taskname, session_file)
+        model = route_model(onnx_file, session)
+        actual = getattr(model, 'taskname', None)
+        if actual is not None and actual != taskname and self.session_config(actual) != self.session_config(taskname):
+            del model, session
+            model = route_model(onnx_file, self.create_session(onnx_file, providers, actual, session_file))
+        return model
+
+    def describe(self) -> Dict:
+        """
+        엔진 설정과 세션 로드 기록 (get_model_info()용)
+
+        Returns:
+            Dict: 기본/모델별 설정, CPU 친화도, 캐시 폴더, 세션별 로드 시간과 캐시 사용 여부
+        """
+        with self._lock:
+            sessions = {name: dict(record) for name, record in self.sessions.items()}
+        return {
+            'default': asdict(self.default),
+            'models': {taskname: asdict(config) for taskname, config in self.models.items()},
+            'cpu_affinity': self.cpu_affinity,
+            'cache_enabled': self.cache_enabled,
+            'cache_dir': self.cache_dir,
+            'ort_version': onnxruntime.__version__,
+            'sessions': sessions,
+        }
+
+
+def quantized_model_path(onnx_file: str, mode: str) -> str:
+    """
+    ONNX 모델의 INT8 버전 경로 (모델 폴더/int8/<이름>.<mode>.onnx)
+
+    Args:
+        onnx_file (str): 원본(FP32) ONNX 모델 파일
+        mode (str): 양자화 방식 ('dynamic' 또는 'static')
+
+    Returns:
+        str: INT8 모델 경로
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"지원하지 않는 양자화 방식: {mode} (가능: {', '.join(QUANTIZATION_MODES)})")
+    name = os.path.splitext(os.path.basename(onnx_file))[0]
+    return os.path.join(os.path.dirname(onnx_file), QUANTIZED_DIR_NAME, f"{name}.{mode}.onnx")
+
+
+def route_model(onnx_file: str, session: onnxruntime.InferenceSession):
+    """
+    세션의 입출력 형태로 InsightFace 모델 클래스 선택 (insightface.model_zoo.ModelRouter와 동일)
+
+    model_file은 원본 파일을 유지 (ArcFace/Landmark/Attribute가 원본에서 정규화 값을 읽음)
+
+    Args:
+        onnx_file (str): 원본 ONNX 모델 파일
+        session (onnxruntime.InferenceSession): 생성된 세션
+
+    Returns:
+        InsightFace 모델 객체 (판별할 수 없으면 None)
+    """
+    from insightface.model_zoo.arcface_onnx import ArcFaceONNX
+    from insightface.model_zoo.retinaface import RetinaFace
+    from insightface.model_zoo.landmark import Landmark
+    from insightface.model_zoo.attribute import Attribute
+    from insightface.model_zoo.inswapper import INSwapper
+
+    inputs = session.get_inputs()
+    input_shape = inputs[0].shape
+    outputs = session.get_outputs()
+
+    if len(outputs) >= 5:
+        return RetinaFace(model_file=onnx_file, session=session)
+    elif input_shape[2] == 192 and input_shape[3] == 192:
+        return Landmark(model_file=onnx_file, session=session)
+    elif input_shape[2] == 96 and input_shape[3] == 96:
+        return Attribute(model_file=onnx_file, session=session)
+    elif len(inputs) == 2 and input_shape[2] == 128 and input_shape[3] == 128:
+        return INSwapper(model_file=onnx_file, session=session)
+    elif input_shape[2] == input_shape[3] and input_shape[2] >= 112 and input_shape[2] % 16 == 0:
+        return ArcFaceONNX(model_file=onnx_file, session=session)
+    return None
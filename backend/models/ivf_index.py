@@ -0,0 +1,477 @@
+"""
+IVF 근사 최근접 이웃 인덱스 모듈
+
+k-means 중심점(coarse quantizer)으로 갤러리를 클러스터로 나누고,
+쿼리와 가까운 일부 클러스터만 탐색하여 대규모 갤러리에서도 실시간 검색
+"""
+
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from models.embedding_index import EmbeddingIndex
+
+
+@dataclass(frozen=True)
+class IVFSnapshot:
+    """IVF 인덱스의 불변 스냅샷 (쓰기 시 새 버전으로 교체)"""
+    centroids: Optional[np.ndarray]  # (nlist, D) 중심점 (학습 전 None)
+    list_vectors: Tuple[np.ndarray, ...]  # 리스트별 (n_i, D) 벡터
+    list_labels: Tuple[np.ndarray, ...]  # 리스트별 라벨
+    face_ids: List[str]  # 라벨 → face_id (append-only)
+    num_rows: int
+
+
+class IVFIndex(EmbeddingIndex):
+    """
+    IVF (Inverted File) 근사 검색 인덱스
+
+    학습 전(샘플 수 < min_train_size)에는 단일 리스트를 전수 탐색하는 정확한 검색으로
+    동작하고, 샘플이 충분히 쌓이면 k-means로 중심점을 학습하여 근사 검색으로 전환합니다.
+
+    Attributes:
+        dim (int): 임베딩 차원
+        nlist (Optional[int]): 클러스터 수 (None이면 샘플 수에 따라 자동 결정)
+        nprobe (int): 쿼리당 탐색할 클러스터 수 (클수록 정확, 느림)
+        min_train_size (int): 학습을 시작할 최소 샘플 수
+    """
+
+    def __init__(
+        self,
+        dim: int = 512,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        min_train_size: int = 10000,
+        kmeans_iters: int = 10,
+        seed: int = 0
+    ):
+        """
+        IVF 인덱스 초기화
+
+        Args:
+            dim (int): 임베딩 차원
+            nlist (Optional[int]): 클러스터 수 (None이면 약 4·√N)
+            nprobe (int): 쿼리당 탐색할 클러스터 수 (recall/latency 조절)
+            min_train_size (int): 학습을 시작할 최소 샘플 수 (그 전에는 전수 탐색)
+            kmeans_iters (int): k-means 반복 횟수
+            seed (int): 난수 시드
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.kmeans_iters = kmeans_iters
+        self._rng = np.random.default_rng(seed)
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        super().__init__(dim)
+
+    @property
+    def is_trained(self) -> bool:
+        """중심점 학습 여부"""
+        return self._centroids is not None
+
+    def clear(self) -> None:
+        """인덱스 데이터 초기화 (학습된 중심점은 유지)"""
+        self._face_ids: List[str] = []
+        self._label_of: Dict[str, int] = {}
+        self._lists_of: Dict[int, Set[int]] = {}  # 라벨 → 샘플이 속한 리스트 (쓰기 전용)
+        num_lists = len(self._centroids) if self.is_trained else 1
+        self._publish_lists(
+            [np.empty((0, self.dim), dtype=np.float32) for _ in range(num_lists)],
+            [np.empty(0, dtype=np.int64) for _ in range(num_lists)]
+        )
+
+    def _publish_lists(
+        self,
+        list_vectors: List[np.ndarray],
+        list_labels: List[np.ndarray]
+    ) -> None:
+        """새 스냅샷 게시 (변경된 리스트만 새 배열이고 나머지는 이전 스냅샷과 공유)"""
+        for array in (*list_vectors, *list_labels):
+            array.flags.writeable = False
+        self._snapshot = IVFSnapshot(
+            centroids=self._centroids,
+            list_vectors=tuple(list_vectors),
+            list_labels=tuple(list_labels),
+            face_ids=self._face_ids,
+            num_rows=sum(len(labels) for labels in list_labels),
+        )
+
+    def build_arrays(self, face_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        행별 face_id 목록과 (N, D) 임베딩 행렬로 인덱스 전체 재구성
+
+        이미 학습된 중심점이 있으면 재학습 없이 할당만 다시 수행합니다.
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            vectors (np.ndarray): (N, D) 임베딩
+        """
+        if len(face_ids) == 0:
+            self.clear()
+            return
+
+        labels = self._new_labels(face_ids)
+        vectors = self.normalize(vectors)
+
+        if not self.is_trained and len(vectors) >= max(self.min_train_size, 1):
+            self._train(vectors)
+
+        self._assign_all(vectors, labels)
+
+    def add_many(self, face_ids: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        여러 얼굴의 샘플을 한 번에 추가 (리스트별로 한 번만 이어 붙이고 스냅샷 한 번 게시)
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            embeddings (np.ndarray): (N, D) 임베딩
+        """
+        if len(face_ids) == 0:
+            return
+
+        snapshot = self._snapshot
+        labels = np.fromiter(
+            (self._get_or_create_label(face_id) for face_id in face_ids),
+            dtype=np.int64, count=len(face_ids)
+        )
+        self._insert(self.normalize(embeddings), labels,
+                     list(snapshot.list_vectors), list(snapshot.list_labels))
+
+    def _update(self, face_id: str, rows: np.ndarray, replace: bool) -> None:
+        """샘플 추가/교체 (가장 가까운 클러스터에 증분 삽입) 후 새 스냅샷 게시"""
+        snapshot = self._snapshot
+        list_vectors = list(snapshot.list_vectors)
+        list_labels = list(snapshot.list_labels)
+
+        label = self._label_of.get(face_id)
+        if replace and label is not None:
+            self._delete_label(label, list_vectors, list_labels)
+        label = self._get_or_create_label(face_id)
+
+        self._insert(rows, np.full(len(rows), label, dtype=np.int64), list_vectors, list_labels)
+
+    def _insert(
+        self,
+        rows: np.ndarray,
+        labels: np.ndarray,
+        list_vectors: List[np.ndarray],
+        list_labels: List[np.ndarray]
+    ) -> None:
+        """정규화된 행을 가장 가까운 리스트에 삽입 (필요하면 재학습) 후 새 스냅샷 게시"""
+        new_size = sum(len(list_label) for list_label in list_labels) + len(rows)
+
+        # 학습 기준에 도달했거나 학습 이후 갤러리가 크게 늘어나면 (재)학습
+        needs_training = (
+            (not self.is_trained and new_size >= max(self.min_train_size, 1))
+            or (self.is_trained and new_size > 4 * self._trained_size)
+        )
+        if needs_training:
+            vectors = np.vstack(list_vectors + [rows])
+            all_labels = np.concatenate(list_labels + [labels])
+            self._train(vectors)
+            self._assign_all(vectors, all_labels)
+            return
+
+        assignments = self._nearest_lists(rows)
+        for list_id in np.unique(assignments):
+            mask = assignments == list_id
+            list_vectors[list_id] = np.vstack([list_vectors[list_id], rows[mask]])
+            list_labels[list_id] = np.concatenate([list_labels[list_id], labels[mask]])
+            for label in np.unique(labels[mask]).tolist():
+                self._lists_of.setdefault(label, set()).add(int(list_id))
+
+        self._publish_lists(list_vectors, list_labels)
+
+    def remove(self, face_id: str) -> int:
+        """
+        얼굴의 모든 샘플 삭제 (샘플이 속한 리스트만 갱신)
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        label = self._label_of.pop(face_id, None)
+        if label is None:
+            return 0
+
+        snapshot = self._snapshot
+        list_vectors = list(snapshot.list_vectors)
+        list_labels = list(snapshot.list_labels)
+        removed = self._delete_label(label, list_vectors, list_labels)
+        self._publish_lists(list_vectors, list_labels)
+        return removed
+
+    def _delete_label(
+        self,
+        label: int,
+        list_vectors: List[np.ndarray],
+        list_labels: List[np.ndarray]
+    ) -> int:
+        """작업용 리스트 사본에서 라벨의 샘플 제거"""
+        removed = 0
+        for list_id in self._lists_of.pop(label, set()):
+            keep = list_labels[list_id] != label
+            removed += int(len(keep) - np.count_nonzero(keep))
+            list_vectors[list_id] = list_vectors[list_id][keep]
+            list_labels[list_id] = list_labels[list_id][keep]
+        return removed
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리를 한꺼번에 검색 (쿼리별로 가까운 nprobe개 클러스터만 탐색)
+
+        Args:
+            embeddings (np.ndarray): (N, D) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): 가까운 클러스터부터 확인하여 min_score 이상인 첫 매칭에서 중단
+
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트
+        """
+        queries = self.normalize(embeddings)
+        snapshot = self._snapshot
+
+        if snapshot.num_rows == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        # 학습 전: 단일 리스트 전수 탐색 (정확한 검색)
+        if snapshot.centroids is None:
+            vectors, labels = snapshot.list_vectors[0], snapshot.list_labels[0]
+            if early_exit:
+                return [
+                    self._first_above(
+                        self._list_blocks(vectors, labels, query), snapshot.face_ids, min_score
+                    )
+                    for query in queries
+                ]
+            scores = queries @ vectors.T
+            return [
+                self._pool_top_k(row_scores, labels, snapshot.face_ids, top_k, min_score)
+                for row_scores in scores
+            ]
+
+        centroids = snapshot.centroids
+        nprobe = max(1, min(self.nprobe, len(centroids)))
+        centroid_scores = queries @ centroids.T
+        if nprobe < len(centroids):
+            probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.tile(np.arange(len(centroids)), (len(queries), 1))
+
+        results = []
+        for query, list_ids, query_centroid_scores in zip(queries, probes, centroid_scores):
+            if early_exit:
+                # 중심점이 가까운 클러스터부터 확인
+                list_ids = list_ids[np.argsort(-query_centroid_scores[list_ids])]
+                blocks = (
+                    (snapshot.list_vectors[i] @ query, snapshot.list_labels[i]) for i in list_ids
+                )
+                results.append(self._first_above(blocks, snapshot.face_ids, min_score))
+                continue
+
+            scores = np.concatenate([snapshot.list_vectors[i] @ query for i in list_ids])
+            labels = np.concatenate([snapshot.list_labels[i] for i in list_ids])
+            results.append(
+                self._pool_top_k(scores, labels, snapshot.face_ids, top_k, min_score)
+            )
+
+        return results
+
+    def _list_blocks(
+        self,
+        vectors: np.ndarray,
+        labels: np.ndarray,
+        query: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """리스트 하나를 블록 단위 (점수, 라벨)로 생성"""
+        for start in range(0, len(labels), self.EARLY_EXIT_BLOCK):
+            end = start + self.EARLY_EXIT_BLOCK
+            yield vectors[start:end] @ query, labels[start:end]
+
+    def save(self, path: str) -> bool:
+        """
+        인덱스를 단일 .npz 파일로 저장 (임시 파일 작성 후 원자적 교체)
+
+        Args:
+            path (str): 저장 경로
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            snapshot = self._snapshot
+            vectors, labels = self._collect()
+            list_sizes = np.array([len(l) for l in snapshot.list_labels], dtype=np.int64)
+            centroids = (
+                snapshot.centroids if snapshot.centroids is not None
+                else np.empty((0, self.dim), dtype=np.float32)
+            )
+
+            # 삭제된 얼굴의 라벨은 빈 문자열로 기록 (로드 시 라벨 테이블에서 제외)
+            live_labels = set(self._label_of.values())
+            face_ids = [
+                fid if label in live_labels else ''
+                for label, fid in enumerate(snapshot.face_ids)
+            ]
+
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    centroids=centroids,
+                    vectors=vectors,
+                    labels=labels,
+                    list_sizes=list_sizes,
+                    face_ids=np.array(face_ids, dtype=str),
+                    trained_size=np.int64(self._trained_size),
+                )
+            os.replace(tmp_path, path)
+            return True
+
+        except Exception as e:
+            print(f"IVF 인덱스 저장 실패: {str(e)}")
+            return False
+
+    def load(self, path: str) -> bool:
+        """
+        .npz 파일에서 인덱스 복원
+
+        Args:
+            path (str): 인덱스 파일 경로
+
+        Returns:
+            bool: 로드 성공 여부
+        """
+        try:
+            with np.load(path) as data:
+                centroids = data['centroids']
+                vectors = data['vectors']
+                labels = data['labels']
+                list_sizes = data['list_sizes']
+                face_ids = [str(fid) for fid in data['face_ids']]
+                trained_size = int(data['trained_size'])
+
+            if vectors.shape[1:] != (self.dim,):
+                print(f"IVF 인덱스 차원 불일치: {vectors.shape[1:]} != ({self.dim},)")
+                return False
+
+            self._centroids = centroids.astype(np.float32) if len(centroids) else None
+            self._trained_size = trained_size
+            self._face_ids = face_ids
+            self._label_of = {fid: label for label, fid in enumerate(face_ids) if fid}
+
+            offsets = np.concatenate([[0], np.cumsum(list_sizes)])
+            list_vectors = [
+                vectors[offsets[i]:offsets[i + 1]].astype(np.float32)
+                for i in range(len(list_sizes))
+            ]
+            list_labels = [
+                labels[offsets[i]:offsets[i + 1]].astype(np.int64)
+                for i in range(len(list_sizes))
+            ]
+            self._lists_of = {}
+            for list_id, labels_in_list in enumerate(list_labels):
+                for label in np.unique(labels_in_list):
+                    self._lists_of.setdefault(int(label), set()).add(list_id)
+            self._publish_lists(list_vectors, list_labels)
+            return True
+
+        except Exception as e:
+            print(f"IVF 인덱스 로드 실패: {str(e)}")
+            return False
+
+    def _collect(self) -> Tuple[np.ndarray, np.ndarray]:
+        """모든 리스트의 벡터와 라벨을 하나로 합쳐 반환"""
+        snapshot = self._snapshot
+        return np.vstack(snapshot.list_vectors), np.concatenate(snapshot.list_labels)
+
+    def _train(self, vectors: np.ndarray) -> None:
+        """구면(spherical) k-means로 중심점 학습"""
+        num_vectors = len(vectors)
+        nlist = self.nlist or int(np.clip(4 * np.sqrt(num_vectors), 16, 65536))
+        nlist = max(1, min(nlist, num_vectors))
+
+        # 학습 샘플은 클러스터당 최대 64개로 제한
+        sample_size = min(num_vectors, nlist * 64)
+        sample = vectors[self._rng.choice(num_vectors, sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(self.kmeans_iters):
+            assignments = self._nearest(sample, centroids)
+            order = np.argsort(assignments, kind='stable')
+            counts = np.bincount(assignments, minlength=nlist)
+            nonempty = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts)])[nonempty]
+            centroids[nonempty] = np.add.reduceat(sample[order], starts, axis=0)
+
+            # 빈 클러스터는 임의의 샘플로 재초기화
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = sample[self._rng.choice(sample_size, len(empty))]
+
+            centroids = self.normalize(centroids)
+
+        self._centroids = centroids
+        self._trained_size = num_vectors
+        print(f"IVF 인덱스 학습 완료: {num_vectors}개 샘플, {nlist}개 클러스터")
+
+    def _assign_all(self, vectors: np.ndarray, labels: np.ndarray) -> None:
+        """모든 벡터를 가장 가까운 리스트에 다시 할당"""
+        assignments = self._nearest_lists(vectors)
+        num_lists = len(self._centroids) if self.is_trained else 1
+        order = np.argsort(assignments, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=num_lists))])
+
+        list_vectors = []
+        list_labels = []
+        self._lists_of = {}
+        for list_id in range(num_lists):
+            rows = order[bounds[list_id]:bounds[list_id + 1]]
+            list_vectors.append(vectors[rows])
+            list_labels.append(labels[rows])
+            for label in np.unique(labels[rows]):
+                self._lists_of.setdefault(int(label), set()).add(list_id)
+
+        self._publish_lists(list_vectors, list_labels)
+
+    def _nearest_lists(self, vectors: np.ndarray) -> np.ndarray:
+        """벡터별 할당 리스트 번호 (학습 전에는 모두 0번)"""
+        if not self.is_trained:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return self._nearest(vectors, self._centroids)
+
+    @staticmethod
+    def _nearest(
+        vectors: np.ndarray,
+        centroids: np.ndarray,
+        chunk_size: int = 4096
+    ) -> np.ndarray:
+        """가장 가까운 중심점 번호 (메모리 제한을 위해 청크 단위 계산)"""
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            assignments[start:start + chunk_size] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignments
+
+    def __len__(self) -> int:
+        """인덱스 행(샘플) 수"""
+        return self._snapshot.num_rows
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        num_lists = len(self._centroids) if self.is_trained else 0
+        return (
+            f"IVFIndex(faces={self.num_faces}, samples={len(self)}, "
+            f"nlist={num_lists}, nprobe={self.nprobe})"
+        )
@@ -0,0 +1,96 @@
+"""
+InsightFace 모델 팩 목록
+
+배포 등급별로 고를 수 있는 buffalo 모델 팩과 각 팩의 감지/인식 모델을 정의하고,
+데이터베이스 임베딩과 인식 모델의 호환 여부(같은 인식 모델인지)를 판단합니다.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+DEFAULT_MODEL = 'buffalo_l'
+MODEL_ROOT = '~/.insightface'
+
+# InsightFace 0.2.x는 모델 팩 이름 체계가 달라 순서대로 시도 ('' = 패키지 기본 모델)
+LEGACY_MODELS = ('', 'antelopev2', 'retinaface_r50_v1')
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """
+    모델 팩 1개
+
+    Attributes:
+        name (str): 모델 팩 이름
+        detection (str): 감지 모델 파일
+        recognition (str): 인식 모델 파일 (같은 인식 모델끼리는 임베딩이 호환됨)
+        tier (str): 권장 배포 등급
+        description (str): 설명
+    """
+    name: str
+    detection: str
+    recognition: str
+    tier: str
+    description: str
+
+
+MODEL_ZOO = {
+    'buffalo_l': ModelSpec('buffalo_l', 'det_10g.onnx', 'w600k_r50.onnx', 'server',
+                           'ResNet-50 인식 + 10GF 감지 (최고 정확도)'),
+    'buffalo_m': ModelSpec('buffalo_m', 'det_2.5g.onnx', 'w600k_r50.onnx', 'gpu-edge',
+                           'ResNet-50 인식 + 2.5GF 감지 (buffalo_l과 임베딩 호환)'),
+    'buffalo_s': ModelSpec('buffalo_s', 'det_500m.onnx', 'w600k_mbf.onnx', 'cpu',
+                           'MobileFaceNet 인식 + 500MF 감지 (CPU 전용 노드)'),
+}
+
+
+def resolve_model_name(model_name: Optional[str] = None) -> str:
+    """모델 팩 이름 결정 (None이면 기본 모델)"""
+    return model_name or DEFAULT_MODEL
+
+
+def is_installed(model_name: str, root: str = MODEL_ROOT) -> bool:
+    """모델 팩이 로컬에 설치되어 있는지 확인 (ONNX 파일이 있는 폴더)"""
+    model_dir = os.path.join(os.path.expanduser(root), 'models', model_name)
+    return os.path.isdir(model_dir) and any(name.endswith('.onnx') for name in os.listdir(model_dir))
+
+
+def installed_models(root: str = MODEL_ROOT) -> List[str]:
+    """로컬에 설치된 모델 팩 이름 목록"""
+    models_dir = os.path.join(os.path.expanduser(root), 'models')
+    if not os.path.isdir(models_dir):
+        return []
+    return sorted(name for name in os.listdir(models_dir) if is_installed(name, root))
+
+
+def validate_model_name(model_name: str, root: str = MODEL_ROOT) -> None:
+    """
+    사용할 수 있는 모델 팩인지 확인 (MODEL_ZOO는 없으면 내려받고, 그 외에는 로컬 설치 필요)
+
+    Raises:
+        ValueError: MODEL_ZOO에 없고 로컬에도 설치되지 않은 모델
+    """
+    if model_name in MODEL_ZOO or model_name in LEGACY_MODELS or is_installed(model_name, root):
+        return
+    available = sorted(set(MODEL_ZOO) | set(installed_models(root)))
+    raise ValueError(f"지원하지 않는 모델: {model_name} (가능: {', '.join(available)})")
+
+
+def embedding_model(model_name: str) -> str:
+    """
+    임베딩을 만드는 인식 모델 식별자
+
+    'default'는 모델 이름을 기록하기 전의 데이터베이스로, 당시 고정 모델인 buffalo_l로 간주합니다.
+    MODEL_ZOO에 없는 모델 팩은 팩 이름 자체를 식별자로 사용합니다.
+    """
+    if model_name == 'default':
+        model_name = DEFAULT_MODEL
+    spec = MODEL_ZOO.get(model_name)
+    return spec.recognition if spec else model_name
+
+
+def embeddings_compatible(model_a: str, model_b: str) -> bool:
+    """두 모델 팩의 임베딩을 같은 갤러리에서 비교할 수 있는지 (같은 인식 모델)"""
+    return embedding_model(model_a) == embedding_model(model_b)
@@ -0,0 +1,511 @@
+"""
+곱 양자화(PQ) 인덱스 모듈
+
+임베딩을 M개 부분 공간으로 나눠 부분 공간별 256개 코드북으로 인코딩(샘플당 약 M바이트)하고,
+쿼리마다 만든 룩업 테이블로 압축된 코드와 바로 유사도를 계산(ADC)하여
+메모리가 작은 출입 단말에서도 전체 갤러리를 오프라인으로 검색
+"""
+
+import os
+import json
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from models.embedding_index import EmbeddingIndex
+
+
+@dataclass(frozen=True)
+class PQSnapshot:
+    """PQ 인덱스의 불변 스냅샷"""
+    codebooks: Optional[np.ndarray]  # (M, K, D/M) 부분 공간별 코드북 (학습 전 None)
+    codes: np.ndarray  # (M, R) uint8 코드, 부분 공간별로 연속 (학습 후)
+    inv_norms: np.ndarray  # (R,) float16 복원 벡터 노름의 역수 (코사인 보정)
+    vectors: np.ndarray  # (R, D) 정규화된 float32 벡터 (학습 전에만 사용)
+    labels: np.ndarray  # 행 → 라벨
+    face_ids: List[str]  # 라벨 → face_id (append-only)
+
+
+class PQIndex(EmbeddingIndex):
+    """
+    곱 양자화(Product Quantization) 압축 인덱스
+
+    학습 전(샘플 수 < min_train_size)에는 float32 행렬로 정확히 검색하고,
+    샘플이 충분히 쌓이면 부분 공간별 k-means로 코드북을 학습한 뒤 모든 샘플을 코드로 바꾸고
+    float32 행렬은 버립니다. 이후 추가되는 샘플은 학습된 코드북으로 바로 인코딩합니다.
+
+    검색은 비대칭 거리 계산(ADC)으로 수행합니다. 쿼리는 압축하지 않고 부분 공간별로
+    코드북 중심점과의 내적 테이블 (M, K)을 만든 뒤, 각 행의 점수를 코드가 가리키는
+    테이블 값 M개의 합으로 계산합니다. 복원 벡터는 정규화된 원본보다 노름이 작아지므로
+    행별 복원 노름의 역수(float16)를 곱해 근사 코사인 유사도로 보정합니다 (샘플당 M + 2바이트).
+
+    Attributes:
+        dim (int): 임베딩 차원
+        num_subspaces (int): 부분 공간 수 M (샘플당 코드 바이트 수)
+        min_train_size (int): 코드북 학습을 시작할 최소 샘플 수
+    """
+
+    NUM_CENTROIDS = 256  # 부분 공간별 코드북 크기 (uint8 코드)
+
+    def __init__(
+        self,
+        dim: int = 512,
+        num_subspaces: int = 64,
+        min_train_size: int = 1024,
+        kmeans_iters: int = 10,
+        seed: int = 0
+    ):
+        """
+        PQ 인덱스 초기화
+
+        Args:
+            dim (int): 임베딩 차원
+            num_subspaces (int): 부분 공간 수 M (dim의 약수, 샘플당 M바이트)
+            min_train_size (int): 코드북 학습을 시작할 최소 샘플 수 (그 전에는 전수 탐색)
+            kmeans_iters (int): k-means 반복 횟수
+            seed (int): 난수 시드
+        """
+        if dim % num_subspaces != 0:
+            raise ValueError(f"dim({dim})은 num_subspaces({num_subspaces})로 나누어떨어져야 합니다.")
+
+        self.num_subspaces = num_subspaces
+        self.min_train_size = min_train_size
+        self.kmeans_iters = kmeans_iters
+        self._rng = np.random.default_rng(seed)
+        self._codebooks: Optional[np.ndarray] = None
+        super().__init__(dim)
+
+    @property
+    def is_trained(self) -> bool:
+        """코드북 학습 여부"""
+        return self._codebooks is not None
+
+    def clear(self) -> None:
+        """인덱스 데이터 초기화 (학습된 코드북은 유지)"""
+        self._face_ids: List[str] = []
+        self._label_of: Dict[str, int] = {}
+        self._publish(
+            self._empty_codes(),
+            np.empty((0, self.dim), dtype=np.float32),
+            np.empty(0, dtype=np.int64)
+        )
+
+    def _empty_codes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """빈 (코드, 역노름)"""
+        return np.empty((self.num_subspaces, 0), dtype=np.uint8), np.empty(0, dtype=np.float16)
+
+    def _publish(
+        self,
+        encoded: Tuple[np.ndarray, np.ndarray],
+        vectors: np.ndarray,
+        labels: np.ndarray
+    ) -> None:
+        """새 스냅샷 게시 (encoded: (M, R) 코드와 (R,) 역노름)"""
+        codes, inv_norms = encoded
+        for array in (codes, inv_norms, vectors, labels):
+            array.flags.writeable = False
+        self._snapshot = PQSnapshot(
+            codebooks=self._codebooks,
+            codes=codes,
+            inv_norms=inv_norms,
+            vectors=vectors,
+            labels=labels,
+            face_ids=self._face_ids,
+        )
+
+    def build_arrays(self, face_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        행별 face_id 목록과 (N, D) 임베딩 행렬로 인덱스 전체 재구성
+
+        이미 학습된 코드북이 있으면 재학습 없이 인코딩만 다시 수행합니다.
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            vectors (np.ndarray): (N, D) 임베딩
+        """
+        if len(face_ids) == 0:
+            self.clear()
+            return
+
+        labels = self._new_labels(face_ids)
+        self._store_rows(self.normalize(vectors), labels)
+
+    def build_rows(
+        self,
+        face_ids: List[str],
+        labels: np.ndarray,
+        read_rows: Callable[[np.ndarray], np.ndarray],
+        block_size: int = 65536
+    ) -> None:
+        """
+        행을 블록 단위로 읽어 인코딩하며 인덱스 전체 재구성
+
+        전체 갤러리의 float32 행렬을 만들지 않으므로 최대 메모리 사용량은
+        코드(행당 M + 2바이트)와 블록 1개 크기입니다. 학습이 필요하면 학습 샘플만 먼저 읽습니다.
+
+        Args:
+            face_ids (List[str]): 라벨 → face_id
+            labels (np.ndarray): 행별 라벨
+            read_rows (Callable[[np.ndarray], np.ndarray]): 행 위치 배열 → 정규화된 (n, D) 벡터
+            block_size (int): 한 번에 읽어 인코딩할 행 수
+        """
+        num_rows = len(labels)
+        if not self.is_trained and num_rows < max(self.min_train_size, 1):
+            # 학습 기준 미만: 작은 갤러리이므로 float32 그대로 (정확한 검색)
+            self.build_arrays(
+                [face_ids[label] for label in labels.tolist()], read_rows(np.arange(num_rows))
+            )
+            return
+
+        if not self.is_trained:
+            # 학습 샘플은 중심점당 최대 64개 (_train과 같은 기준)
+            sample_size = min(num_rows, self.NUM_CENTROIDS * 64)
+            self._train(read_rows(np.sort(self._rng.choice(num_rows, sample_size, replace=False))))
+
+        codes = np.empty((self.num_subspaces, num_rows), dtype=np.uint8)
+        inv_norms = np.empty(num_rows, dtype=np.float16)
+        for start in range(0, num_rows, block_size):
+            positions = np.arange(start, min(start + block_size, num_rows))
+            codes[:, positions], inv_norms[positions] = self._encode_rows(read_rows(positions))
+
+        self._face_ids = list(face_ids)
+        self._label_of = {face_id: label for label, face_id in enumerate(self._face_ids)}
+        self._publish((codes, inv_norms), np.empty((0, self.dim), dtype=np.float32), labels.astype(np.int64))
+
+    def _update(self, face_id: str, rows: np.ndarray, replace: bool) -> None:
+        """샘플 추가/교체 후 새 스냅샷 게시 (학습 기준에 도달하면 코드북 학습)"""
+        snapshot = self._snapshot
+        codes, inv_norms = snapshot.codes, snapshot.inv_norms
+        vectors, labels = snapshot.vectors, snapshot.labels
+
+        label = self._label_of.get(face_id)
+        if replace and label is not None:
+            keep = labels != label
+            if self.is_trained:
+                codes, inv_norms = codes[:, keep], inv_norms[keep]
+            else:
+                vectors = vectors[keep]
+            labels = labels[keep]
+        label = self._get_or_create_label(face_id)
+        labels = np.concatenate([labels, np.full(len(rows), label, dtype=np.int64)])
+
+        if self.is_trained:
+            new_codes, new_inv_norms = self._encode_rows(rows)
+            self._publish(
+                (np.hstack([codes, new_codes]), np.concatenate([inv_norms, new_inv_norms])),
+                vectors, labels
+            )
+        else:
+            self._store_rows(np.vstack([vectors, rows]), labels)
+
+    def _store_rows(self, vectors: np.ndarray, labels: np.ndarray) -> None:
+        """정규화된 전체 행 게시 (학습 기준에 도달하면 학습 후 코드로 변환)"""
+        if not self.is_trained and len(vectors) >= max(self.min_train_size, 1):
+            self._train(vectors)
+
+        if self.is_trained:
+            self._publish(self._encode_rows(vectors), np.empty((0, self.dim), dtype=np.float32), labels)
+        else:
+            self._publish(self._empty_codes(), vectors, labels)
+
+    def remove(self, face_id: str) -> int:
+        """
+        얼굴의 모든 샘플 삭제
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        label = self._label_of.pop(face_id, None)
+        if label is None:
+            return 0
+
+        snapshot = self._snapshot
+        keep = snapshot.labels != label
+        removed = int(len(keep) - np.count_nonzero(keep))
+        if self.is_trained:
+            encoded = (snapshot.codes[:, keep], snapshot.inv_norms[keep])
+            self._publish(encoded, snapshot.vectors, snapshot.labels[keep])
+        else:
+            encoded = (snapshot.codes, snapshot.inv_norms)
+            self._publish(encoded, snapshot.vectors[keep], snapshot.labels[keep])
+        return removed
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        정규화된 벡터를 PQ 코드로 인코딩
+
+        Args:
+            vectors (np.ndarray): (N, D) 정규화된 벡터
+
+        Returns:
+            np.ndarray: (N, M) uint8 코드
+        """
+        codes = np.empty((len(vectors), self.num_subspaces), dtype=np.uint8)
+        for m, sub in enumerate(self._split(vectors)):
+            codes[:, m] = self._nearest(sub, self._codebooks[m])
+        return codes
+
+    def _encode_rows(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """정규화된 벡터를 스냅샷 형식 ((M, N) 코드, (N,) 복원 노름 역수)으로 인코딩"""
+        codes = self.encode(vectors)
+        norms = np.linalg.norm(self.decode(codes), axis=1)
+        inv_norms = (1.0 / np.maximum(norms, 1e-6)).astype(np.float16)
+        return np.ascontiguousarray(codes.T), inv_norms
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        PQ 코드를 근사 벡터로 복원
+
+        Args:
+            codes (np.ndarray): (N, M) uint8 코드
+
+        Returns:
+            np.ndarray: (N, D) 근사 벡터
+        """
+        return np.concatenate(
+            [self._codebooks[m][codes[:, m]] for m in range(self.num_subspaces)], axis=1
+        )
+
+    def _split(self, vectors: np.ndarray) -> List[np.ndarray]:
+        """(N, D) 벡터를 부분 공간별 (N, D/M) 블록 목록으로 분할"""
+        return np.split(vectors, self.num_subspaces, axis=1)
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리를 룩업 테이블(ADC)로 검색
+
+        Args:
+            embeddings (np.ndarray): (N, D) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): 쿼리별로 min_score 이상인 첫 매칭에서 탐색 중단
+
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트
+        """
+        queries = self.normalize(embeddings)
+        snapshot = self._snapshot
+
+        if len(snapshot.labels) == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        # 학습 전: float32 전수 탐색 (정확한 검색)
+        if snapshot.codebooks is None:
+            if early_exit:
+                return [
+                    self._first_above(self._exact_blocks(snapshot, query), snapshot.face_ids, min_score)
+                    for query in queries
+                ]
+            scores = queries @ snapshot.vectors.T
+            return [
+                self._pool_top_k(row_scores, snapshot.labels, snapshot.face_ids, top_k, min_score)
+                for row_scores in scores
+            ]
+
+        results = []
+        for table in self._lookup_tables(snapshot.codebooks, queries):
+            blocks = self._adc_blocks(snapshot, table)
+            if early_exit:
+                results.append(self._first_above(blocks, snapshot.face_ids, min_score))
+                continue
+            scores = np.concatenate([block_scores for block_scores, _ in blocks])
+            results.append(
+                self._pool_top_k(scores, snapshot.labels, snapshot.face_ids, top_k, min_score)
+            )
+        return results
+
+    def _lookup_tables(self, codebooks: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """쿼리별 부분 공간 × 중심점 내적 테이블 (N, M, K)"""
+        sub_queries = queries.reshape(len(queries), len(codebooks), -1)
+        return np.einsum('nmd,mkd->nmk', sub_queries, codebooks)
+
+    def _adc_blocks(
+        self,
+        snapshot: PQSnapshot,
+        table: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """행 블록 단위 (ADC 점수, 라벨) 생성 (점수 = 코드가 가리키는 테이블 값의 합 × 역노름)"""
+        for start in range(0, len(snapshot.labels), self.EARLY_EXIT_BLOCK):
+            end = start + self.EARLY_EXIT_BLOCK
+            scores = np.zeros(len(snapshot.labels[start:end]), dtype=np.float32)
+            for sub_table, sub_codes in zip(table, snapshot.codes):
+                scores += sub_table.take(sub_codes[start:end])
+            yield scores * snapshot.inv_norms[start:end], snapshot.labels[start:end]
+
+    def _exact_blocks(
+        self,
+        snapshot: PQSnapshot,
+        query: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """학습 전 조기 종료 탐색용: 행 블록 단위 (점수, 라벨) 생성"""
+        for start in range(0, len(snapshot.labels), self.EARLY_EXIT_BLOCK):
+            end = start + self.EARLY_EXIT_BLOCK
+            yield snapshot.vectors[start:end] @ query, snapshot.labels[start:end]
+
+    def _train(self, vectors: np.ndarray) -> None:
+        """부분 공간별 k-means로 코드북 학습"""
+        num_vectors = len(vectors)
+        num_centroids = min(self.NUM_CENTROIDS, num_vectors)
+
+        # 학습 샘플은 중심점당 최대 64개로 제한
+        sample_size = min(num_vectors, num_centroids * 64)
+        sample = vectors[self._rng.choice(num_vectors, sample_size, replace=False)]
+
+        codebooks = []
+        for sub in self._split(sample):
+            centroids = sub[self._rng.choice(sample_size, num_centroids, replace=False)].copy()
+            for _ in range(self.kmeans_iters):
+                assignments = self._nearest(sub, centroids)
+                order = np.argsort(assignments, kind='stable')
+                counts = np.bincount(assignments, minlength=num_centroids)
+                nonempty = np.flatnonzero(counts)
+                starts = np.concatenate([[0], np.cumsum(counts)])[nonempty]
+                centroids[nonempty] = (
+                    np.add.reduceat(sub[order], starts, axis=0) / counts[nonempty, None]
+                )
+
+                # 빈 중심점은 임의의 샘플로 재초기화
+                empty = np.flatnonzero(counts == 0)
+                if len(empty):
+                    centroids[empty] = sub[self._rng.choice(sample_size, len(empty))]
+            codebooks.append(centroids)
+
+        self._codebooks = np.stack(codebooks).astype(np.float32)
+        self._codebooks.flags.writeable = False
+        print(
+            f"PQ 코드북 학습 완료: {num_vectors}개 샘플, "
+            f"{self.num_subspaces}개 부분 공간 x {num_centroids}개 중심점"
+        )
+
+    @staticmethod
+    def _nearest(
+        vectors: np.ndarray,
+        centroids: np.ndarray,
+        chunk_size: int = 8192
+    ) -> np.ndarray:
+        """유클리드 거리가 가장 가까운 중심점 번호 (‖c‖² - 2x·c 최소)"""
+        centroid_norms = (centroids ** 2).sum(axis=1)
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            assignments[start:start + chunk_size] = np.argmin(
+                centroid_norms - 2 * (chunk @ centroids.T), axis=1
+            )
+        return assignments
+
+    def save(self, path: str, metadata: Optional[Dict] = None) -> bool:
+        """
+        코드북, 코드, 라벨(, 얼굴 메타데이터)을 단일 .npz 파일로 저장
+
+        Args:
+            path (str): 저장 경로
+            metadata (Optional[Dict]): 함께 저장할 face_id → 얼굴 정보 (갤러리 내보내기용)
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            snapshot = self._snapshot
+            codebooks = (
+                snapshot.codebooks if snapshot.codebooks is not None
+                else np.empty((0, self.NUM_CENTROIDS, self.dim // self.num_subspaces), dtype=np.float32)
+            )
+
+            # 삭제된 얼굴의 라벨은 빈 문자열로 기록 (로드 시 라벨 테이블에서 제외)
+            live_labels = set(self._label_of.values())
+            face_ids = [
+                fid if label in live_labels else ''
+                for label, fid in enumerate(snapshot.face_ids)
+            ]
+
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    codebooks=codebooks,
+                    codes=snapshot.codes,
+                    inv_norms=snapshot.inv_norms,
+                    vectors=snapshot.vectors,
+                    labels=snapshot.labels,
+                    face_ids=np.array(face_ids, dtype=str),
+                    metadata=np.array(json.dumps(metadata or {}, ensure_ascii=False)),
+                )
+            os.replace(tmp_path, path)
+            return True
+
+        except Exception as e:
+            print(f"PQ 인덱스 저장 실패: {str(e)}")
+            return False
+
+    def load(self, path: str) -> bool:
+        """
+        .npz 파일에서 인덱스 복원 (부분 공간 수는 파일의 코드북을 따름)
+
+        Args:
+            path (str): 인덱스 파일 경로
+
+        Returns:
+            bool: 로드 성공 여부
+        """
+        try:
+            with np.load(path) as data:
+                codebooks = data['codebooks']
+                codes = data['codes']
+                inv_norms = data['inv_norms']
+                vectors = data['vectors']
+                labels = data['labels']
+                face_ids = [str(fid) for fid in data['face_ids']]
+
+            num_subspaces = len(codebooks) if len(codebooks) else self.num_subspaces
+            if len(codebooks) and codebooks.shape[0] * codebooks.shape[2] != self.dim:
+                print(f"PQ 인덱스 차원 불일치: {codebooks.shape} (dim={self.dim})")
+                return False
+
+            self.num_subspaces = num_subspaces
+            self._codebooks = codebooks.astype(np.float32) if len(codebooks) else None
+            self._face_ids = face_ids
+            self._label_of = {fid: label for label, fid in enumerate(face_ids) if fid}
+            self._publish(
+                (codes.astype(np.uint8).reshape(num_subspaces, -1), inv_norms.astype(np.float16)),
+                vectors.astype(np.float32).reshape(-1, self.dim),
+                labels.astype(np.int64)
+            )
+            return True
+
+        except Exception as e:
+            print(f"PQ 인덱스 로드 실패: {str(e)}")
+            return False
+
+    @staticmethod
+    def load_metadata(path: str) -> Dict:
+        """
+        PQ 파일에 함께 저장된 얼굴 메타데이터 읽기
+
+        Args:
+            path (str): 인덱스 파일 경로
+
+        Returns:
+            Dict: face_id → 얼굴 정보
+        """
+        with np.load(path) as data:
+            return json.loads(str(data['metadata']))
+
+    def __len__(self) -> int:
+        """인덱스 행(샘플) 수"""
+        return len(self._snapshot.labels)
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return (
+            f"PQIndex(faces={self.num_faces}, samples={len(self)}, "
+            f"subspaces={self.num_subspaces}, trained={self.is_trained})"
+        )
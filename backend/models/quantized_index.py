@@ -0,0 +1,226 @@
+"""
+저정밀도 인덱스 모듈
+
+메모리에는 float16 또는 차원별 int8로 압축한 행렬만 두고 근사 점수로 후보를 고른 뒤,
+상위 후보만 임베딩 저장소의 원본 값으로 다시 계산(re-ranking)
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from models.embedding_store import EmbeddingStore
+from models.shared_index import SharedIndex, SharedSnapshot
+from utils.similarity import pairwise_dot, quantize_query
+
+
+@dataclass(frozen=True)
+class QuantizedSnapshot(SharedSnapshot):
+    """저정밀도 인덱스의 불변 스냅샷"""
+    codes: np.ndarray  # (R, D) 정규화된 행의 float16/int8 코드
+    dim_scale: Optional[np.ndarray]  # int8 차원별 배율 (float16이면 None)
+
+
+class QuantizedIndex(SharedIndex):
+    """
+    float16 / int8 스칼라 양자화 인덱스
+
+    저장소 행을 정규화해 float16(행당 D*2바이트) 또는 차원별 대칭 int8(행당 D바이트)로
+    압축해 메모리에 보관합니다. 검색은 압축 행렬로 근사 점수를 계산해 상위 rerank개 행을 고르고,
+    그 행만 저장소 memory-map에서 읽어 float32로 정확히 다시 계산합니다.
+    저장소가 float16이면 재계산도 저장된 float16 값 기준입니다.
+
+    SharedIndex와 같이 저장소가 원본이며 add/replace/remove는 저장소 변경을 반영(sync)합니다.
+    int8 차원별 배율은 행 수가 보정 시점의 2배가 될 때마다 전체 행으로 다시 계산합니다
+    (그 사이 범위를 벗어난 값은 잘림).
+
+    Attributes:
+        store (EmbeddingStore): 임베딩 저장소 (재계산용 원본)
+        precision (str): 메모리 행렬 정밀도 ('float16' 또는 'int8')
+        rerank (int): 쿼리당 원본으로 다시 계산할 후보 행 수
+    """
+
+    ENCODE_BLOCK = 65536  # 인코딩/보정 시 한 번에 읽는 행 수 (임시 float32 메모리 제한)
+
+    def __init__(
+        self,
+        store: EmbeddingStore,
+        precision: str = 'int8',
+        rerank: int = 64
+    ):
+        """
+        저정밀도 인덱스 초기화
+
+        Args:
+            store (EmbeddingStore): 임베딩 저장소
+            precision (str): 'float16' 또는 'int8'
+            rerank (int): 원본으로 다시 계산할 후보 행 수 (클수록 정확, 느림)
+        """
+        if precision not in ('float16', 'int8'):
+            raise ValueError(f"지원하지 않는 정밀도: {precision}")
+
+        self.precision = precision
+        self.rerank = rerank
+        super().__init__(store)
+
+    def clear(self) -> None:
+        """인덱스 초기화 (다음 sync에서 저장소 전체를 다시 반영)"""
+        super().clear()
+        self._calibrated_rows = 0  # int8 배율을 계산한 시점의 행 수
+        base = self._snapshot
+        self._snapshot = QuantizedSnapshot(
+            matrix=base.matrix,
+            scale=base.scale,
+            labels=base.labels,
+            face_ids=base.face_ids,
+            generation=base.generation,
+            codes=np.empty((0, self.dim), dtype=self.precision),
+            dim_scale=None,
+        )
+
+    def _publish(self, matrix: np.ndarray, scale: np.ndarray, labels: np.ndarray, start: int) -> None:
+        """새로 추가된 행만 인코딩하여 스냅샷 게시 (int8 재보정 시 전체 재인코딩)"""
+        codes = self._snapshot.codes[:start]
+        dim_scale = self._snapshot.dim_scale
+
+        recalibrate = dim_scale is None or len(matrix) >= 2 * self._calibrated_rows
+        if self.precision == 'int8' and len(matrix) > 0 and recalibrate:
+            dim_scale = self._calibrate(matrix)
+            self._calibrated_rows = len(matrix)
+            codes, start = codes[:0], 0
+
+        if len(matrix) > start:
+            codes = np.concatenate([codes, self._encode(matrix, start, dim_scale)])
+
+        codes.flags.writeable = False
+        matrix.flags.writeable = False
+        labels.flags.writeable = False
+        scale.flags.writeable = False
+        self._snapshot = QuantizedSnapshot(
+            matrix=matrix,
+            scale=scale,
+            labels=labels,
+            face_ids=self._face_ids,
+            generation=self.store.generation,
+            codes=codes,
+            dim_scale=dim_scale,
+        )
+
+    def _normalized_blocks(self, matrix: np.ndarray, start: int) -> Iterator[np.ndarray]:
+        """start 행부터 ENCODE_BLOCK 단위 정규화 float32 블록 생성"""
+        for begin in range(start, len(matrix), self.ENCODE_BLOCK):
+            end = begin + self.ENCODE_BLOCK
+            block = np.asarray(matrix[begin:end], dtype=np.float32)
+            yield block * self._inv_norms[begin:end, None]
+
+    def _calibrate(self, matrix: np.ndarray) -> np.ndarray:
+        """정규화된 전체 행의 차원별 최대 절댓값으로 int8 배율 계산"""
+        max_abs = np.zeros(self.dim, dtype=np.float32)
+        for block in self._normalized_blocks(matrix, 0):
+            max_abs = np.maximum(max_abs, np.abs(block).max(axis=0))
+        dim_scale = np.maximum(max_abs, 1e-6) / 127.0
+        dim_scale.flags.writeable = False
+        return dim_scale
+
+    def _encode(self, matrix: np.ndarray, start: int, dim_scale: Optional[np.ndarray]) -> np.ndarray:
+        """start 행부터 정규화 후 float16/int8 코드로 변환"""
+        blocks = []
+        for block in self._normalized_blocks(matrix, start):
+            if self.precision == 'int8':
+                block = np.clip(np.rint(block / dim_scale), -127, 127)
+            blocks.append(block.astype(self.precision))
+        return np.concatenate(blocks)
+
+    def _approx_scores(
+        self,
+        snapshot: QuantizedSnapshot,
+        queries: np.ndarray,
+        start: int,
+        end: int
+    ) -> np.ndarray:
+        """압축 행렬 [start, end) 구간의 근사 점수 (삭제된 행은 -inf)"""
+        block = snapshot.codes[start:end]
+        if snapshot.dim_scale is None:
+            scores = pairwise_dot(queries.astype(np.float16), block)
+        else:
+            # 차원별 배율을 쿼리에 곱한 뒤 쿼리도 int8로 양자화해 정수 내적 (오차는 재계산이 보정)
+            codes, query_scale = quantize_query(queries * snapshot.dim_scale)
+            scores = pairwise_dot(codes, block) * query_scale
+        scores[..., snapshot.scale[start:end] == 0] = -np.inf
+        return scores
+
+    def _exact_scores(
+        self,
+        snapshot: QuantizedSnapshot,
+        query: np.ndarray,
+        rows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """후보 행을 저장소 원본으로 다시 계산한 (정렬된 행 번호, 정확한 점수)"""
+        rows = np.sort(rows)
+        vectors = np.asarray(snapshot.matrix[rows], dtype=np.float32)
+        return rows, (vectors @ query) * snapshot.scale[rows]
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        압축 행렬로 후보를 고른 뒤 원본으로 재계산하는 검색
+
+        Args:
+            embeddings (np.ndarray): (N, D) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): 쿼리별로 min_score 이상인 첫 매칭에서 탐색 중단
+
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트
+        """
+        queries = self.normalize(embeddings)
+        snapshot = self._snapshot
+
+        if len(snapshot.labels) == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        if early_exit:
+            return [
+                self._first_above(self._row_blocks(snapshot, query), snapshot.face_ids, min_score)
+                for query in queries
+            ]
+
+        # (N, R) 근사 점수 (쿼리가 적으면 simsimd, 많으면 블록 단위 float32 BLAS)
+        num_rows = len(snapshot.labels)
+        approx = self._approx_scores(snapshot, queries, 0, num_rows)
+
+        num_candidates = min(num_rows, max(self.rerank, 4 * top_k))
+        results = []
+        for query, row_scores in zip(queries, approx):
+            candidates = np.argpartition(-row_scores, num_candidates - 1)[:num_candidates]
+            rows, scores = self._exact_scores(snapshot, query, candidates)
+            results.append(self._pool_top_k(
+                scores, snapshot.labels[rows], snapshot.face_ids, top_k, min_score
+            ))
+        return results
+
+    def _row_blocks(
+        self,
+        snapshot: QuantizedSnapshot,
+        query: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """조기 종료 탐색용: 블록별 근사 상위 rerank개 행의 (정확한 점수, 라벨) 생성"""
+        for start in range(0, len(snapshot.labels), self.EARLY_EXIT_BLOCK):
+            approx = self._approx_scores(snapshot, query, start, start + self.EARLY_EXIT_BLOCK)
+            count = min(self.rerank, len(approx))
+            candidates = start + np.argpartition(-approx, count - 1)[:count]
+            rows, scores = self._exact_scores(snapshot, query, candidates)
+            yield scores, snapshot.labels[rows]
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return (
+            f"QuantizedIndex(faces={self.num_faces}, samples={len(self)}, "
+            f"precision={self.precision}, rerank={self.rerank})"
+        )
@@ -0,0 +1,242 @@
+"""
+인식 통계 모듈
+
+얼굴별 인식 횟수와 마지막 인식 시각을 메모리에 누적했다가
+주기적으로 작은 별도 파일에 기록 (write-behind)
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils.file_lock import locked
+
+
+class RecognitionStats:
+    """
+    인식 통계 write-behind 누적기
+
+    인식 경로(record)에서는 메모리의 대기(pending) 값만 갱신하고 I/O를 하지 않습니다.
+    백그라운드 스레드가 flush_interval마다, 또는 대기 갱신이 flush_every건에 도달하면
+    대기 값을 확정(durable) 값에 합쳐 통계 파일에 원자적으로 기록합니다.
+    기록은 잠금 파일 안에서 수행하고, 다른 프로세스가 그 사이 파일을 갱신했으면
+    파일 값을 다시 읽은 뒤 자기 증가분만 더하므로 여러 워커의 통계가 서로 덮어쓰지 않습니다.
+
+    Attributes:
+        path (str): 통계 파일 경로
+        flush_interval (float): 주기적 기록 간격 (초)
+        flush_every (int): 즉시 기록을 요청할 대기 갱신 수
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 10.0,
+        flush_every: int = 500
+    ):
+        """
+        인식 통계 누적기 초기화
+
+        Args:
+            path (str): 통계 파일 경로
+            flush_interval (float): 주기적 기록 간격 (초)
+            flush_every (int): 대기 갱신이 이 수에 도달하면 기록 요청
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+
+        self._durable: Dict[str, Dict] = {}  # face_id → {'recognition_count', 'last_seen'}
+        self._pending: Dict[str, list] = {}  # face_id → [증가분, last_seen]
+        self._pending_updates = 0
+        self._dirty = False  # 대기 값 외의 확정 값 변경 (삭제 등)
+        self._forgotten = set()  # 마지막 기록 이후 삭제된 face_id
+
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file_mtime: Optional[int] = None  # 마지막으로 읽거나 쓴 파일의 수정 시각
+        self._lock_file = None  # 프로세스 간 기록 잠금 파일 (최초 기록 시 열기)
+
+        loaded = self._read_file()
+        if loaded is not None:
+            self._durable = loaded
+
+    def _read_file(self) -> Optional[Dict[str, Dict]]:
+        """통계 파일 읽기 (없거나 실패하면 None)"""
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._file_mtime = mtime
+            return data
+        except Exception as e:
+            print(f"인식 통계 로드 실패: {str(e)}")
+            return None
+
+    def _changed_on_disk(self) -> bool:
+        """마지막으로 읽거나 쓴 뒤 다른 프로세스가 파일을 갱신했는지 여부"""
+        try:
+            return os.stat(self.path).st_mtime_ns != self._file_mtime
+        except FileNotFoundError:
+            return False
+
+    def merge_base(self, face_id: str, recognition_count: int, last_seen: Optional[str]) -> None:
+        """
+        데이터베이스에 저장된 기존 통계를 확정 값에 반영 (큰 값 유지)
+
+        Args:
+            face_id (str): 얼굴 ID
+            recognition_count (int): 기존 인식 횟수
+            last_seen (Optional[str]): 기존 마지막 인식 시각 (ISO 형식)
+        """
+        if not recognition_count and not last_seen:
+            return
+
+        with self._lock:
+            durable = self._durable.setdefault(
+                face_id, {'recognition_count': 0, 'last_seen': None}
+            )
+            durable['recognition_count'] = max(durable['recognition_count'], recognition_count or 0)
+            if last_seen and (durable['last_seen'] or '') < last_seen:
+                durable['last_seen'] = last_seen
+
+    def record(self, face_ids: Iterable[str]) -> None:
+        """
+        인식 결과 누적 (I/O 없음)
+
+        Args:
+            face_ids (Iterable[str]): 인식된 얼굴 ID 목록 (중복 허용)
+        """
+        now = datetime.now().isoformat()
+
+        with self._lock:
+            for face_id in face_ids:
+                pending = self._pending.setdefault(face_id, [0, None])
+                pending[0] += 1
+                pending[1] = now
+                self._pending_updates += 1
+
+            if self._pending_updates >= self.flush_every:
+                self._flush_requested.set()
+
+        self._ensure_thread()
+
+    def get(self, face_id: str) -> Tuple[int, Optional[str]]:
+        """
+        확정 값과 대기 값을 합친 통계 반환
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            Tuple[int, Optional[str]]: (인식 횟수, 마지막 인식 시각)
+        """
+        with self._lock:
+            durable = self._durable.get(face_id, {})
+            count = durable.get('recognition_count', 0)
+            last_seen = durable.get('last_seen')
+
+            pending = self._pending.get(face_id)
+            if pending is not None:
+                count += pending[0]
+                last_seen = pending[1]
+
+        return count, last_seen
+
+    def forget(self, face_id: str) -> None:
+        """삭제된 얼굴의 통계 제거"""
+        with self._lock:
+            if self._durable.pop(face_id, None) is not None:
+                self._dirty = True
+                self._forgotten.add(face_id)
+            self._pending.pop(face_id, None)
+
+    def flush(self) -> bool:
+        """
+        대기 값을 확정 값에 합쳐 통계 파일에 기록
+
+        Returns:
+            bool: 기록 성공 여부
+        """
+        with self._lock:
+            changed = bool(self._pending) or self._dirty
+            self._flush_requested.clear()
+
+        if not changed:
+            return True
+
+        try:
+            if self._lock_file is None:
+                self._lock_file = open(f"{self.path}.lock", 'a')
+
+            with locked(self._lock_file):
+                # 다른 프로세스가 기록한 값 위에 자기 증가분만 더함
+                # (파일 I/O 동안 인식 경로가 막히지 않도록 메모리 잠금은 짧게 유지)
+                on_disk = self._read_file() if self._changed_on_disk() else None
+
+                with self._lock:
+                    if on_disk is not None:
+                        self._durable = on_disk
+                        for face_id in self._forgotten:
+                            self._durable.pop(face_id, None)
+                    for face_id, (count, last_seen) in self._pending.items():
+                        durable = self._durable.setdefault(
+                            face_id, {'recognition_count': 0, 'last_seen': None}
+                        )
+                        durable['recognition_count'] += count
+                        durable['last_seen'] = last_seen
+                    self._dirty = False
+                    self._forgotten = set()
+                    self._pending = {}
+                    self._pending_updates = 0
+                    snapshot = json.dumps(self._durable, ensure_ascii=False)
+
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(snapshot)
+                os.replace(tmp_path, self.path)
+                self._file_mtime = os.stat(self.path).st_mtime_ns
+            return True
+
+        except Exception as e:
+            print(f"인식 통계 저장 실패: {str(e)}")
+            return False
+
+    def _ensure_thread(self) -> None:
+        """백그라운드 기록 스레드 시작 (최초 인식 시 1회)"""
+        if self._thread is not None or self._stopped.is_set():
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='recognition-stats-flush', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """주기적 또는 요청 시 기록"""
+        while not self._stopped.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self.flush()
+
+    def close(self) -> None:
+        """백그라운드 스레드 종료 및 남은 값 기록"""
+        self._stopped.set()
+        self._flush_requested.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self.flush()
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return f"RecognitionStats(faces={len(self._durable)}, pending={len(self._pending)})"
@@ -0,0 +1,232 @@
+"""
+공유 갤러리 인덱스 모듈
+
+임베딩 저장소의 memory-map을 그대로 검색하여 여러 워커 프로세스가
+같은 바이트(페이지 캐시)를 공유하고, 세대 번호로 다른 워커의 등록을 감지
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from models.embedding_index import EmbeddingIndex
+from models.embedding_store import EmbeddingStore
+from utils.similarity import pairwise_dot
+
+
+@dataclass(frozen=True)
+class SharedSnapshot:
+    """공유 인덱스의 불변 스냅샷"""
+    matrix: np.ndarray  # (R, D) 저장소 memory-map (정규화 전 원본)
+    scale: np.ndarray  # 행별 1/‖v‖ (삭제된 행은 0)
+    labels: np.ndarray  # 행 → 라벨
+    face_ids: List[str]  # 라벨 → face_id (append-only)
+    generation: int  # 반영된 저장소 세대 번호
+
+
+class SharedIndex(EmbeddingIndex):
+    """
+    memory-map 공유 갤러리 인덱스
+
+    행렬을 프로세스마다 복사하지 않고 EmbeddingStore의 memory-map을 직접 곱하며,
+    행 정규화는 행별 배율(scale)로 점수에 곱합니다. 삭제된 행은 배율이 0이므로
+    점수가 0이 되어 결과에서 제외됩니다.
+
+    원본은 저장소이므로 add/replace/remove는 저장소에 이미 기록된 변경을 반영(sync)만 합니다.
+    sync는 새로 추가된 행의 배율/라벨만 계산하고 삭제 표시는 테이블에서 다시 읽습니다.
+    referenced_rows가 주어지면 메타데이터가 가리키지 않는 행(등록 도중 실패한 행 등)도 배율을 0으로 둡니다.
+
+    Attributes:
+        store (EmbeddingStore): 공유 임베딩 저장소
+        referenced_rows (Optional[Callable[[], np.ndarray]]): 메타데이터가 가리키는 저장소 행 번호
+    """
+
+    def __init__(
+        self,
+        store: EmbeddingStore,
+        referenced_rows: Optional[Callable[[], np.ndarray]] = None
+    ):
+        """
+        공유 인덱스 초기화
+
+        Args:
+            store (EmbeddingStore): 임베딩 저장소
+            referenced_rows (Optional[Callable[[], np.ndarray]]): 검색할 저장소 행 번호 제공 함수
+                (None이면 삭제 표시되지 않은 모든 행)
+        """
+        self.store = store
+        self.referenced_rows = referenced_rows
+        super().__init__(store.dim)
+
+    def clear(self) -> None:
+        """인덱스 초기화 (다음 sync에서 저장소 전체를 다시 반영)"""
+        self._face_ids: List[str] = []
+        self._label_of = {}
+        self._inv_norms = np.empty(0, dtype=np.float32)  # 행별 1/‖v‖ (쓰기 전용)
+        self._snapshot = SharedSnapshot(
+            matrix=np.empty((0, self.dim), dtype=np.float32),
+            scale=np.empty(0, dtype=np.float32),
+            labels=np.empty(0, dtype=np.int64),
+            face_ids=self._face_ids,
+            generation=-1,
+        )
+
+    def sync(self) -> bool:
+        """
+        저장소의 현재 세대를 반영한 새 스냅샷 게시
+
+        Returns:
+            bool: 새 스냅샷을 게시했는지 여부
+        """
+        self.store.refresh()
+        snapshot = self._snapshot
+        if self.store.generation == snapshot.generation:
+            return False
+
+        matrix = self.store.vectors()
+        table = self.store.table()
+        start = len(snapshot.labels)
+
+        # 새로 추가된 행만 정규화 배율과 라벨 계산
+        labels = snapshot.labels
+        if len(matrix) > start:
+            new_rows = np.asarray(matrix[start:], dtype=np.float32)
+            norms = np.linalg.norm(new_rows, axis=1)
+            self._inv_norms = np.concatenate([
+                self._inv_norms, (1.0 / np.maximum(norms, 1e-12)).astype(np.float32)
+            ])
+            labels = np.concatenate([labels, np.fromiter(
+                (self._get_or_create_label(fid.decode('utf-8')) for fid in table['face_id'][start:]),
+                dtype=np.int64, count=len(matrix) - start
+            )])
+
+        live = (table['flags'] & EmbeddingStore.FLAG_DELETED) == 0
+        if self.referenced_rows is not None:
+            referenced = np.zeros(len(table), dtype=bool)
+            referenced[self.referenced_rows()] = True
+            live &= referenced
+        self._publish(matrix, self._inv_norms * live, labels, start)
+        return True
+
+    def _publish(self, matrix: np.ndarray, scale: np.ndarray, labels: np.ndarray, start: int) -> None:
+        """
+        동기화 결과로 새 스냅샷 게시
+
+        Args:
+            matrix (np.ndarray): 저장소 memory-map
+            scale (np.ndarray): 행별 배율 (삭제된 행은 0)
+            labels (np.ndarray): 행 → 라벨
+            start (int): 이번 동기화에서 새로 반영된 첫 행 번호
+        """
+        matrix.flags.writeable = False
+        labels.flags.writeable = False
+        scale.flags.writeable = False
+        self._snapshot = SharedSnapshot(
+            matrix=matrix,
+            scale=scale,
+            labels=labels,
+            face_ids=self._face_ids,
+            generation=self.store.generation,
+        )
+
+    def build_arrays(self, face_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """저장소 전체를 다시 반영 (인자는 저장소 내용과 같으므로 사용하지 않음)"""
+        self.clear()
+        self.sync()
+
+    def _update(self, face_id: str, rows: np.ndarray, replace: bool) -> None:
+        """저장소에 기록된 추가/교체 반영"""
+        self.sync()
+
+    def remove(self, face_id: str) -> int:
+        """
+        저장소에 기록된 삭제 반영
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        before = len(self)
+        self.sync()
+        return before - len(self)
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리를 공유 행렬과의 행렬곱 1회로 검색
+
+        Args:
+            embeddings (np.ndarray): (N, D) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): 쿼리별로 min_score 이상인 첫 매칭에서 탐색 중단
+
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트
+        """
+        queries = self.normalize(embeddings)
+        snapshot = self._snapshot
+
+        if len(snapshot.labels) == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        if early_exit:
+            return [
+                self._first_above(self._row_blocks(snapshot, query), snapshot.face_ids, min_score)
+                for query in queries
+            ]
+
+        # float16 저장소면 쿼리를 float16으로 맞춰 SIMD 커널로 직접 계산
+        queries = queries.astype(snapshot.matrix.dtype, copy=False)
+        scores = pairwise_dot(queries, snapshot.matrix) * snapshot.scale
+
+        return [
+            self._pool_top_k(row_scores, snapshot.labels, snapshot.face_ids, top_k, min_score)
+            for row_scores in scores
+        ]
+
+    def _row_blocks(
+        self,
+        snapshot: SharedSnapshot,
+        query: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """조기 종료 탐색용: 행 블록 단위 (배율을 곱한 점수, 라벨) 생성"""
+        query = query.astype(snapshot.matrix.dtype, copy=False)
+        for start in range(0, len(snapshot.labels), self.EARLY_EXIT_BLOCK):
+            end = start + self.EARLY_EXIT_BLOCK
+            scores = pairwise_dot(query, snapshot.matrix[start:end]) * snapshot.scale[start:end]
+            yield scores, snapshot.labels[start:end]
+
+    @property
+    def face_ids(self) -> List[str]:
+        """삭제되지 않은 샘플이 있는 face_id 목록"""
+        snapshot = self._snapshot
+        live_labels = np.unique(snapshot.labels[snapshot.scale > 0])
+        return [snapshot.face_ids[label] for label in live_labels]
+
+    @property
+    def num_faces(self) -> int:
+        """인덱스에 포함된 얼굴 수"""
+        return len(self.face_ids)
+
+    def __contains__(self, face_id: str) -> bool:
+        """얼굴 포함 여부"""
+        return face_id in self.face_ids
+
+    def __len__(self) -> int:
+        """삭제되지 않은 행(샘플) 수"""
+        return int(np.count_nonzero(self._snapshot.scale))
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return (
+            f"SharedIndex(faces={self.num_faces}, samples={len(self)}, "
+            f"generation={self._snapshot.generation})"
+        )
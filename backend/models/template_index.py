@@ -0,0 +1,263 @@
+"""
+템플릿 인덱스 모듈
+
+얼굴별 템플릿(평균/메도이드) 1개와 서로 다른 대표 샘플 최대 K개만 유지하여
+등록 사진 수가 아닌 얼굴 수에 비례하는 2단계 검색
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.embedding_index import EmbeddingIndex
+
+
+@dataclass(frozen=True)
+class TemplateSnapshot:
+    """템플릿 인덱스의 불변 스냅샷"""
+    templates: np.ndarray  # (L, D) 라벨별 정규화 템플릿 (삭제된 라벨은 0 벡터)
+    samples: Dict[int, np.ndarray]  # 라벨 → (≤K, D) 대표 샘플
+    face_ids: List[str]  # 라벨 → face_id (append-only)
+    num_rows: int  # 대표 샘플 수 합계
+
+
+class TemplateIndex(EmbeddingIndex):
+    """
+    얼굴별 템플릿 + 샘플 예산(K) 2단계 검색 인덱스
+
+    1단계: 얼굴당 템플릿 1행과 쿼리를 곱해 후보 얼굴 shortlist개를 고릅니다.
+    2단계: 후보 얼굴의 대표 샘플(최대 K개)로만 다시 점수를 계산해 얼굴별 최고 점수를 냅니다.
+    반환 유사도는 항상 실제 등록 샘플과의 점수이므로 평면 인덱스와 임계값 의미가 같습니다.
+
+    대표 샘플은 farthest-point 선택으로 고르므로 정면/측면처럼 서로 다른 사진이 남고
+    거의 같은 사진은 하나만 남습니다. 샘플이 추가되면 기존 대표 샘플 + 새 샘플 중에서만
+    다시 고르고, 평균 템플릿은 전체 샘플의 누적 합으로 갱신합니다 (원본 샘플은 저장소에 유지).
+
+    Attributes:
+        dim (int): 임베딩 차원
+        sample_budget (int): 얼굴당 최대 대표 샘플 수 (K)
+        template (str): 템플릿 종류 ('mean' 또는 'medoid')
+        shortlist (int): 1단계에서 2단계로 넘길 후보 얼굴 수
+    """
+
+    def __init__(
+        self,
+        dim: int = 512,
+        sample_budget: int = 8,
+        template: str = 'mean',
+        shortlist: int = 32
+    ):
+        """
+        템플릿 인덱스 초기화
+
+        Args:
+            dim (int): 임베딩 차원
+            sample_budget (int): 얼굴당 최대 대표 샘플 수 (K, 1 이상)
+            template (str): 'mean' (전체 샘플 평균) 또는 'medoid' (대표 샘플 중 중심에 가장 가까운 샘플)
+            shortlist (int): 2단계로 넘길 후보 얼굴 수 (클수록 정확, 느림)
+        """
+        if sample_budget < 1:
+            raise ValueError("sample_budget은 1 이상이어야 합니다.")
+        if template not in ('mean', 'medoid'):
+            raise ValueError(f"지원하지 않는 템플릿 종류: {template}")
+
+        self.sample_budget = sample_budget
+        self.template = template
+        self.shortlist = shortlist
+        super().__init__(dim)
+
+    def clear(self) -> None:
+        """인덱스 초기화"""
+        self._face_ids: List[str] = []
+        self._label_of: Dict[str, int] = {}
+        self._sums: Dict[int, np.ndarray] = {}  # 라벨 → 전체 샘플 합 (평균 템플릿용, 쓰기 전용)
+        self._publish(np.empty((0, self.dim), dtype=np.float32), {})
+
+    def _publish(self, templates: np.ndarray, samples: Dict[int, np.ndarray]) -> None:
+        """새 스냅샷 게시"""
+        templates.flags.writeable = False
+        for rows in samples.values():
+            rows.flags.writeable = False
+        self._snapshot = TemplateSnapshot(
+            templates=templates,
+            samples=samples,
+            face_ids=self._face_ids,
+            num_rows=sum(len(rows) for rows in samples.values()),
+        )
+
+    def build_arrays(self, face_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        행별 face_id 목록과 (N, D) 임베딩 행렬로 인덱스 전체 재구성
+
+        Args:
+            face_ids (Sequence[str]): 행별 얼굴 ID
+            vectors (np.ndarray): (N, D) 임베딩
+        """
+        if len(face_ids) == 0:
+            self.clear()
+            return
+
+        labels = self._new_labels(face_ids)
+        vectors = self.normalize(vectors)
+        self._sums = {}
+
+        # 라벨별로 묶어 대표 샘플/템플릿 계산
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=len(self._face_ids))
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        templates = np.zeros((len(self._face_ids), self.dim), dtype=np.float32)
+        samples = {}
+        for label in np.flatnonzero(counts):
+            rows = vectors[order[bounds[label]:bounds[label + 1]]]
+            self._sums[int(label)] = rows.sum(axis=0)
+            samples[int(label)] = self._select(rows)
+            templates[label] = self._template_of(int(label), samples[int(label)])
+
+        self._publish(templates, samples)
+
+    def _update(self, face_id: str, rows: np.ndarray, replace: bool) -> None:
+        """샘플 추가/교체 (기존 대표 샘플 + 새 샘플에서 다시 선택) 후 새 스냅샷 게시"""
+        snapshot = self._snapshot
+        label = self._get_or_create_label(face_id)
+
+        samples = dict(snapshot.samples)
+        if replace or label not in samples:
+            self._sums[label] = rows.sum(axis=0)
+            candidates = rows
+        else:
+            self._sums[label] = self._sums[label] + rows.sum(axis=0)
+            candidates = np.vstack([samples[label], rows])
+        samples[label] = self._select(candidates)
+
+        templates = snapshot.templates
+        if label >= len(templates):
+            templates = np.vstack([
+                templates, np.zeros((label + 1 - len(templates), self.dim), dtype=np.float32)
+            ])
+        else:
+            templates = templates.copy()
+        templates[label] = self._template_of(label, samples[label])
+
+        self._publish(templates, samples)
+
+    def remove(self, face_id: str) -> int:
+        """
+        얼굴의 템플릿과 대표 샘플 삭제
+
+        Args:
+            face_id (str): 얼굴 ID
+
+        Returns:
+            int: 삭제된 대표 샘플 수
+        """
+        label = self._label_of.pop(face_id, None)
+        if label is None:
+            return 0
+
+        snapshot = self._snapshot
+        samples = dict(snapshot.samples)
+        removed = samples.pop(label, None)
+        self._sums.pop(label, None)
+
+        templates = snapshot.templates.copy()
+        templates[label] = 0
+        self._publish(templates, samples)
+        return 0 if removed is None else len(removed)
+
+    def _select(self, rows: np.ndarray) -> np.ndarray:
+        """
+        farthest-point 선택으로 서로 다른 대표 샘플 최대 K개 선택
+
+        중심에 가장 가까운 샘플에서 시작해, 이미 고른 샘플과의 최대 유사도가
+        가장 낮은(가장 먼) 샘플을 차례로 추가합니다.
+        """
+        if len(rows) <= self.sample_budget:
+            return rows
+
+        center = rows.mean(axis=0)
+        selected = [int(np.argmax(rows @ center))]
+        closest = rows @ rows[selected[0]]  # 샘플별 선택된 샘플과의 최대 유사도
+        for _ in range(self.sample_budget - 1):
+            closest[selected] = np.inf
+            farthest = int(np.argmin(closest))
+            selected.append(farthest)
+            closest = np.maximum(closest, rows @ rows[farthest])
+
+        return rows[selected]
+
+    def _template_of(self, label: int, samples: np.ndarray) -> np.ndarray:
+        """라벨의 정규화된 템플릿 벡터"""
+        if self.template == 'medoid':
+            # 다른 대표 샘플들과의 유사도 합이 가장 큰 샘플
+            return samples[int(np.argmax((samples @ samples.T).sum(axis=1)))]
+        return self.normalize(self._sums[label])[0]
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        top_k: int = 1,
+        min_score: Optional[float] = None,
+        early_exit: bool = False
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        템플릿으로 후보를 고른 뒤 대표 샘플로 재점수하는 2단계 검색
+
+        2단계 비용이 후보 수 × K로 고정되므로 early_exit는 별도 처리 없이
+        같은 경로로 최고 매칭 1개를 반환합니다.
+
+        Args:
+            embeddings (np.ndarray): (N, D) 쿼리 임베딩
+            top_k (int): 쿼리별 반환할 최대 결과 수
+            min_score (Optional[float]): 최소 유사도 (None이면 0 초과)
+            early_exit (bool): 최고 매칭 1개만 반환 (min_score 필요)
+
+        Returns:
+            List[List[Tuple[str, float]]]: 쿼리별 (face_id, similarity) 리스트
+        """
+        queries = self.normalize(embeddings)
+        snapshot = self._snapshot
+
+        if snapshot.num_rows == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+        if early_exit:
+            if min_score is None:
+                raise ValueError("조기 종료 검색에는 min_score가 필요합니다.")
+            top_k = 1
+
+        # 1단계: (N, D) x (D, L) 템플릿 점수
+        template_scores = queries @ snapshot.templates.T
+        num_candidates = min(max(self.shortlist, top_k), len(snapshot.templates))
+
+        results = []
+        for query, scores in zip(queries, template_scores):
+            if num_candidates < len(scores):
+                candidates = np.argpartition(-scores, num_candidates - 1)[:num_candidates]
+            else:
+                candidates = np.arange(len(scores))
+            candidates = [int(label) for label in candidates if int(label) in snapshot.samples]
+            if not candidates:
+                results.append([])
+                continue
+
+            # 2단계: 후보 얼굴의 실제 대표 샘플로만 재점수
+            # (합성 템플릿 점수는 후보 선택에만 사용해 평면 인덱스와 같은 임계값 의미 유지)
+            rows = np.vstack([snapshot.samples[label] for label in candidates])
+            row_labels = np.repeat(
+                candidates, [len(snapshot.samples[label]) for label in candidates]
+            )
+            results.append(self._pool_top_k(
+                rows @ query, row_labels, snapshot.face_ids, top_k, min_score
+            ))
+
+        return results
+
+    def __len__(self) -> int:
+        """대표 샘플 수 (검색 시 비교하는 샘플 행 수)"""
+        return self._snapshot.num_rows
+
+    def __repr__(self) -> str:
+        """문자열 표현"""
+        return (
+            f"TemplateIndex(faces={self.num_faces}, samples={len(self)}, "
+            f"budget={self.sample_budget}, template={self.template})"
+        )
@@ -0,0 +1,388 @@
+"""
+감지/인식 모델 INT8 양자화 도구
+
+모델 팩의 감지(detection)와 인식(recognition) ONNX 모델을 INT8로 양자화해 모델 폴더의 int8/에 저장하고,
+등록된 얼굴 이미지로 FP32 모델과의 임베딩 일치도와 find_match top-1 정확도 변화를 보고합니다.
+저장된 모델은 FaceRecognizer(quantization='dynamic' 또는 'static')로 사용합니다.
+
+- dynamic: 가중치만 INT8로 저장하고 활성값은 실행 중에 양자화 (보정 데이터 불필요)
+- static: 등록된 얼굴 이미지를 FP32 파이프라인에 통과시켜 모델 입력을 그대로 모은 뒤
+  활성값 범위를 보정 (QDQ 형식, 채널별 가중치 양자화)
+
+사용법:
+    python quantize_models.py --mode static --calibration-size 64
+    python quantize_models.py --mode dynamic --model buffalo_l --db data/face_database.json
+"""
+
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bulk_import import read_image, select_best_face
+from models.face_database import FaceDatabase
+from models.face_recognition import FaceRecognizer
+from models.face_tracker import FaceTracker
+from models.inference_engine import QUANTIZATION_MODES, quantized_model_path
+
+
+QUANTIZED_TASKS = ('detection', 'recognition')
+REPORT_FILE = 'report_{mode}.json'  # int8/ 폴더에 저장
+
+
+def load_face_images(database: FaceDatabase, limit: Optional[int] = None) -> List[Tuple[str, np.ndarray]]:
+    """
+    데이터베이스에 저장된 얼굴 이미지 로드 (얼굴별 샘플 순서 유지)
+
+    Args:
+        database (FaceDatabase): 얼굴 데이터베이스
+        limit (Optional[int]): 최대 이미지 수 (None이면 전체)
+
+    Returns:
+        List[Tuple[str, np.ndarray]]: (face_id, BGR 이미지) 목록
+    """
+    images = []
+    for face_id in sorted(database.faces):
+        face_data = database.faces[face_id]
+        for image_path in face_data.get('image_paths') or [face_data.get('image_path')]:
+            if not image_path:
+                continue
+            image = read_image(os.path.join(database.data_dir, image_path))
+            if image is not None:
+                images.append((face_id, image))
+            if limit is not None and len(images) >= limit:
+                return images
+    return images
+
+
+class _RecordingSession:
+    """ONNX Runtime 세션의 입력을 샘플(배치 1) 단위로 기록하는 래퍼"""
+
+    def __init__(self, session):
+        self._session = session
+        self.feeds: List[Dict[str, np.ndarray]] = []
+
+    def run(self, output_names, input_feed, *args, **kwargs):
+        batch = len(next(iter(input_feed.values())))
+        for i in range(batch):
+            self.feeds.append({name: value[i:i + 1].copy() for name, value in input_feed.items()})
+        return self._session.run(output_names, input_feed, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def collect_calibration_feeds(
+    recognizer: FaceRecognizer,
+    images: List[np.ndarray]
+) -> Dict[str, List[Dict[str, np.ndarray]]]:
+    """
+    FP32 파이프라인을 실행하며 감지/인식 모델의 실제 입력 텐서를 수집
+    (전처리를 다시 구현하지 않으므로 RGB 변환, 리사이즈, 정렬이 서비스와 동일)
+
+    Args:
+        recognizer (FaceRecognizer): FP32 인식기
+        images (List[np.ndarray]): 보정용 얼굴 이미지 (BGR)
+
+    Returns:
+        Dict[str, List[Dict[str, np.ndarray]]]: 태스크 이름 → 입력 목록
+    """
+    models = {taskname: recognizer.app.models[taskname] for taskname in QUANTIZED_TASKS}
+    recorders = {taskname: _RecordingSession(model.session) for taskname, model in models.items()}
+    try:
+        for taskname, model in models.items():
+            model.session = recorders[taskname]
+        recognizer.extract_embeddings_batch(images, max_batch_size=1)
+    finally:
+        for taskname, model in models.items():
+            model.session = recorders[taskname]._session
+    return {taskname: recorder.feeds for taskname, recorder in recorders.items()}
+
+
+def quantize_model(
+    src: str,
+    dst: str,
+    mode: str,
+    feeds: Optional[List[Dict[str, np.ndarray]]] = None
+) -> None:
+    """
+    ONNX 모델 1개를 INT8로 양자화
+
+    Args:
+        src (str): FP32 모델 파일
+        dst (str): INT8 모델 저장 경로
+        mode (str): 'dynamic' 또는 'static'
+        feeds (Optional[List[Dict[str, np.ndarray]]]): static 보정 입력
+    """
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType,
+        quant_pre_process, quantize_dynamic, quantize_static
+    )
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=os.path.dirname(dst))
+    try:
+        # 형태 추론/그래프 정리 후 양자화 (sympy 없이 ONNX 형태 추론만 사용)
+        prepared = os.path.join(temp_dir, 'prepared.onnx')
+        quant_pre_process(src, prepared, skip_symbolic_shape=True)
+        output = os.path.join(temp_dir, 'quantized.onnx')
+
+        if mode == 'dynamic':
+            quantize_dynamic(prepared, output, weight_type=QuantType.QInt8)
+        else:
+            if not feeds:
+                raise ValueError(f"static 양자화에 필요한 보정 데이터가 없습니다: {os.path.basename(src)}")
+
+            class FeedReader(CalibrationDataReader):
+                def __init__(self, items):
+                    self._items = iter(items)
+
+                def get_next(self):
+                    return next(self._items, None)
+
+            quantize_static(
+                prepared, output, FeedReader(feeds),
+                quant_format=QuantFormat.QDQ,
+                per_channel=True,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                calibrate_method=CalibrationMethod.MinMax
+            )
+
+        os.replace(output, dst)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def top1_accuracy(
+    gallery: Dict[str, np.ndarray],
+    queries: List[Tuple[str, Optional[np.ndarray]]]
+) -> Optional[float]:
+    """
+    임시 FaceDatabase에 갤러리를 등록하고 find_match top-1 정확도 계산
+
+    Args:
+        gallery (Dict[str, np.ndarray]): face_id → 갤러리 임베딩
+        queries (List[Tuple[str, Optional[np.ndarray]]]): (정답 face_id, 쿼리 임베딩, 감지 실패면 None)
+
+    Returns:
+        Optional[float]: 정확도 (쿼리가 없으면 None)
+    """
+    if not queries:
+        return None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = FaceDatabase(db_path=os.path.join(temp_dir, 'eval_database.json'), index_type='flat')
+        with database.batch():
+            for face_id, embedding in gallery.items():
+                database.register_face(face_id, embedding, {'name': face_id})
+
+        hits = 0
+        for face_id, embedding in queries:
+            if embedding is None:
+                continue
+            matches = database.find_match(embedding, top_k=1)
+            hits += bool(matches) and matches[0][0] == face_id
+    return hits / len(queries)
+
+
+def evaluate(
+    fp32: FaceRecognizer,
+    int8: FaceRecognizer,
+    samples: List[Tuple[str, np.ndarray]]
+) -> Dict:
+    """
+    FP32와 INT8 모델 비교
+
+    - detection: INT8 감지 결과(가장 큰 얼굴)와 FP32 감지 결과의 IoU
+    - embedding: 같은 FP32 감지 결과(랜드마크)로 정렬한 얼굴의 임베딩 코사인 유사도 (인식 모델만 비교)
+    - top1: 얼굴별 첫 샘플을 갤러리, 나머지를 쿼리로 한 find_match top-1 정확도
+      (fp32, int8, 기존 FP32 갤러리를 그대로 두고 INT8로 검색하는 fp32_gallery_int8_query)
+
+    Args:
+        fp32 (FaceRecognizer): FP32 인식기
+        int8 (FaceRecognizer): INT8 인식기
+        samples (List[Tuple[str, np.ndarray]]): (face_id, BGR 이미지) 목록
+
+    Returns:
+        Dict: 비교 결과
+    """
+    ious, cosines = [], []
+    timings = {'fp32': [], 'int8': []}
+    embeddings: Dict[str, List[Optional[np.ndarray]]] = {'fp32': [], 'int8': []}
+
+    for _, image in samples:
+        best = {}
+        for variant, recognizer in (('fp32', fp32), ('int8', int8)):
+            start = time.perf_counter()
+            faces = recognizer.detect(image)
+            best[variant] = select_best_face(faces) if faces else None
+            if best[variant] is not None:
+                recognizer.embed(image, [best[variant]])
+            timings[variant].append(time.perf_counter() - start)
+            embeddings[variant].append(best[variant]['embedding'] if best[variant] is not None else None)
+
+        if best['fp32'] is None:
+            continue
+        ious.append(
+            float(FaceTracker.iou([best['fp32']['bbox']], [best['int8']['bbox']])[0, 0])
+            if best['int8'] is not None else 0.0
+        )
+        reference = best['fp32']['embedding']
+        embedding = int8.embed(image, [{'kps': best['fp32']['kps']}])[0]
+        cosines.append(float(
+            np.dot(reference, embedding) / (np.linalg.norm(reference) * np.linalg.norm(embedding) + 1e-10)
+        ))
+
+    # 얼굴별 첫 샘플(FP32에서 감지된)을 갤러리로, 나머지를 쿼리로 사용
+    gallery_index, query_index = {}, []
+    for i, (face_id, _) in enumerate(samples):
+        if face_id not in gallery_index:
+            if embeddings['fp32'][i] is not None:
+                gallery_index[face_id] = i
+        else:
+            query_index.append(i)
+
+    def gallery(variant: str) -> Dict[str, np.ndarray]:
+        return {
+            face_id: embeddings[variant][i] for face_id, i in gallery_index.items()
+            if embeddings[variant][i] is not None
+        }
+
+    def queries(variant: str) -> List[Tuple[str, Optional[np.ndarray]]]:
+        return [(samples[i][0], embeddings[variant][i]) for i in query_index if samples[i][0] in gallery_index]
+
+    fp32_top1 = top1_accuracy(gallery('fp32'), queries('fp32'))
+    int8_top1 = top1_accuracy(gallery('int8'), queries('int8'))
+    cosines_arr, ious_arr = np.array(cosines), np.array(ious)
+
+    return {
+        'samples': len(samples),
+        'detection': {
+            'fp32_detected': sum(e is not None for e in embeddings['fp32']),
+            'int8_detected': sum(e is not None for e in embeddings['int8']),
+            'mean_iou': float(ious_arr.mean()) if ious else None,
+            'agreement': float((ious_arr >= 0.5).mean()) if ious else None,  # IoU 0.5 이상 비율
+        },
+        'embedding': {
+            'mean_cosine': float(cosines_arr.mean()) if cosines else None,
+            'min_cosine': float(cosines_arr.min()) if cosines else None,
+            'p5_cosine': float(np.percentile(cosines_arr, 5)) if cosines else None,
+        },
+        'top1': {
+            'queries': len(queries('fp32')),
+            'fp32': fp32_top1,
+            'int8': int8_top1,
+            'fp32_gallery_int8_query': top1_accuracy(gallery('fp32'), queries('int8')),
+            'delta': int8_top1 - fp32_top1 if fp32_top1 is not None else None,
+        },
+        'latency_ms': {
+            variant: float(np.mean(values) * 1e3) if values else None for variant, values in timings.items()
+        },
+    }
+
+
+def run_quantization(
+    mode: str = 'static',
+    model_name: Optional[str] = None,
+    db_path: str = 'data/face_database.json',
+    calibration_size: int = 64,
+    max_eval_images: Optional[int] = None
+) -> Dict:
+    """
+    감지/인식 모델을 양자화하고 FP32와 비교한 보고서 저장
+
+    Args:
+        mode (str): 'dynamic' 또는 'static'
+        model_name (Optional[str]): InsightFace 모델 팩 이름 (None이면 buffalo_l)
+        db_path (str): 보정/평가에 사용할 얼굴 데이터베이스
+        calibration_size (int): static 보정에 사용할 얼굴 이미지 수
+        max_eval_images (Optional[int]): 평가에 사용할 최대 이미지 수 (None이면 전체)
+
+    Returns:
+        Dict: 보고서 (모델 파일, 크기, 평가 결과)
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"지원하지 않는 양자화 방식: {mode} (가능: {', '.join(QUANTIZATION_MODES)})")
+
+    database = FaceDatabase(db_path=db_path)
+    samples = load_face_images(database, max_eval_images)
+    print(f"등록된 얼굴 이미지 {len(samples)}장 로드 (얼굴 {len({face_id for face_id, _ in samples})}명)")
+
+    # INT8 모델은 CPU 전용 배포 대상
+    fp32 = FaceRecognizer(model_name=model_name, device='cpu', profile='recognition_only')
+
+    feeds = {}
+    if mode == 'static':
+        calibration = [image for _, image in samples[:calibration_size]]
+        if not calibration:
+            raise ValueError("static 양자화에는 등록된 얼굴 이미지가 필요합니다 (dynamic을 사용하세요)")
+        feeds = collect_calibration_feeds(fp32, calibration)
+        print("보정 입력 수집: " + ', '.join(f"{task} {len(items)}개" for task, items in feeds.items()))
+
+    files = {}
+    for taskname in QUANTIZED_TASKS:
+        src = fp32.app.models[taskname].model_file
+        dst = quantized_model_path(src, mode)
+        start = time.perf_counter()
+        quantize_model(src, dst, mode, feeds.get(taskname))
+        files[taskname] = {
+            'fp32': os.path.basename(src),
+            'int8': os.path.relpath(dst, os.path.dirname(src)),
+            'fp32_mb': round(os.path.getsize(src) / 2**20, 2),
+            'int8_mb': round(os.path.getsize(dst) / 2**20, 2),
+        }
+        print(f"양자화 완료: {files[taskname]['int8']} ({time.perf_counter() - start:.1f}초, "
+              f"{files[taskname]['fp32_mb']}MB → {files[taskname]['int8_mb']}MB)")
+
+    int8 = FaceRecognizer(model_name=model_name, device='cpu', profile='recognition_only', quantization=mode)
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'model_name': model_name or 'buffalo_l',
+        'mode': mode,
+        'calibration_images': len(samples[:calibration_size]) if mode == 'static' else 0,
+        'files': files,
+        **evaluate(fp32, int8, samples),
+    }
+
+    report_path = os.path.join(os.path.dirname(dst), REPORT_FILE.format(mode=mode))
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    embedding, top1 = report['embedding'], report['top1']
+    print("=" * 60)
+    print(f"임베딩 코사인 (INT8 vs FP32): 평균 {embedding['mean_cosine']}, 최소 {embedding['min_cosine']}")
+    print(f"감지 일치율 (IoU>=0.5): {report['detection']['agreement']}")
+    print(f"top-1 정확도 ({top1['queries']}개 쿼리): FP32 {top1['fp32']}, INT8 {top1['int8']}, "
+          f"FP32 갤러리+INT8 쿼리 {top1['fp32_gallery_int8_query']}")
+    print(f"평균 시간(ms): {report['latency_ms']}")
+    print(f"보고서 저장: {report_path}")
+    return report
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='감지/인식 모델 INT8 양자화')
+    parser.add_argument('--mode', choices=QUANTIZATION_MODES, default='static', help='양자화 방식 (기본값: static)')
+    parser.add_argument('--model', type=str, default=None, help='InsightFace 모델 팩 이름 (기본값: buffalo_l)')
+    parser.add_argument('--db', type=str, default='data/face_database.json', help='보정/평가용 얼굴 데이터베이스')
+    parser.add_argument('--calibration-size', type=int, default=64, help='static 보정 이미지 수 (기본값: 64)')
+    parser.add_argument('--max-eval-images', type=int, default=None, help='평가 최대 이미지 수 (기본값: 전체)')
+    args = parser.parse_args()
+
+    run_quantization(
+        mode=args.mode,
+        model_name=args.model,
+        db_path=args.db,
+        calibration_size=args.calibration_size,
+        max_eval_images=args.max_eval_images
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -113,11 +113,14 @@ async def root():
 
 # ==================== 메인 함수 ====================
 
-def main():
+def main(workers: int = 1):
     """
     서버 실행 함수
 
-    개발 모드로 Uvicorn 서버 시작
+    워커가 1개이면 개발 모드(자동 재시작)로, 여러 개이면 공유 갤러리 모드로 Uvicorn 서버 시작
+
+    Args:
+        workers (int): 워커 프로세스 수
     """
     print("\n" + "=" * 60)
     print("Starting FastAPI server...")
@@ -128,6 +131,19 @@ def main():
     print("=" * 60)
     print("\nPress Ctrl+C to stop the server.\n")
 
+    if workers > 1:
+        # 워커 프로세스는 환경 변수를 상속하므로 모두 공유 갤러리 모드로 얼굴 DB를 연다
+        os.environ['FACE_DB_SHARED'] = '1'
+        print(f"Workers: {workers} (shared face gallery)")
+        uvicorn.run(
+            "server:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,  # reload와 함께 사용할 수 없음
+            log_level="info"
+        )
+        return
+
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
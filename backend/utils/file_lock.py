@@ -0,0 +1,34 @@
+"""
+파일 잠금 유틸리티
+
+여러 프로세스(uvicorn 워커 등)가 같은 파일에 쓰는 구간을 직렬화
+"""
+
+from contextlib import contextmanager
+from typing import IO
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없음 (단일 프로세스 실행 전제)
+    fcntl = None
+
+
+@contextmanager
+def locked(file: IO):
+    """
+    열린 파일에 프로세스 간 배타 잠금(flock)을 거는 컨텍스트
+
+    fcntl이 없는 플랫폼에서는 아무 것도 하지 않습니다.
+
+    Args:
+        file (IO): 잠글 파일 객체
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,133 @@
+"""
+유사도 커널 모듈
+
+float32/float16/int8 임베딩의 내적·코사인 유사도를 simsimd SIMD 커널로 계산하고,
+simsimd가 없거나 BLAS 행렬곱이 더 빠른 경우 NumPy로 계산
+"""
+
+import numpy as np
+from typing import List, Tuple
+
+try:
+    import simsimd
+except ImportError:  # NumPy 경로만 사용
+    simsimd = None
+
+
+SUPPORTED_DTYPES = (np.dtype(np.float32), np.dtype(np.float16), np.dtype(np.int8))
+
+# simsimd cdist는 쿼리-행 쌍마다 SIMD 내적을 수행하므로 쿼리가 많으면 BLAS 행렬곱(캐시 재사용)이 더 빠름.
+# float32는 항상 BLAS, float16/int8은 이 수 이하의 쿼리에서 simsimd 사용 (NumPy는 float32로 올려 계산)
+SIMSIMD_MAX_QUERIES = 8
+
+NUMPY_BLOCK = 4096  # NumPy 경로에서 float16/int8 행을 float32로 올리는 블록 크기
+
+
+def available_backends() -> List[str]:
+    """사용 가능한 계산 백엔드 목록"""
+    return ['simsimd', 'numpy'] if simsimd is not None else ['numpy']
+
+
+def _select_backend(backend: str, dtype: np.dtype, num_queries: int) -> str:
+    """'auto'를 자료형과 쿼리 수에 맞는 백엔드로 결정"""
+    if backend not in ('auto', 'simsimd', 'numpy'):
+        raise ValueError(f"지원하지 않는 유사도 백엔드: {backend}")
+    if backend == 'simsimd' and simsimd is None:
+        raise RuntimeError("simsimd 패키지가 설치되어 있지 않습니다. 'pip install simsimd'를 실행하세요.")
+    if backend != 'auto':
+        return backend
+
+    if simsimd is None or dtype == np.float32 or num_queries > SIMSIMD_MAX_QUERIES:
+        return 'numpy'
+    return 'simsimd'
+
+
+def pairwise_dot(
+    queries: np.ndarray,
+    vectors: np.ndarray,
+    backend: str = 'auto'
+) -> np.ndarray:
+    """
+    쿼리와 갤러리 행의 모든 쌍 내적 계산
+
+    int8은 정수 내적을 그대로 float32로 반환하므로 호출자가 양자화 배율을 곱해야 합니다.
+
+    Args:
+        queries (np.ndarray): (N, D) 또는 (D,) 쿼리 (vectors와 같은 자료형)
+        vectors (np.ndarray): (R, D) 갤러리 행 (float32/float16/int8, memory-map 가능)
+        backend (str): 'auto', 'simsimd', 'numpy'
+
+    Returns:
+        np.ndarray: (N, R) float32 내적 (1차원 쿼리면 (R,))
+    """
+    single = queries.ndim == 1
+    queries = queries.reshape(1, -1) if single else queries
+    if queries.dtype != vectors.dtype:
+        raise ValueError(f"쿼리와 갤러리의 자료형이 다릅니다: {queries.dtype} != {vectors.dtype}")
+    if vectors.dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"지원하지 않는 자료형: {vectors.dtype}")
+
+    if len(queries) == 0 or len(vectors) == 0:
+        scores = np.zeros((len(queries), len(vectors)), dtype=np.float32)
+    elif _select_backend(backend, vectors.dtype, len(queries)) == 'simsimd':
+        scores = np.asarray(simsimd.cdist(
+            np.ascontiguousarray(queries), np.ascontiguousarray(vectors),
+            metric='dot', out_dtype='float32'
+        ))
+    elif vectors.dtype == np.float32:
+        scores = queries @ vectors.T
+    else:
+        # float16/int8 → float32 블록 변환 후 BLAS (int8 내적은 float32에서 정확)
+        queries32 = queries.astype(np.float32)
+        scores = np.empty((len(queries), len(vectors)), dtype=np.float32)
+        for start in range(0, len(vectors), NUMPY_BLOCK):
+            end = start + NUMPY_BLOCK
+            scores[:, start:end] = queries32 @ vectors[start:end].astype(np.float32).T
+
+    return scores[0] if single else scores
+
+
+def cosine(
+    embedding1: np.ndarray,
+    embedding2: np.ndarray,
+    backend: str = 'auto'
+) -> float:
+    """
+    두 벡터의 코사인 유사도
+
+    Args:
+        embedding1 (np.ndarray): 첫 번째 벡터
+        embedding2 (np.ndarray): 두 번째 벡터
+        backend (str): 'auto', 'simsimd', 'numpy'
+
+    Returns:
+        float: 코사인 유사도 (-1.0-1.0, 영벡터가 있으면 0.0)
+    """
+    a = np.ascontiguousarray(embedding1, dtype=np.float32).reshape(-1)
+    b = np.ascontiguousarray(embedding2, dtype=np.float32).reshape(-1)
+
+    if backend == 'auto':
+        backend = 'simsimd' if simsimd is not None else 'numpy'
+    if _select_backend(backend, a.dtype, 1) == 'simsimd':
+        if not a.any() or not b.any():
+            return 0.0
+        return 1.0 - float(simsimd.cosine(a, b))
+
+    norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if norm == 0.0:
+        return 0.0
+    return float(np.dot(a, b)) / norm
+
+
+def quantize_query(queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    쿼리를 int8 갤러리와 정수 내적할 수 있도록 쿼리별 대칭 int8로 양자화
+
+    Args:
+        queries (np.ndarray): (N, D) float32 쿼리
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ((N, D) int8 쿼리, (N, 1) float32 배율) — 원래 내적 ≈ 정수 내적 × 배율
+    """
+    scale = np.maximum(np.abs(queries).max(axis=-1, keepdims=True), 1e-12) / 127.0
+    return np.rint(queries / scale).astype(np.int8), scale.astype(np.float32)
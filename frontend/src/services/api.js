@@ -61,6 +61,14 @@ export const faceAPI = {
     },
   }),
 
+  // 얼굴 일괄 등록 (formData: files 여러 개 + 파일별 names 선택)
+  registerFacesBatch: (formData) => api.post('/api/faces/register-batch', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+    timeout: 120000,
+  }),
+
   // 얼굴 삭제
   deleteFace: (id) => api.delete(`/api/face/${id}`),
 
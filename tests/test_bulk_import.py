@@ -0,0 +1,76 @@
+"""
+얼굴 일괄 등록 모듈 테스트
+"""
+
+import pytest
+import numpy as np
+import tempfile
+import shutil
+import os
+
+
+@pytest.fixture
+def input_dir():
+    """인물별 폴더가 있는 임시 입력 폴더"""
+    temp_dir = tempfile.mkdtemp()
+    for name, files in {'A': ['1.jpg', 'sub/2.PNG', 'notes.txt'], 'B': ['1.jpeg']}.items():
+        for filename in files:
+            path = os.path.join(temp_dir, name, filename)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'')
+    open(os.path.join(temp_dir, 'root.jpg'), 'wb').close()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def temp_db_dir():
+    """임시 데이터베이스 디렉토리"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def test_collect_photos(input_dir):
+    """하위 폴더 이름을 인물 이름으로, 이미지 파일만 수집하는지 테스트"""
+    from backend.bulk_import import collect_photos
+
+    assert collect_photos(input_dir) == [('A', 'A/1.jpg'), ('A', 'A/sub/2.PNG'), ('B', 'B/1.jpeg')]
+
+
+def test_select_best_face():
+    """가장 큰 얼굴을 선택하는지 테스트"""
+    from backend.bulk_import import select_best_face
+
+    faces = [{'bbox': [0, 0, 10, 10]}, {'bbox': [5, 5, 45, 35]}, {'bbox': [0, 0, 20, 20]}]
+    assert select_best_face(faces) is faces[1]
+
+
+def test_resume_and_commit(input_dir, temp_db_dir):
+    """진행 파일에 기록된 추출 결과를 다시 추출하지 않고 한 번에 등록하는지 테스트"""
+    from backend.bulk_import import ImportProgress, run_bulk_import, PROGRESS_FILE
+    from backend.models.face_database import FaceDatabase
+
+    # 이전 실행에서 모든 사진을 처리하고 등록 전에 중단된 상태
+    embeddings = np.random.randn(2, 512).astype(np.float32)
+    face_image = np.full((16, 16, 3), 128, dtype=np.uint8)
+    progress = ImportProgress(os.path.join(input_dir, PROGRESS_FILE))
+    progress.record({'path': 'A/1.jpg', 'name': 'A', 'status': 'ok', **ImportProgress.encode(embeddings[0], face_image)})
+    progress.record({'path': 'A/sub/2.PNG', 'name': 'A', 'status': 'no_face', 'error': '얼굴 없음'})
+    progress.record({'path': 'B/1.jpeg', 'name': 'B', 'status': 'ok', **ImportProgress.encode(embeddings[1], None)})
+    progress.close()
+
+    database = FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'))
+    report = run_bulk_import(input_dir, processes=1, database=database)
+
+    assert report['registered'] == 2
+    assert report['faces'] == 2
+    assert [error['path'] for error in report['errors']] == ['A/sub/2.PNG']
+    assert database.recognize_face(embeddings[1])[0] == database.find_faces_by_name('B')[0]
+    assert database.faces[database.find_faces_by_name('A')[0]]['image_path'] is not None
+
+    # 등록 완료 후 다시 실행해도 중복 등록하지 않음
+    assert ImportProgress(os.path.join(input_dir, PROGRESS_FILE)).committed
+    assert run_bulk_import(input_dir, processes=1, database=database)['registered'] == 0
+    assert len(database) == 2
@@ -0,0 +1,510 @@
+"""
+임베딩 인덱스 모듈 테스트
+"""
+
+import pytest
+import numpy as np
+import tempfile
+import shutil
+import os
+
+
+def _make_gallery(num_faces, samples_per_face=2, dim=64, seed=0):
+    """얼굴별로 비슷한 샘플을 가진 임의 갤러리 생성"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_faces, dim))
+    items = []
+    for i, center in enumerate(centers):
+        for _ in range(samples_per_face):
+            items.append((f'person_{i:04d}', center + 0.1 * rng.standard_normal(dim)))
+    return centers, items
+
+
+class TestEmbeddingIndex:
+    """전수 탐색 인덱스 테스트"""
+
+    def test_search_returns_unique_faces(self):
+        """얼굴별 최고 유사도로 중복 없이 반환되는지 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+
+        centers, items = _make_gallery(10, samples_per_face=3)
+        index = EmbeddingIndex(dim=64)
+        index.build(items)
+
+        matches = index.search(centers[3], top_k=5)
+
+        face_ids = [face_id for face_id, _ in matches]
+        assert face_ids[0] == 'person_0003'
+        assert len(face_ids) == len(set(face_ids))
+        assert all(a[1] >= b[1] for a, b in zip(matches, matches[1:]))
+
+    def test_add_and_remove(self):
+        """증분 추가/삭제 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+
+        index = EmbeddingIndex(dim=64)
+        embedding = np.random.randn(64)
+        index.add('person_001', embedding)
+        index.add('person_001', np.random.randn(64))
+
+        assert len(index) == 2
+        assert index.search(embedding)[0][0] == 'person_001'
+
+        assert index.remove('person_001') == 2
+        assert len(index) == 0
+        assert index.search(embedding) == []
+
+    def test_add_many(self):
+        """여러 얼굴 일괄 추가가 개별 추가와 같은 결과인지 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+        from backend.models.template_index import TemplateIndex
+
+        centers, items = _make_gallery(5, samples_per_face=2)
+        face_ids = [face_id for face_id, _ in items]
+        vectors = np.stack([vector for _, vector in items])
+
+        for index_class in (EmbeddingIndex, TemplateIndex):
+            index = index_class(dim=64)
+            index.add('person_0000', centers[0])
+            index.add_many(face_ids, vectors)
+
+            assert len(index) == len(items) + 1
+            assert index.num_faces == 5
+            assert [index.search(center)[0][0] for center in centers] == [f'person_{i:04d}' for i in range(5)]
+
+    def test_min_score_and_top_k(self):
+        """얼굴별 max-pooling 후 상위 k개와 최소 유사도 필터 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+
+        centers, items = _make_gallery(20, samples_per_face=3)
+        index = EmbeddingIndex(dim=64)
+        index.build(items)
+
+        matches = index.search(centers[5], top_k=20)
+        assert matches[0][0] == 'person_0005'
+        assert len(matches) == len({face_id for face_id, _ in matches})
+
+        strict = index.search(centers[5], top_k=20, min_score=0.9)
+        assert [face_id for face_id, _ in strict] == ['person_0005']
+        assert index.search(np.random.randn(64), top_k=3, min_score=0.99) == []
+
+    def test_early_exit(self):
+        """고신뢰 컷오프 이상인 첫 매칭에서 탐색을 멈추는지 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+        from backend.models.ivf_index import IVFIndex
+
+        centers, items = _make_gallery(300, samples_per_face=2)
+        for index in (EmbeddingIndex(dim=64), IVFIndex(dim=64, min_train_size=100, nprobe=4)):
+            index.EARLY_EXIT_BLOCK = 64
+            index.build(items)
+
+            matches = index.search_batch(centers[[7, 250]], min_score=0.9, early_exit=True)
+            assert [m[0][0] for m in matches] == ['person_0007', 'person_0250']
+            assert index.search(centers[7], min_score=1.01, early_exit=True) == []
+
+            with pytest.raises(ValueError):
+                index.search(centers[7], early_exit=True)
+
+    def test_snapshot_is_immutable(self):
+        """쓰기가 기존 스냅샷을 바꾸지 않는지 테스트 (copy-on-write)"""
+        from backend.models.embedding_index import EmbeddingIndex
+
+        index = EmbeddingIndex(dim=64)
+        embedding = np.random.randn(64)
+        index.add('person_001', embedding)
+        snapshot = index.snapshot()
+
+        index.replace('person_001', np.random.randn(64))
+        index.add('person_002', np.random.randn(64))
+        index.remove('person_001')
+
+        assert len(snapshot.labels) == 1
+        assert snapshot.face_ids[snapshot.labels[0]] == 'person_001'
+        assert not snapshot.matrix.flags.writeable
+        assert index.face_ids == ['person_002']
+
+    def test_concurrent_search_during_writes(self):
+        """등록/삭제 중에도 검색이 예외 없이 일관된 결과를 내는지 테스트"""
+        import threading
+        from backend.models.ivf_index import IVFIndex
+
+        centers, items = _make_gallery(50, samples_per_face=2)
+        index = IVFIndex(dim=64, min_train_size=60)
+        index.build(items[:40])
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    for matches in index.search_batch(centers[:20], top_k=3):
+                        assert all(face_id is not None for face_id, _ in matches)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for face_id, embedding in items[40:]:
+            index.add(face_id, embedding)
+            index.replace(face_id, embedding)
+        for i in range(0, 50, 3):
+            index.remove(f'person_{i:04d}')
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert index.search(centers[1])[0][0] == 'person_0001'
+
+
+class TestIVFIndex:
+    """IVF 근사 검색 인덱스 테스트"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """임시 디렉토리 생성"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def test_exact_before_training(self):
+        """학습 전에는 전수 탐색으로 동작하는지 테스트"""
+        from backend.models.ivf_index import IVFIndex
+
+        centers, items = _make_gallery(20)
+        index = IVFIndex(dim=64, min_train_size=1000)
+        index.build(items)
+
+        assert not index.is_trained
+        assert index.search(centers[7])[0][0] == 'person_0007'
+
+    def test_recall_after_training(self):
+        """학습 후 근사 검색 recall 테스트"""
+        from backend.models.ivf_index import IVFIndex
+
+        centers, items = _make_gallery(500)
+        index = IVFIndex(dim=64, nprobe=8, min_train_size=100)
+        index.build(items)
+
+        assert index.is_trained
+        hits = sum(
+            matches[0][0] == f'person_{i:04d}'
+            for i, matches in enumerate(index.search_batch(centers))
+        )
+        assert hits / len(centers) >= 0.95
+
+    def test_incremental_insert_delete(self):
+        """학습 후 증분 삽입/삭제 테스트"""
+        from backend.models.ivf_index import IVFIndex
+
+        centers, items = _make_gallery(200)
+        index = IVFIndex(dim=64, min_train_size=100)
+        index.build(items)
+
+        new_embedding = np.random.randn(64)
+        index.add('person_new', new_embedding)
+        assert index.search(new_embedding)[0][0] == 'person_new'
+        assert len(index) == 401
+
+        index.remove('person_0005')
+        assert 'person_0005' not in index
+        assert all(fid != 'person_0005' for fid, _ in index.search(centers[5], top_k=3))
+        assert len(index) == 399
+
+    def test_save_and_load(self, temp_dir):
+        """인덱스 저장 및 로드 테스트"""
+        from backend.models.ivf_index import IVFIndex
+
+        centers, items = _make_gallery(200)
+        index = IVFIndex(dim=64, min_train_size=100)
+        index.build(items)
+        index.remove('person_0001')
+
+        path = os.path.join(temp_dir, 'index.ivf.npz')
+        assert index.save(path) is True
+
+        loaded = IVFIndex(dim=64)
+        assert loaded.load(path) is True
+        assert loaded.is_trained
+        assert len(loaded) == len(index)
+        assert 'person_0001' not in loaded
+        assert loaded.search(centers[9])[0][0] == 'person_0009'
+
+
+class TestTemplateIndex:
+    """템플릿 + 샘플 예산 2단계 검색 인덱스 테스트"""
+
+    def test_sample_budget(self):
+        """얼굴당 대표 샘플이 K개를 넘지 않고 서로 다른 샘플이 남는지 테스트"""
+        from backend.models.template_index import TemplateIndex
+
+        rng = np.random.default_rng(0)
+        frontal, profile = rng.standard_normal((2, 64))
+        index = TemplateIndex(dim=64, sample_budget=2)
+        index.add('person_001', np.vstack([frontal + 0.01 * rng.standard_normal(64) for _ in range(5)]))
+        index.add('person_001', profile)
+
+        assert len(index) == 2
+        samples = index.snapshot().samples[0]
+        assert max(samples @ index.normalize(profile)[0]) > 0.99
+
+        assert index.remove('person_001') == 2
+        assert len(index) == 0
+        assert index.search(profile) == []
+
+    def test_two_stage_search(self):
+        """템플릿으로 고른 후보를 대표 샘플로 재점수한 결과 테스트"""
+        from backend.models.template_index import TemplateIndex
+
+        centers, items = _make_gallery(200, samples_per_face=12)
+        for template in ('mean', 'medoid'):
+            index = TemplateIndex(dim=64, sample_budget=4, template=template, shortlist=8)
+            index.build(items)
+
+            assert len(index) == 200 * 4
+            hits = sum(
+                matches[0][0] == f'person_{i:04d}'
+                for i, matches in enumerate(index.search_batch(centers))
+            )
+            assert hits == len(centers)
+
+            matches = index.search(centers[3], top_k=5, min_score=0.9)
+            assert [face_id for face_id, _ in matches] == ['person_0003']
+            assert index.search(centers[3], min_score=0.9, early_exit=True)[0][0] == 'person_0003'
+
+
+    def test_scores_real_samples(self):
+        """유사도가 합성 템플릿이 아닌 실제 샘플 점수인지 (평면 인덱스와 같은 점수) 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+        from backend.models.template_index import TemplateIndex
+
+        # 거의 직교하는 두 샘플의 평균 방향 쿼리: 템플릿 점수(~1.0)가 샘플 점수(~0.7)보다 높음
+        rng = np.random.default_rng(1)
+        frontal, profile = rng.standard_normal((2, 64))
+        frontal, profile = EmbeddingIndex.normalize(np.vstack([frontal, profile]))
+        query = frontal + profile
+        items = [('person_001', frontal), ('person_001', profile)]
+
+        flat = EmbeddingIndex(dim=64)
+        flat.build(items)
+        index = TemplateIndex(dim=64, sample_budget=2)
+        index.build(items)
+
+        score = index.search(query)[0][1]
+        assert score == pytest.approx(flat.search(query)[0][1], abs=1e-5)
+        assert score < 0.9
+
+
+class TestQuantizedIndex:
+    """float16/int8 압축 + 원본 재계산 인덱스 테스트"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """임시 디렉토리 생성"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def _make_store(self, temp_dir, items, dtype='float32'):
+        """갤러리를 저장한 임베딩 저장소 생성"""
+        from backend.models.embedding_store import EmbeddingStore
+
+        store = EmbeddingStore(os.path.join(temp_dir, f'embeddings_{dtype}.bin'), dim=64, dtype=dtype)
+        store.append_many(
+            [face_id for face_id, _ in items],
+            [0] * len(items),
+            np.array([embedding for _, embedding in items])
+        )
+        return store
+
+    def test_matches_exact_search(self, temp_dir):
+        """압축 검색 결과와 점수가 float32 전수 탐색과 같은지 테스트"""
+        from backend.models.embedding_index import EmbeddingIndex
+        from backend.models.quantized_index import QuantizedIndex
+
+        centers, items = _make_gallery(300, samples_per_face=2)
+        exact = EmbeddingIndex(dim=64)
+        exact.build(items)
+        store = self._make_store(temp_dir, items)
+
+        for precision, itemsize in (('float16', 2), ('int8', 1)):
+            index = QuantizedIndex(store, precision=precision, rerank=16)
+            index.EARLY_EXIT_BLOCK = 128
+            index.sync()
+
+            assert index.snapshot().codes.nbytes == len(items) * 64 * itemsize
+            for expected, matches in zip(exact.search_batch(centers, top_k=3), index.search_batch(centers, top_k=3)):
+                assert [fid for fid, _ in matches] == [fid for fid, _ in expected]
+                assert np.allclose([s for _, s in matches], [s for _, s in expected], atol=1e-5)
+            assert index.search(centers[250], min_score=0.9, early_exit=True)[0][0] == 'person_0250'
+
+        store.close()
+
+    def test_incremental_sync(self, temp_dir):
+        """저장소 추가/삭제 반영 및 float16 저장소 테스트"""
+        from backend.models.quantized_index import QuantizedIndex
+
+        centers, items = _make_gallery(20, samples_per_face=2)
+        store = self._make_store(temp_dir, items[:2], dtype='float16')
+        index = QuantizedIndex(store, precision='int8')
+        index.sync()
+
+        store.append_many(
+            [face_id for face_id, _ in items[2:]],
+            [0] * (len(items) - 2),
+            np.array([embedding for _, embedding in items[2:]])
+        )
+        index.add('person_0001', items[2][1])
+        assert len(index) == len(items)
+        assert index.search(centers[7])[0][0] == 'person_0007'
+
+        store.delete([14, 15])
+        assert index.remove('person_0007') == 2
+        assert all(fid != 'person_0007' for fid, _ in index.search(centers[7], top_k=3))
+        store.close()
+
+
+
+class TestPQIndex:
+    """곱 양자화(PQ) 압축 인덱스 테스트"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """임시 디렉토리 생성"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def test_exact_before_training(self):
+        """학습 전에는 float32 전수 탐색으로 동작하는지 테스트"""
+        from backend.models.pq_index import PQIndex
+
+        centers, items = _make_gallery(20)
+        index = PQIndex(dim=64, num_subspaces=16, min_train_size=1000)
+        index.build(items)
+
+        assert not index.is_trained
+        assert index.search(centers[7])[0][0] == 'person_0007'
+
+    def test_adc_search_after_training(self):
+        """학습 후 코드 크기, 증분 삽입/삭제, 근사 검색 테스트"""
+        from backend.models.pq_index import PQIndex
+
+        centers, items = _make_gallery(300)
+        index = PQIndex(dim=64, num_subspaces=16, min_train_size=500)
+        index.build(items[:400])
+        for face_id, embedding in items[400:]:
+            index.add(face_id, embedding)
+
+        snapshot = index.snapshot()
+        assert index.is_trained
+        assert snapshot.codes.shape == (16, 600)
+        assert snapshot.vectors.size == 0
+
+        hits = sum(
+            matches[0][0] == f'person_{i:04d}'
+            for i, matches in enumerate(index.search_batch(centers))
+        )
+        assert hits / len(centers) >= 0.95
+        assert index.search(centers[250], min_score=0.5, early_exit=True)[0][0] == 'person_0250'
+
+        assert index.remove('person_0005') == 2
+        assert all(fid != 'person_0005' for fid, _ in index.search(centers[5], top_k=3))
+
+    def test_build_rows(self):
+        """블록 단위 인코딩 결과가 전체 행렬 인코딩과 같은지 테스트"""
+        from backend.models.pq_index import PQIndex
+
+        centers, items = _make_gallery(300)
+        face_ids = sorted({face_id for face_id, _ in items})
+        labels = np.array([face_ids.index(face_id) for face_id, _ in items])
+        vectors = PQIndex.normalize(np.array([embedding for _, embedding in items]))
+
+        block_sizes = []
+
+        def read_rows(positions):
+            block_sizes.append(len(positions))
+            return vectors[positions]
+
+        index = PQIndex(dim=64, num_subspaces=16, min_train_size=500)
+        index.build_rows(face_ids, labels, read_rows, block_size=128)
+        assert index.is_trained
+        assert max(block_sizes[1:]) == 128
+        assert index.snapshot().vectors.size == 0
+
+        codes = index.snapshot().codes.copy()
+        index.build_arrays([face_id for face_id, _ in items], vectors)
+        np.testing.assert_array_equal(index.snapshot().codes, codes)
+
+        hits = sum(
+            matches[0][0] == f'person_{i:04d}'
+            for i, matches in enumerate(index.search_batch(centers))
+        )
+        assert hits / len(centers) >= 0.95
+
+    def test_save_and_load(self, temp_dir):
+        """코드북/코드/메타데이터 단일 파일 저장 및 로드 테스트"""
+        from backend.models.pq_index import PQIndex
+
+        centers, items = _make_gallery(200)
+        index = PQIndex(dim=64, num_subspaces=8, min_train_size=100)
+        index.build(items)
+        index.remove('person_0001')
+
+        path = os.path.join(temp_dir, 'gallery.pq.npz')
+        assert index.save(path, {'person_0009': {'name': 'I'}}) is True
+
+        loaded = PQIndex(dim=64, num_subspaces=16)
+        assert loaded.load(path) is True
+        assert loaded.num_subspaces == 8
+        assert len(loaded) == len(index)
+        assert 'person_0001' not in loaded
+        assert loaded.search(centers[9])[0][0] == 'person_0009'
+        assert PQIndex.load_metadata(path) == {'person_0009': {'name': 'I'}}
+
+
+class TestSimilarity:
+    """유사도 커널 테스트"""
+
+    @pytest.mark.parametrize('dtype', ['float32', 'float16', 'int8'])
+    def test_backends_agree(self, dtype):
+        """자료형별로 simsimd와 NumPy 내적 결과가 같은지 테스트"""
+        from backend.utils.similarity import available_backends, pairwise_dot
+
+        rng = np.random.default_rng(0)
+        if dtype == 'int8':
+            queries = rng.integers(-127, 128, (3, 64)).astype(np.int8)
+            vectors = rng.integers(-127, 128, (5000, 64)).astype(np.int8)
+        else:
+            # 실제 입력과 같은 정규화된 벡터 (simsimd float16은 누적 오차가 값 크기에 비례)
+            queries = rng.standard_normal((3, 64))
+            vectors = rng.standard_normal((5000, 64))
+            queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(dtype)
+            vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(dtype)
+
+        expected = queries.astype(np.float64) @ vectors.astype(np.float64).T
+        for backend in available_backends():
+            scores = pairwise_dot(queries, vectors, backend=backend)
+            assert scores.shape == (3, 5000)
+            assert scores.dtype == np.float32
+            np.testing.assert_allclose(scores, expected, rtol=1e-3, atol=1e-3)
+        assert pairwise_dot(queries[0], vectors).shape == (5000,)
+
+        with pytest.raises(ValueError):
+            pairwise_dot(queries.astype(np.float64), vectors)
+
+    def test_cosine(self):
+        """코사인 유사도와 영벡터 처리 테스트"""
+        from backend.utils.similarity import available_backends, cosine
+
+        a = np.array([1.0, 0.0, 1.0])
+        b = np.array([1.0, 1.0, 0.0])
+        for backend in available_backends():
+            assert cosine(a, b, backend=backend) == pytest.approx(0.5, abs=1e-4)
+            assert cosine(a, -a, backend=backend) == pytest.approx(-1.0, abs=1e-4)
+            assert cosine(a, np.zeros(3), backend=backend) == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -42,6 +42,65 @@ class TestFaceRecognizer:
         assert 'device' in info
         assert 'embedding_size' in info
         assert info['embedding_size'] == 512
+        assert 'detection' in [session['taskname'] for session in info['engine']['sessions'].values()]
+
+    def test_extract_embeddings_batch(self):
+        """배치 추출 결과가 이미지 순서대로 대응되는지 테스트"""
+        from backend.models.face_recognition import FaceRecognizer
+
+        recognizer = FaceRecognizer(device='cpu', max_batch_size=2)
+        images = [np.zeros((100, 100, 3), dtype=np.uint8) for _ in range(3)]
+
+        embeddings = recognizer.extract_embeddings_batch(images)
+
+        assert len(embeddings) == 3
+        assert embeddings == [recognizer.extract_embedding(image) for image in images]
+
+    def test_detect_and_embed(self):
+        """감지/인식 분리 결과가 detect_and_extract와 같은지 테스트"""
+        from backend.models.face_recognition import FaceRecognizer
+
+        recognizer = FaceRecognizer(device='cpu')
+        image = np.zeros((200, 200, 3), dtype=np.uint8)
+
+        faces = recognizer.detect(image)
+        assert all(face['embedding'] is None for face in faces)
+
+        embeddings = recognizer.embed(image, faces)
+        expected = recognizer.detect_and_extract(image)
+        assert len(embeddings) == len(expected)
+        for embedding, face in zip(embeddings, expected):
+            assert np.allclose(embedding, face['embedding'])
+
+    def test_invalid_profile(self):
+        """지원하지 않는 추론 프로필은 모델 로드 전에 거부되는지 테스트"""
+        from backend.models.face_recognition import FaceRecognizer
+
+        with pytest.raises(ValueError):
+            FaceRecognizer(device='cpu', profile='unknown')
+
+    def test_invalid_model(self):
+        """지원하지 않는 모델 팩은 모델 로드 전에 거부되는지 테스트"""
+        from backend.models.face_recognition import FaceRecognizer
+
+        with pytest.raises(ValueError):
+            FaceRecognizer(device='cpu', model_name='buffalo_unknown')
+
+    def test_detection_scale(self):
+        """2단계 해상도 감지 축소 비율이 프레임/예상 얼굴 크기에 맞게 정해지는지 테스트"""
+        from backend.models.face_recognition import FaceRecognizer, DETECTABLE_FACE_SIZE
+
+        # 기본: 긴 변을 det_size에 맞춤 (작은 프레임은 확대하지 않음)
+        assert FaceRecognizer.detection_scale(2160, 3840) == pytest.approx(640 / 3840)
+        assert FaceRecognizer.detection_scale(480, 640) == 1.0
+
+        # 예상 얼굴이 크면 더 축소, 작으면 덜 축소
+        assert FaceRecognizer.detection_scale(2160, 3840, min_face_size=256) == pytest.approx(DETECTABLE_FACE_SIZE / 256)
+        assert FaceRecognizer.detection_scale(2160, 3840, min_face_size=40) == pytest.approx(DETECTABLE_FACE_SIZE / 40)
+        assert FaceRecognizer.detection_scale(1080, 1920, min_face_size=16) == 1.0
+
+        # 긴 변은 최소 크기 이상
+        assert FaceRecognizer.detection_scale(2160, 3840, min_face_size=10000) * 3840 >= 128
 
     def test_compute_similarity_same_embedding(self):
         """동일한 임베딩 유사도 테스트"""
@@ -135,6 +194,155 @@ class TestFaceDatabase:
         assert matches[0][0] == 'person_001'
         assert matches[0][1] > 0.99  # 동일한 임베딩이므로 매우 높은 유사도
 
+    def test_find_match_multiple_samples(self, face_database):
+        """다중 샘플 매칭 테스트 (얼굴별 최고 유사도 사용)"""
+        embedding1 = np.random.randn(512)
+        embedding2 = np.random.randn(512)
+        face_database.register_face('person_001', embedding1, {'name': 'A'})
+        face_database.add_face_sample('person_001', embedding2)
+        face_database.register_face('person_002', np.random.randn(512), {'name': 'B'})
+
+        matches = face_database.find_match(embedding2, top_k=2)
+
+        assert matches[0][0] == 'person_001'
+        assert matches[0][1] > 0.99
+        assert len(face_database.index) == 3
+
+    def test_find_match_after_remove_and_reload(self, face_database, temp_db_dir):
+        """삭제 및 재로드 후 인덱스 일관성 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        embedding1 = np.random.randn(512)
+        embedding2 = np.random.randn(512)
+        face_database.register_face('person_001', embedding1, {'name': 'A'})
+        face_database.register_face('person_002', embedding2, {'name': 'B'})
+        face_database.remove_face('person_001')
+
+        matches = face_database.find_match(embedding1, top_k=5)
+        assert all(face_id != 'person_001' for face_id, _ in matches)
+
+        # 새 인스턴스는 로드 시 인덱스를 재구성해야 함
+        new_db = FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'))
+        matches = new_db.find_match(embedding2, top_k=1)
+        assert matches[0][0] == 'person_002'
+        assert matches[0][1] > 0.99
+
+    def test_compiled_snapshot(self, temp_db_dir):
+        """컴파일된 스냅샷 로드, 변경 후 재컴파일, 손상 시 복구 테스트"""
+        from backend.models.face_database import FaceDatabase
+        from backend.models.compiled_gallery import CompiledGallery
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        db = FaceDatabase(db_path=db_path, index_type='flat')
+        embeddings = np.random.randn(4, 512)
+        for i, embedding in enumerate(embeddings[:3]):
+            db.register_face(f'person_{i:03d}', embedding, {'name': f'P{i}'})
+        db.add_face_sample('person_001', np.random.randn(512))
+        db.close()
+
+        gallery = CompiledGallery.load(db.compiled_path, 512)
+        assert gallery.face_ids == ['person_000', 'person_001', 'person_002']
+        assert gallery.labels.tolist() == [0, 1, 1, 2]
+        np.testing.assert_allclose(np.linalg.norm(gallery.matrix, axis=1), 1.0, rtol=1e-5)
+
+        # 현재 데이터와 같으면 다시 만들지 않고 그대로 사용
+        mtime = os.stat(db.compiled_path).st_mtime_ns
+        db = FaceDatabase(db_path=db_path, index_type='flat')
+        assert os.stat(db.compiled_path).st_mtime_ns == mtime
+        assert db.find_match(embeddings[2])[0][0] == 'person_002'
+
+        # close 없이 종료된 변경은 로드 시 다시 컴파일
+        db.register_face('person_003', embeddings[3], {'name': 'P3'})
+        db = FaceDatabase(db_path=db_path, index_type='flat')
+        assert db.find_match(embeddings[3])[0][0] == 'person_003'
+        assert len(CompiledGallery.load(db.compiled_path, 512).face_ids) == 4
+
+        # 손상된 스냅샷은 체크섬으로 걸러내고 저장소에서 복구
+        with open(db.compiled_path, 'r+b') as f:
+            f.seek(CompiledGallery.HEADER_SIZE + 10)
+            f.write(b'\xff\xff\xff\xff')
+        assert CompiledGallery.load(db.compiled_path, 512) is None
+        db = FaceDatabase(db_path=db_path, index_type='template')
+        assert db.find_match(embeddings[0])[0][0] == 'person_000'
+        assert len(db.index) == 5
+
+    def test_migrate_legacy_embedding_files(self, temp_db_dir):
+        """샘플별 .npy 파일이 임베딩 저장소로 이전되는지 테스트"""
+        import json
+        from backend.models.face_database import FaceDatabase
+
+        # 구버전 형식 데이터 구성
+        os.makedirs(os.path.join(temp_db_dir, 'embeddings'))
+        embeddings = np.random.randn(2, 512)
+        np.save(os.path.join(temp_db_dir, 'embeddings', 'person_001.npy'), embeddings[0])
+        np.save(os.path.join(temp_db_dir, 'embeddings', 'person_001_1.npy'), embeddings[1])
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        with open(db_path, 'w', encoding='utf-8') as f:
+            json.dump({'faces': {'person_001': {
+                'face_id': 'person_001',
+                'name': 'A',
+                'embedding_path': 'embeddings/person_001.npy',
+                'embedding_paths': ['embeddings/person_001.npy', 'embeddings/person_001_1.npy'],
+                'registered_at': '2026-02-06T15:00:00',
+                'last_seen': None,
+                'recognition_count': 0,
+                'sample_count': 2,
+                'metadata': {'name': 'A'}
+            }}}, f)
+
+        db = FaceDatabase(db_path=db_path)
+
+        assert db.faces['person_001']['embedding_rows'] == [0, 1]
+        assert 'embedding_paths' not in db.faces['person_001']
+        assert not os.path.exists(os.path.join(temp_db_dir, 'embeddings', 'person_001.npy'))
+        assert db.find_match(embeddings[1])[0][0] == 'person_001'
+
+        # 재로드 시 저장소에서 그대로 읽어야 함
+        db.store.close()
+        new_db = FaceDatabase(db_path=db_path)
+        assert len(new_db.store) == 2
+        assert new_db.find_match(embeddings[0])[0][1] > 0.99
+
+    def test_load_report(self, temp_db_dir):
+        """누락/손상 파일과 잘못된 저장소 행을 로드 보고서에 모으는지 테스트"""
+        import json
+        from backend.models.face_database import FaceDatabase
+
+        embeddings_dir = os.path.join(temp_db_dir, 'embeddings')
+        os.makedirs(embeddings_dir)
+        embedding = np.random.randn(512)
+        np.save(os.path.join(embeddings_dir, 'ok.npy'), embedding)
+        np.save(os.path.join(embeddings_dir, 'short.npy'), np.random.randn(128))
+        with open(os.path.join(embeddings_dir, 'broken.npy'), 'wb') as f:
+            f.write(b'not a numpy file')
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        with open(db_path, 'w', encoding='utf-8') as f:
+            json.dump({'faces': {
+                'person_001': {
+                    'face_id': 'person_001', 'name': 'A',
+                    'embedding_paths': ['embeddings/ok.npy', 'embeddings/short.npy',
+                                        'embeddings/broken.npy', 'embeddings/gone.npy'],
+                    'image_paths': ['faces/person_001.jpg'],
+                },
+                'person_002': {'face_id': 'person_002', 'name': 'B', 'embedding_rows': [7]},
+            }}, f)
+
+        db = FaceDatabase(db_path=db_path, load_workers=4)
+        report = db.load_report
+
+        assert db.faces['person_001']['embedding_rows'] == [0]
+        assert report['missing_files'] == [os.path.join(temp_db_dir, 'embeddings/gone.npy')]
+        assert sorted(os.path.basename(path) for path, _ in report['corrupt_files']) == ['broken.npy', 'short.npy']
+        assert report['invalid_rows'] == [('person_002', 7, '저장소 범위 밖')]
+        assert report['missing_images'] == ['faces/person_001.jpg']
+        assert {'metadata', 'names', 'migration', 'index'} <= set(report['timings'])
+
+        # 잘못된 행은 인덱스에서 제외하고 나머지는 정상 검색
+        assert 'person_002' not in db.index
+        assert db.find_match(embedding)[0][0] == 'person_001'
+
     def test_recognize_face(self, face_database):
         """얼굴 인식 테스트"""
         # 임베딩 등록
@@ -148,6 +356,110 @@ class TestFaceDatabase:
         assert result[0] == 'person_001'
         assert result[1] > 0.5  # 임계값 이상
 
+        # 고신뢰 컷오프 모드 (첫 매칭에서 탐색 중단)
+        assert face_database.recognize_face(embedding, early_exit_score=0.9)[0] == 'person_001'
+        assert face_database.recognize_face(np.random.randn(512), early_exit_score=0.9) is None
+
+    def test_recognize_faces_batch(self, face_database):
+        """다중 얼굴 일괄 인식 테스트"""
+        embeddings = np.random.randn(3, 512)
+        face_database.register_face('person_001', embeddings[0], {'name': 'A'})
+        face_database.register_face('person_002', embeddings[1], {'name': 'B'})
+
+        # 등록된 두 얼굴 + 미등록 얼굴 1개
+        results = face_database.recognize_faces(embeddings)
+
+        assert len(results) == 3
+        assert results[0][0] == 'person_001'
+        assert results[1][0] == 'person_002'
+        assert face_database.get_face('person_001')['recognition_count'] == 1
+        assert face_database.get_face('person_002')['recognition_count'] == 1
+        assert face_database.recognize_faces(np.empty((0, 512))) == []
+
+    def test_recognition_stats_persisted(self, face_database, temp_db_dir):
+        """인식 통계가 별도 파일에 기록되어 재시작 후에도 유지되는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        embedding = np.random.randn(512)
+        face_database.register_face('person_001', embedding, {'name': 'A'})
+        face_database.recognize_faces(np.stack([embedding, embedding]))
+
+        # 기록 전에도 대기 값이 합산되어 보여야 함
+        assert face_database.get_statistics()['total_recognitions'] == 2
+        assert face_database.get_all_faces()[0]['last_seen'] is not None
+
+        face_database.close()
+
+        new_db = FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'))
+        assert new_db.get_face('person_001')['recognition_count'] == 2
+
+    def test_shared_mode_between_workers(self, temp_db_dir):
+        """공유 모드에서 다른 워커(인스턴스)의 등록/삭제/통계가 재로드 없이 반영되는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        worker_a = FaceDatabase(db_path=db_path, index_type='shared', storage='sqlite')
+        worker_b = FaceDatabase(db_path=db_path, index_type='shared', storage='sqlite')
+
+        embedding = np.random.randn(512)
+        other = np.random.randn(512)
+        assert worker_a.register_face('person_001', embedding, {'name': 'A'})
+        assert worker_b.register_face('person_002', other, {'name': 'B'})
+
+        # 양쪽 모두 상대 워커의 등록을 검색하고 메타데이터도 보임
+        assert worker_b.recognize_face(embedding)[0] == 'person_001'
+        assert worker_a.recognize_face(other)[0] == 'person_002'
+        assert worker_b.faces['person_001']['name'] == 'A'
+        assert worker_a.find_faces_by_name('B') == ['person_002']
+
+        # 다른 워커가 등록한 얼굴에 샘플 추가 후 삭제
+        assert worker_b.add_face_sample('person_001', np.random.randn(512))
+        assert worker_a.remove_face('person_001')
+        assert worker_b.recognize_face(embedding) is None
+        assert 'person_001' not in worker_b.faces
+
+        # 워커별 통계가 서로 덮어쓰지 않고 합산
+        worker_a.recognize_faces(np.stack([other, other]))
+        worker_b.recognize_face(other)
+        worker_a.stats.flush()
+        worker_b.stats.flush()
+        worker_a.close()
+        worker_b.close()
+
+        new_db = FaceDatabase(db_path=db_path, storage='sqlite')
+        assert new_db.get_face('person_002')['recognition_count'] == 4
+        assert new_db.get_face('person_002')['sample_count'] == 1
+
+    def test_shared_mode_failed_registration(self, temp_db_dir):
+        """공유 모드에서 등록이 실패해 남은 저장소 행이 검색되지 않는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        db = FaceDatabase(db_path=db_path, index_type='shared', storage='sqlite')
+
+        embedding = np.random.randn(512)
+        assert not db.register_face('ghost', embedding, {'name': 'G'}, face_image=np.empty((0, 0, 3), dtype=np.uint8))
+        assert 'ghost' not in db.faces
+        assert db.find_match(embedding) == []
+
+        # 메타데이터가 가리키지 않는 행 (레코드 기록 전 중단된 경우)
+        orphan = np.random.randn(512)
+        db.store.append('orphan', 0, orphan)
+        db.index.sync()
+        assert db.find_match(orphan) == []
+        db.close()
+
+        new_db = FaceDatabase(db_path=db_path, index_type='shared', storage='sqlite')
+        assert new_db.find_match(embedding) == []
+        assert new_db.find_match(orphan) == []
+
+    def test_shared_mode_requires_sqlite(self, temp_db_dir):
+        """공유 모드는 SQLite 메타데이터가 필요한지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        with pytest.raises(ValueError):
+            FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'), index_type='shared')
+
     def test_recognize_face_no_match(self, face_database):
         """매칭되지 않는 얼굴 인식 테스트"""
         # 임베딩 등록
@@ -190,6 +502,57 @@ class TestFaceDatabase:
         assert success is True
         assert 'department' in face_database.faces['person_001']['metadata']
 
+    def test_enroll_samples(self, face_database, temp_db_dir):
+        """이름별 일괄 등록 (기존 이름은 샘플 추가, 새 이름은 얼굴 생성) 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        existing = np.random.randn(512)
+        face_database.register_face('person_001', existing, {'name': 'A'})
+
+        samples = [
+            ('A', np.random.randn(512), np.zeros((8, 8, 3), dtype=np.uint8)),
+            ('B', np.random.randn(512), np.zeros((8, 8, 3), dtype=np.uint8)),
+            ('B', np.random.randn(512), None),
+        ]
+        face_ids = face_database.enroll_samples(samples)
+
+        assert face_ids[0] == 'person_001'
+        assert face_ids[1] == face_ids[2] != 'person_001'
+        assert face_database.faces['person_001']['sample_count'] == 2
+        new_face = face_database.faces[face_ids[1]]
+        assert new_face['name'] == 'B'
+        assert new_face['sample_count'] == 2
+        assert new_face['image_paths'] == [f"faces/{face_ids[1]}.jpg"]
+        assert face_database.find_faces_by_name('B') == [face_ids[1]]
+        assert face_database.recognize_face(samples[2][1])[0] == face_ids[1]
+
+        # 저널 재생으로도 같은 상태 복원
+        face_database.close()
+        new_db = FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'))
+        assert new_db.faces[face_ids[1]]['sample_count'] == 2
+        assert new_db.recognize_face(samples[0][1])[0] == 'person_001'
+
+    def test_bind_model(self, face_database, temp_db_dir):
+        """데이터베이스가 처음 등록한 모델의 임베딩에만 묶이는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        # 비어 있는 데이터베이스는 어떤 모델로든 기록
+        face_database.bind_model('buffalo_s')
+        face_database.bind_model('buffalo_l')
+        assert face_database.config['model_name'] == 'buffalo_l'
+
+        face_database.register_face('person_001', np.random.randn(512), {'name': 'A'})
+        face_database.close()
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        with pytest.raises(ValueError):
+            FaceDatabase(db_path=db_path, model_name='buffalo_s')
+
+        # 감지 모델만 다른 buffalo_m은 같은 인식 모델이라 허용 (기록은 유지)
+        new_db = FaceDatabase(db_path=db_path, model_name='buffalo_m')
+        assert new_db.config['model_name'] == 'buffalo_l'
+        assert new_db.get_statistics()['model_name'] == 'buffalo_l'
+
     def test_save_and_load(self, face_database, temp_db_dir):
         """데이터베이스 저장 및 로드 테스트"""
         from backend.models.face_database import FaceDatabase
@@ -209,6 +572,264 @@ class TestFaceDatabase:
         assert len(new_db) == 1
         assert 'person_001' in new_db.faces
 
+    def test_failed_reregister_keeps_face(self, face_database, temp_db_dir):
+        """같은 ID 재등록이 실패하면 기존 샘플이 삭제되지 않는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        embedding = np.random.randn(512)
+        assert face_database.register_face('person_001', embedding, {'name': 'A'})
+        assert not face_database.register_face(
+            'person_001', np.random.randn(512), {'name': 'B'}, face_image=np.empty((0, 0, 3), dtype=np.uint8)
+        )
+        assert face_database.faces['person_001']['name'] == 'A'
+        assert face_database.find_match(embedding)[0][0] == 'person_001'
+        face_database.close()
+
+        new_db = FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'))
+        assert new_db.find_match(embedding)[0][0] == 'person_001'
+
+    def test_journal_replay(self, face_database, temp_db_dir):
+        """스냅샷 없이 저널만으로 변경이 복원되는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        embedding = np.random.randn(512)
+        face_database.register_face('person_001', embedding, {'name': 'A'})
+        face_database.register_face('person_002', np.random.randn(512), {'name': 'B'})
+        face_database.update_metadata('person_001', {'department': '개발팀'})
+        face_database.remove_face('person_002')
+
+        # 변경은 저널에만 기록되고 스냅샷은 다시 쓰지 않음
+        assert len(face_database.journal) == 4
+        assert not os.path.exists(face_database.db_path)
+
+        new_db = FaceDatabase(db_path=os.path.join(temp_db_dir, 'test_database.json'))
+        assert list(new_db.faces) == ['person_001']
+        assert new_db.faces['person_001']['metadata']['department'] == '개발팀'
+        assert new_db.find_match(embedding)[0][0] == 'person_001'
+
+    def test_journal_compaction(self, temp_db_dir):
+        """저널이 일정 수에 도달하면 스냅샷으로 압축되는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        db = FaceDatabase(db_path=db_path, compact_every=3)
+        for i in range(4):
+            db.register_face(f'person_{i:03d}', np.random.randn(512), {'name': f'P{i}'})
+
+        assert os.path.exists(db_path)
+        assert len(db.journal) == 1
+
+        # 저널 마지막 줄이 손상되어도 이전 상태까지는 복원
+        with open(db.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "face_id": "broken"')
+
+        new_db = FaceDatabase(db_path=db_path)
+        assert len(new_db) == 4
+
+    def test_journal_torn_tail(self, face_database, temp_db_dir):
+        """손상된 꼬리 뒤에 기록한 변경도 다음 로드에서 복원되는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        face_database.register_face('a', np.random.randn(512), {'name': 'A'})
+        with open(face_database.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "face_id": "broken"')
+        face_database.close()
+
+        db = FaceDatabase(db_path=db_path)
+        db.register_face('b', np.random.randn(512), {'name': 'B'})
+        db.register_face('c', np.random.randn(512), {'name': 'C'})
+        assert len(db.journal) == 3
+        db.close()
+
+        new_db = FaceDatabase(db_path=db_path)
+        assert sorted(new_db.faces) == ['a', 'b', 'c']
+
+    def test_merge_faces_by_name(self, face_database):
+        """이름 인덱스 조회 및 같은 이름 얼굴 통합 테스트"""
+        embeddings = np.random.randn(3, 512)
+        face_database.register_face('person_001', embeddings[0], {'name': 'A', 'registered_at': '2026-01-01T00:00:00'})
+        face_database.register_face('person_002', embeddings[1], {'name': 'A', 'registered_at': '2026-01-02T00:00:00'})
+        face_database.register_face('person_003', embeddings[2], {'name': 'B'})
+
+        assert face_database.find_faces_by_name('A') == ['person_001', 'person_002']
+        assert face_database.find_faces_by_name('C') == []
+
+        journal_before = len(face_database.journal)
+        assert face_database.merge_faces_by_name('A') == 'person_001'
+
+        # 통합 변경은 저널 한 줄로 기록
+        assert len(face_database.journal) == journal_before + 1
+        assert face_database.find_faces_by_name('A') == ['person_001']
+        assert face_database.faces['person_001']['sample_count'] == 2
+        assert face_database.find_match(embeddings[1])[0][0] == 'person_001'
+
+    @pytest.mark.parametrize('index_type', ['shared', 'flat'])
+    def test_merge_faces_between_instances(self, temp_db_dir, index_type):
+        """같은 SQLite 파일을 쓰는 다른 인스턴스가 등록한 같은 이름 얼굴 통합 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        worker_a = FaceDatabase(db_path=db_path, index_type=index_type, storage='sqlite')
+        worker_b = FaceDatabase(db_path=db_path, index_type=index_type, storage='sqlite')
+
+        worker_a.register_face('p1', np.random.randn(512), {'name': 'Kim', 'registered_at': '2026-01-01T00:00:00'})
+        worker_b.register_face('p2', np.random.randn(512), {'name': 'Kim', 'registered_at': '2026-01-02T00:00:00'})
+
+        if index_type == 'shared':
+            # 공유 모드는 다른 워커의 등록을 반영한 뒤 통합
+            assert worker_a.merge_faces_by_name('Kim') == 'p1'
+            assert worker_a.faces['p1']['sample_count'] == 2
+            assert 'p2' not in worker_a.faces
+        else:
+            # 반영하지 않은 다른 인스턴스의 얼굴은 통합 대상에서 제외
+            assert worker_a.find_faces_by_name('Kim') == ['p1']
+            assert worker_a.merge_faces_by_name('Kim') is None
+
+        worker_a.close()
+        worker_b.close()
+
+    def test_template_index(self, temp_db_dir):
+        """템플릿 인덱스: 저장소에는 전체 샘플, 검색에는 대표 샘플 K개만 사용하는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        db = FaceDatabase(db_path=db_path, index_type='template', sample_budget=3)
+        embeddings = np.random.randn(6, 512)
+        db.register_face('person_001', embeddings[0], {'name': 'A'})
+        for embedding in embeddings[1:]:
+            db.add_face_sample('person_001', embedding)
+        db.register_face('person_002', np.random.randn(512), {'name': 'B'})
+
+        assert db.faces['person_001']['sample_count'] == 6
+        assert len(db.index) == 4
+        assert db.find_match(embeddings[0])[0][0] == 'person_001'
+
+        db.remove_face('person_002')
+        db.close()
+
+        new_db = FaceDatabase(db_path=db_path, index_type='template', sample_budget=3)
+        assert len(new_db.index) == 3
+        assert new_db.find_match(embeddings[0])[0][0] == 'person_001'
+
+    def test_quantized_index(self, temp_db_dir):
+        """int8 압축 인덱스 + float16 저장소 등록/검색/재시작 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        db = FaceDatabase(db_path=db_path, index_type='quantized', store_dtype='float16')
+        embeddings = np.random.randn(3, 512)
+        db.register_face('person_001', embeddings[0], {'name': 'A'})
+        db.add_face_sample('person_001', embeddings[1])
+        db.register_face('person_002', embeddings[2], {'name': 'B'})
+        db.remove_face('person_002')
+
+        assert db.find_match(embeddings[1])[0][0] == 'person_001'
+        assert db.find_match(embeddings[1])[0][1] > 0.99
+        assert db.find_match(embeddings[2], min_score=0.5) == []
+        db.close()
+
+        new_db = FaceDatabase(db_path=db_path, index_type='quantized', store_dtype='float16')
+        assert len(new_db.index) == 2
+        assert new_db.find_match(embeddings[0])[0][0] == 'person_001'
+
+    def test_export_import_pq_gallery(self, temp_db_dir):
+        """전수 탐색 갤러리를 PQ 단일 파일로 내보내고 단말 데이터베이스로 가져오는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        server = FaceDatabase(db_path=os.path.join(temp_db_dir, 'server', 'face_database.json'))
+        embeddings = np.random.randn(300, 512)
+        for i, embedding in enumerate(embeddings):
+            server.register_face(f'person_{i:03d}', embedding, {'name': f'P{i}'})
+        server.add_face_sample('person_000', np.random.randn(512))
+
+        gallery_path = os.path.join(temp_db_dir, 'gallery.pq.npz')
+        assert server.export_gallery(gallery_path) is True
+
+        edge_path = os.path.join(temp_db_dir, 'edge', 'face_database.json')
+        edge = FaceDatabase(db_path=edge_path, index_type='pq', pq_subspaces=32)
+        assert edge.import_gallery(gallery_path) == 300
+        assert edge.faces['person_005']['name'] == 'P5'
+        assert edge.faces['person_000']['imported_samples'] == 2
+        assert edge.find_match(embeddings[5])[0][0] == 'person_005'
+
+        # 단말에서 새로 등록한 얼굴도 가져온 코드북으로 인코딩
+        edge.register_face('local_001', embeddings[7] + 0.1, {'name': 'L'})
+        edge.close()
+
+        reloaded = FaceDatabase(db_path=edge_path, index_type='pq')
+        assert len(reloaded.index) == 302
+        assert reloaded.find_match(embeddings[42])[0][0] == 'person_042'
+        assert reloaded.find_faces_by_name('L') == ['local_001']
+
+        with pytest.raises(ValueError):
+            server.import_gallery(gallery_path)
+
+    def test_pq_rebuild_from_store(self, temp_db_dir):
+        """PQ 데이터베이스는 float32 스냅샷 없이 저장소에서 인덱스를 재구성하는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'face_database.json')
+        db = FaceDatabase(db_path=db_path, index_type='pq', pq_subspaces=32)
+        embeddings = np.random.randn(1100, 512)
+        with db.batch():
+            for i, embedding in enumerate(embeddings):
+                db.register_face(f'person_{i:04d}', embedding, {'name': f'P{i}'})
+        assert db.index.is_trained
+        assert db.save() is True
+        db.close()
+
+        assert not os.path.exists(db.compiled_path)
+        os.remove(db.pq_path)
+
+        reloaded = FaceDatabase(db_path=db_path, index_type='pq')
+        assert reloaded.index.is_trained
+        assert len(reloaded.index) == 1100
+        assert reloaded.find_match(embeddings[42])[0][0] == 'person_0042'
+
+    def test_sqlite_storage(self, temp_db_dir):
+        """SQLite 메타데이터 백엔드 등록/조회/재시작 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        db = FaceDatabase(db_path=db_path, storage='sqlite')
+        embedding = np.random.randn(512)
+        db.register_face('person_001', embedding, {'name': 'A', 'group': 'dev'})
+        db.add_face_sample('person_001', np.random.randn(512))
+        db.register_face('person_002', np.random.randn(512), {'name': 'B'})
+        db.remove_face('person_002')
+        db.close()
+
+        # JSON 스냅샷/저널은 만들지 않음
+        assert not os.path.exists(db_path)
+        assert not os.path.exists(db.journal_path)
+
+        new_db = FaceDatabase(db_path=db_path, storage='sqlite')
+        assert list(new_db.faces) == ['person_001']
+        assert new_db.faces['person_001']['sample_count'] == 2
+        assert new_db.find_faces_by_name('A') == ['person_001']
+        assert new_db.metadata_db.find_by_group('dev') == ['person_001']
+        assert new_db.find_match(embedding)[0][0] == 'person_001'
+
+    def test_sqlite_migration_from_json(self, temp_db_dir):
+        """기존 JSON 데이터베이스(스냅샷 + 저널)를 SQLite로 이전하는지 테스트"""
+        from backend.models.face_database import FaceDatabase
+
+        db_path = os.path.join(temp_db_dir, 'test_database.json')
+        json_db = FaceDatabase(db_path=db_path)
+        embedding = np.random.randn(512)
+        json_db.register_face('person_001', embedding, {'name': 'A'})
+        json_db.save()
+        json_db.register_face('person_002', np.random.randn(512), {'name': 'B'})
+        json_db.close()
+
+        sqlite_db = FaceDatabase(db_path=db_path, storage='sqlite')
+        assert set(sqlite_db.faces) == {'person_001', 'person_002'}
+        assert sqlite_db.metadata_db.count() == 2
+        assert os.path.exists(f"{db_path}.migrated")
+        assert not os.path.exists(db_path)
+        assert sqlite_db.find_match(embedding)[0][0] == 'person_001'
+
     def test_context_manager(self, temp_db_dir):
         """Context manager 테스트"""
         from backend.models.face_database import FaceDatabase
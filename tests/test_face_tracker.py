@@ -0,0 +1,52 @@
+"""
+얼굴 추적 모듈 테스트
+"""
+
+import numpy as np
+
+
+def _faces(*boxes):
+    """bbox만 있는 감지 결과"""
+    return [{'bbox': np.array(box)} for box in boxes]
+
+
+def test_iou():
+    """IoU 계산 테스트"""
+    from backend.models.face_tracker import FaceTracker
+
+    overlaps = FaceTracker.iou(np.array([[0, 0, 10, 10]]), np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]]))
+    assert np.allclose(overlaps, [[1.0, 1 / 3, 0.0]])
+
+
+def test_skips_recognized_tracks():
+    """인식된 트랙은 재인식 주기 전까지 임베딩이 필요 없는지 테스트"""
+    from backend.models.face_tracker import FaceTracker
+
+    tracker = FaceTracker(reembed_interval=3)
+    track_ids = tracker.associate(_faces([0, 0, 100, 100], [200, 0, 300, 100]))
+    assert tracker.pending(track_ids) == [0, 1]
+    tracker.resolve(track_ids[0], ('person_001', 0.8))
+    tracker.resolve(track_ids[1], None)
+
+    # 조금 움직인 같은 얼굴은 같은 트랙, 미확인 얼굴만 다시 인식
+    moved = tracker.associate(_faces([205, 0, 305, 100], [5, 5, 105, 105]))
+    assert moved == [track_ids[1], track_ids[0]]
+    assert tracker.pending(moved) == [0]
+    assert tracker.match_of(moved[1]) == ('person_001', 0.8)
+
+    # 재인식 주기가 지나면 인식된 트랙도 다시 인식
+    tracker.associate(_faces([5, 5, 105, 105]))
+    assert tracker.pending(tracker.associate(_faces([5, 5, 105, 105]))) == [0]
+
+
+def test_drops_missing_tracks():
+    """오래 감지되지 않은 트랙은 삭제되고 새 얼굴은 새 트랙이 되는지 테스트"""
+    from backend.models.face_tracker import FaceTracker
+
+    tracker = FaceTracker(max_missed=2)
+    first = tracker.associate(_faces([0, 0, 100, 100]))
+    tracker.associate([])
+    tracker.associate([])
+
+    assert first[0] not in tracker.tracks
+    assert tracker.associate(_faces([0, 0, 100, 100])) != first
@@ -0,0 +1,146 @@
+"""
+ONNX Runtime 실행 설정 모듈 테스트
+"""
+
+import pytest
+import numpy as np
+import tempfile
+import shutil
+import os
+
+
+WEIGHT = np.random.RandomState(0).randn(4, 4).astype(np.float32)
+BIAS = np.array([1.0, -1.0, 2.0, -2.0], dtype=np.float32)
+
+
+def expected_output(x: np.ndarray) -> np.ndarray:
+    """작은 ONNX 모델의 기대 출력"""
+    return np.maximum(x @ WEIGHT + BIAS, 0)
+
+
+@pytest.fixture
+def model_dir():
+    """작은 ONNX 모델(MatMul + Add + Relu)이 있는 임시 모델 폴더"""
+    onnx = pytest.importorskip('onnx')
+    from onnx import helper, numpy_helper, TensorProto
+
+    temp_dir = tempfile.mkdtemp()
+    graph = helper.make_graph(
+        [
+            helper.make_node('MatMul', ['x', 'weight'], ['h']),
+            helper.make_node('Add', ['h', 'bias'], ['y']),
+            helper.make_node('Relu', ['y'], ['z'])
+        ],
+        'tiny',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [1, 4])],
+        [helper.make_tensor_value_info('z', TensorProto.FLOAT, [1, 4])],
+        [numpy_helper.from_array(WEIGHT, 'weight'), numpy_helper.from_array(BIAS, 'bias')]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    onnx.save(model, os.path.join(temp_dir, 'tiny.onnx'))
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def test_from_dict():
+    """모델별 설정이 기본 설정 위에 덮어써지는지 테스트"""
+    from backend.models.inference_engine import InferenceEngine
+
+    engine = InferenceEngine.from_dict({
+        'default': {'intra_op_threads': 4, 'allow_spinning': False},
+        'models': {'detection': {'intra_op_threads': 2, 'execution_mode': 'parallel'}},
+        'cpu_affinity': [3, 1, 1],
+    })
+
+    assert engine.session_config(None).intra_op_threads == 4
+    assert engine.session_config('recognition') == engine.default
+    detection = engine.session_config('detection')
+    assert detection.intra_op_threads == 2
+    assert detection.execution_mode == 'parallel'
+    assert detection.allow_spinning is False
+    assert engine.cpu_affinity == [1, 3]
+
+
+def test_invalid_config():
+    """잘못된 설정 값은 ValueError"""
+    from backend.models.inference_engine import InferenceEngine
+
+    with pytest.raises(ValueError):
+        InferenceEngine.from_dict({'default': {'graph_optimization': 'max'}})
+    with pytest.raises(ValueError):
+        InferenceEngine.from_dict({'models': {'detection': {'threads': 2}}})
+    with pytest.raises(ValueError):
+        InferenceEngine.from_dict({'default': {'intra_op_threads': -1}})
+    with pytest.raises(ValueError):
+        InferenceEngine.from_dict({'cache': True})
+
+
+def test_session_options():
+    """CPU 친화도를 지정하면 스레드 수 기본값이 고정한 CPU 수가 되는지 테스트"""
+    import onnxruntime
+    from backend.models.inference_engine import InferenceEngine, SessionConfig
+
+    engine = InferenceEngine(cpu_affinity=[0, 1])
+    options = engine.session_options(SessionConfig(graph_optimization='basic', enable_mem_arena=False))
+    assert options.intra_op_num_threads == 2
+    assert options.graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    assert options.enable_cpu_mem_arena is False
+
+    options = engine.session_options(SessionConfig(intra_op_threads=1, allow_spinning=False))
+    assert options.intra_op_num_threads == 1
+    assert options.get_session_config_entry('session.intra_op.allow_spinning') == '0'
+
+
+def test_optimized_graph_cache(model_dir):
+    """첫 로드에서 최적화 그래프를 캐시하고 다음 로드에서 같은 결과로 재사용하는지 테스트"""
+    from backend.models.inference_engine import InferenceEngine
+
+    onnx_file = os.path.join(model_dir, 'tiny.onnx')
+    x = np.array([[0.5, 0.5, -3.0, 3.0]], dtype=np.float32)
+    expected = expected_output(x)
+
+    engine = InferenceEngine()
+    session = engine.create_session(onnx_file, ['CPUExecutionProvider'], taskname='detection')
+    assert engine.sessions['tiny.onnx']['cache'] == 'miss'
+    assert len(os.listdir(os.path.join(model_dir, '.optimized'))) == 1
+    np.testing.assert_allclose(session.run(None, {'x': x})[0], expected, rtol=1e-5)
+
+    engine = InferenceEngine()
+    session = engine.create_session(onnx_file, ['CPUExecutionProvider'])
+    assert engine.sessions['tiny.onnx']['cache'] == 'hit'
+    np.testing.assert_allclose(session.run(None, {'x': x})[0], expected, rtol=1e-5)
+    assert 'tiny.onnx' in engine.describe()['sessions']
+
+    engine = InferenceEngine(cache_enabled=False)
+    engine.create_session(onnx_file, ['CPUExecutionProvider'])
+    assert engine.sessions['tiny.onnx']['cache'] == 'off'
+
+
+def test_quantized_model_path():
+    """INT8 모델 경로와 잘못된 양자화 방식 테스트"""
+    from backend.models.inference_engine import quantized_model_path
+
+    path = quantized_model_path(os.path.join('models', 'buffalo_l', 'w600k_r50.onnx'), 'static')
+    assert path == os.path.join('models', 'buffalo_l', 'int8', 'w600k_r50.static.onnx')
+    with pytest.raises(ValueError):
+        quantized_model_path('w600k_r50.onnx', 'int4')
+
+
+@pytest.mark.parametrize('mode', ['dynamic', 'static'])
+def test_quantize_model(model_dir, mode):
+    """양자화한 모델을 원본 대신 세션으로 로드하고 FP32와 비슷한 결과를 내는지 테스트"""
+    from backend.quantize_models import quantize_model
+    from backend.models.inference_engine import InferenceEngine, quantized_model_path
+
+    onnx_file = os.path.join(model_dir, 'tiny.onnx')
+    quantized_file = quantized_model_path(onnx_file, mode)
+    feeds = [{'x': np.random.RandomState(i).randn(1, 4).astype(np.float32)} for i in range(8)]
+    quantize_model(onnx_file, quantized_file, mode, feeds)
+
+    engine = InferenceEngine(cache_enabled=False)
+    session = engine.create_session(onnx_file, ['CPUExecutionProvider'], session_file=quantized_file)
+    assert engine.sessions['tiny.onnx']['file'] == os.path.basename(quantized_file)
+
+    x = feeds[0]['x']
+    np.testing.assert_allclose(session.run(None, {'x': x})[0], expected_output(x), atol=0.1)